@@ -0,0 +1,281 @@
+"""
+Resumable parallel backfill of the reporter aggregate from the backups.
+
+Rebuilds the status counts of the reporter from every cycle directory
+under the backups, for when the report logic changes or the reporter
+state is lost. Cycles are processed in batches across worker processes
+and merged in cycle order, by number and then by name, so the progress
+is the last cycle merged so far. The counts and that cycle are saved to
+a progress checkpoint at a fixed interval, and an interrupted backfill
+resumes after the last saved cycle instead of starting over. Once every
+cycle is merged, the rebuilt aggregate replaces the reporter checkpoint,
+unless the reporter still has counted cycles outside the backups.
+
+Run from the repository root, with the reporter stopped:
+    python -m apolo_11.src.backfill --workers 8
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Set, Tuple
+
+from .checkpoint import Checkpoint, load_checkpoint, save_checkpoint
+from .config import ConfigManager
+from .logging_config import get_logger, init_worker_logging, setup_logging, shutdown_logging
+from .publish import PUBLISHED_SUFFIX, cycle_name, cycle_number, is_staging
+from .reporter import PartialReport, Reporter, new_status_counts
+
+logger = get_logger(__name__)
+
+config = ConfigManager.read_yaml_config()
+
+backfill_config: dict = config.get('reporter', {}).get('backfill', {})
+
+
+def list_cycles(backup_directory: str) -> List[Tuple[int, str]]:
+    """
+    List the backed up cycle directories in cycle order
+
+    Args:
+        backup_directory (str): directory the reported cycles were moved to
+
+    Returns:
+        List[Tuple[int, str]]: number and path of every cycle, copies still in progress excluded
+    """
+    cycles: List[Tuple[int, str]] = []
+    with os.scandir(backup_directory) as entries:
+        for entry in entries:
+            number = cycle_number(entry.name)
+            if number is not None and not is_staging(entry.name) and entry.is_dir(follow_symlinks=False):
+                cycles.append((number, entry.path))
+    cycles.sort()
+    return cycles
+
+
+def cycle_order(cycle_directory: str) -> Tuple[int, str]:
+    """Position of a cycle directory in cycle order: its number, then its name"""
+    name = cycle_name(os.path.basename(os.path.normpath(cycle_directory)))
+    return cycle_number(name) or 0, name
+
+
+def pending_backups(checkpoint: Optional[Checkpoint], devices_directory: Optional[str] = None) -> Set[str]:
+    """
+    Cycles counted by the reporter that are not in the backups yet
+
+    Args:
+        checkpoint (Optional[Checkpoint]): the reporter checkpoint, None if there is none
+        devices_directory (Optional[str]): directory the cycles are published in, None to skip it
+
+    Returns:
+        Set[str]: names of the cycles not yet moved or still being copied to the backups
+    """
+    pending = set(checkpoint.reported) if checkpoint is not None else set()
+    if devices_directory and os.path.isdir(devices_directory):
+        with os.scandir(devices_directory) as entries:
+            for entry in entries:
+                # Hidden -noreport directories are counted cycles whose copy to the backups is not done
+                if is_staging(entry.name) and entry.name.endswith(PUBLISHED_SUFFIX):
+                    pending.add(cycle_name(entry.name))
+    return pending
+
+
+def process_cycle_batch(cycle_directories: Sequence[str], verify_hash: bool,
+                        index_path: Optional[str] = None) -> PartialReport:
+    """
+    Count the records of a batch of cycles in a worker process
+
+    Args:
+        cycle_directories (Sequence[str]): directories of the cycles, in order
+        verify_hash (bool): recompute and check the hash of every record
+        index_path (Optional[str]): record index the records are inserted into, None to disable
+
+    Returns:
+        PartialReport: counts of the batch
+    """
+    worker = Reporter(verify_hash=verify_hash, workers=1, index_path=index_path)
+    worker.log_per_file = False
+    try:
+        worker.ingest_cycles(list(cycle_directories))
+    finally:
+        worker.close()
+    return PartialReport(worker.devices_reports, worker.records_processed, worker.hashes_checked,
+                         worker.hash_mismatches, worker.incomplete_files)
+
+
+class Backfill:
+    """
+    Rebuild the reporter aggregate from the backed up cycles
+
+    Attributes:
+        backup_directory (str): directory the reported cycles were moved to
+        progress_path (str): checkpoint of the backfill progress, removed once it completes
+        workers (int): processes the cycles are split across
+        cycles_per_task (int): cycles processed by a worker per task
+        save_interval (float): seconds between two saves of the progress
+        verify_hash (bool): recompute and check the hash of every record
+        index_path (Optional[str]): record index the records are inserted into, None to disable
+        progress (Checkpoint): counts of the cycles merged so far and the last of them
+        cycles_merged (int): cycles merged by this run
+    """
+    def __init__(self, backup_directory: str, progress_path: str, workers: int = 1, cycles_per_task: int = 64,
+                 save_interval: float = 30.0, verify_hash: bool = False, index_path: Optional[str] = None) -> None:
+        if workers < 1:
+            raise ValueError(f"Backfill workers must be at least 1: {workers}")
+        if cycles_per_task < 1:
+            raise ValueError(f"Cycles per task must be at least 1: {cycles_per_task}")
+        self.backup_directory: str = backup_directory
+        self.progress_path: str = progress_path
+        self.workers: int = workers
+        self.cycles_per_task: int = cycles_per_task
+        self.save_interval: float = save_interval
+        self.verify_hash: bool = verify_hash
+        self.index_path: Optional[str] = index_path
+        self.progress: Checkpoint = Checkpoint(new_status_counts())
+        self.cycles_merged: int = 0
+
+    def resume(self) -> None:
+        """Continue from the saved progress, if any"""
+        saved = load_checkpoint(self.progress_path)
+        if saved is None:
+            return
+        if not saved.last_cycle:
+            logger.warning("Progreso %s sin último ciclo, el backfill empieza de nuevo.", self.progress_path)
+            return
+        # Progress saved with other vocabularies is remapped by name
+        self.progress.devices_reports.merge(saved.devices_reports)
+        self.progress.last_cycle = saved.last_cycle
+        self.progress.records_processed = saved.records_processed
+        self.progress.hashes_checked = saved.hashes_checked
+        self.progress.hash_mismatches = saved.hash_mismatches
+        logger.info("Backfill reanudado desde %s: ciclo %s, %d registros.", self.progress_path,
+                    self.progress.last_cycle, self.progress.records_processed)
+
+    def merge(self, partial: PartialReport, last_cycle: str) -> None:
+        """Add the counts of a batch whose last cycle, in cycle order, is last_cycle"""
+        self.progress.devices_reports.merge(partial.devices_reports)
+        self.progress.records_processed += partial.records_processed
+        self.progress.hashes_checked += partial.hashes_checked
+        self.progress.hash_mismatches += partial.hash_mismatches
+        self.progress.last_cycle = last_cycle
+
+    def save(self) -> None:
+        """Save the progress"""
+        save_checkpoint(self.progress_path, self.progress)
+
+    def run(self) -> Checkpoint:
+        """
+        Merge every backed up cycle above the saved progress
+
+        Batches are merged in cycle order and the progress is saved every
+        save_interval seconds, and once more if the run is interrupted.
+
+        Returns:
+            Checkpoint: counts of every backed up cycle
+        """
+        # Cycles sharing a number are ordered by name, so a batch boundary between them resumes exactly
+        resume_after = cycle_order(self.progress.last_cycle) if self.progress.last_cycle else (0, '')
+        cycles = [(number, path) for number, path in list_cycles(self.backup_directory)
+                  if cycle_order(path) > resume_after]
+        batches = [cycles[i:i + self.cycles_per_task] for i in range(0, len(cycles), self.cycles_per_task)]
+        logger.info("Backfill de %d ciclos en %d tareas con %d procesos.", len(cycles), len(batches), self.workers)
+
+        arguments = ([[path for _, path in batch] for batch in batches], [self.verify_hash] * len(batches),
+                     [self.index_path] * len(batches))
+        executor = None
+        if self.workers == 1:
+            results = map(process_cycle_batch, *arguments)
+        else:
+            executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker_logging)
+            results = executor.map(process_cycle_batch, *arguments)
+
+        last_save = time.monotonic()
+        try:
+            for batch, partial in zip(batches, results):
+                self.merge(partial, cycle_name(os.path.basename(batch[-1][1])))
+                self.cycles_merged += len(batch)
+                if time.monotonic() - last_save >= self.save_interval:
+                    self.save()
+                    last_save = time.monotonic()
+                    logger.info("Backfill: %d/%d ciclos, %d registros.", self.cycles_merged, len(cycles),
+                                self.progress.records_processed)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+            if self.cycles_merged:
+                self.save()
+        return self.progress
+
+    def publish(self, checkpoint_path: str, devices_directory: Optional[str] = None) -> None:
+        """
+        Replace the reporter checkpoint with the rebuilt aggregate and drop the progress
+
+        The rebuilt aggregate only holds the backups. Cycles the reporter
+        counted but has not backed up yet, not moved before it stopped or
+        still being copied, would be lost with its counts, so the aggregate
+        is only published once there are none. Cycles never counted stay in
+        the devices directory and the reporter counts them on its next run.
+
+        Args:
+            checkpoint_path (str): checkpoint the reporter warm-starts from
+            devices_directory (Optional[str]): directory the cycles are published in, checked for copies in progress
+
+        Raises:
+            RuntimeError: if counted cycles are not in the backups yet; the progress is kept
+        """
+        pending = pending_backups(load_checkpoint(checkpoint_path), devices_directory)
+        if pending:
+            raise RuntimeError(f"{len(pending)} reported cycles are not backed up yet, run the reporter until "
+                               f"they are moved and publish again: {', '.join(sorted(pending)[:5])}")
+        save_checkpoint(checkpoint_path, self.progress)
+        if os.path.exists(self.progress_path):
+            os.remove(self.progress_path)
+        logger.info("Agregado reconstruido en %s: %d registros hasta el ciclo %s.", checkpoint_path,
+                    self.progress.records_processed, self.progress.last_cycle)
+
+
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    reporter_config = config.get('reporter', {})
+    parser = argparse.ArgumentParser(description='Rebuild the Apollo 11 reporter aggregate from the backups')
+    parser.add_argument('--backups', default=config['routes'][2]['backups'],
+                        help='Directory the reported cycles were moved to')
+    parser.add_argument('--devices', default=config['routes'][1]['devices'],
+                        help='Directory the cycles are published in, checked for backups in progress')
+    parser.add_argument('--workers', type=int, default=backfill_config.get('workers') or os.cpu_count() or 1,
+                        help='Number of processes the cycles are split across')
+    parser.add_argument('--cycles_per_task', type=int, default=backfill_config.get('cycles_per_task', 64),
+                        help='Cycles processed by a worker per task')
+    parser.add_argument('--progress',
+                        default=backfill_config.get('progress', './apolo_11/results/checkpoint/backfill.npz'),
+                        help='Progress checkpoint an interrupted backfill resumes from')
+    parser.add_argument('--restart', action='store_true', help='Ignore the saved progress and start over')
+    parser.add_argument('--checkpoint',
+                        default=reporter_config.get('checkpoint') or './apolo_11/results/checkpoint/reporter.npz',
+                        help='Reporter checkpoint the rebuilt aggregate replaces')
+    parser.add_argument('--index', default=reporter_config.get('index', {}).get('path') or '',
+                        help='SQLite record index the records are inserted into (empty disables)')
+    parser.add_argument('--verify_hash', action='store_true', help='Recompute and check the hash of every record')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = _parse_args(argv)
+    setup_logging()
+    try:
+        backfill = Backfill(args.backups, args.progress, args.workers, args.cycles_per_task,
+                            backfill_config.get('save_interval', 30.0), args.verify_hash, args.index or None)
+        if not args.restart:
+            backfill.resume()
+        backfill.run()
+        backfill.publish(args.checkpoint, args.devices)
+    except KeyboardInterrupt:
+        logger.info("Backfill interrumpido, se reanudará desde %s.", args.progress)
+    except RuntimeError as e:
+        logger.error("Agregado no publicado, el progreso se conserva en %s: %s", args.progress, str(e))
+    finally:
+        shutdown_logging()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,289 @@
+"""
+Backup relocation of reported cycles for the Apollo 11 reporter.
+
+A reported cycle is moved to the backups directory with one atomic
+os.rename whenever both directories share a filesystem. Across
+filesystems the cycle is first hidden with a rename under its staging
+name, so no reporting run sees it again, and then copied in the
+background: files are copied in parallel by the kernel with
+os.copy_file_range or os.sendfile where available, or through a large
+buffer otherwise, into a hidden directory of the backups filesystem.
+Once every copy is verified the copy is renamed into place and the
+source removed, so a backup is either complete or absent. Hidden
+sources left by an interrupted copy are picked up again on the next
+move; when the backup was already renamed into place, it is verified
+against the source and only the source is removed.
+"""
+
+import errno
+import hashlib
+import os
+import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .logging_config import get_logger
+from .publish import STAGING_PREFIX
+
+logger = get_logger(__name__)
+
+VERIFY_MODES: Tuple[str, ...] = ('none', 'size', 'checksum')
+COPY_BUFFER_SIZE: int = 8 * 1024 * 1024
+
+# Errors of a kernel copy call that only mean the call does not apply to these files
+_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF}
+
+
+def _copy_kernel(source_fd: int, destination_fd: int, size: int, chunk_size: int) -> Optional[int]:
+    """Copy with copy_file_range or sendfile, None if neither applies"""
+    for name in ('copy_file_range', 'sendfile'):
+        if not hasattr(os, name):
+            continue
+        offset = 0
+        try:
+            while offset < size:
+                count = min(chunk_size, size - offset)
+                if name == 'copy_file_range':
+                    copied = os.copy_file_range(source_fd, destination_fd, count)
+                else:
+                    copied = os.sendfile(destination_fd, source_fd, offset, count)
+                if not copied:
+                    break
+                offset += copied
+            return offset
+        except OSError as e:
+            if offset or e.errno not in _UNSUPPORTED:
+                raise
+    return None
+
+
+def copy_file(source: str, destination: str, buffer_size: int = COPY_BUFFER_SIZE) -> int:
+    """
+    Copy a file and its metadata, in the kernel when possible
+
+    Args:
+        source (str): file to copy
+        destination (str): path of the copy
+        buffer_size (int): bytes copied per call
+
+    Returns:
+        int: number of bytes copied
+    """
+    with open(source, 'rb') as source_file, open(destination, 'wb') as destination_file:
+        size = os.fstat(source_file.fileno()).st_size
+        copied = _copy_kernel(source_file.fileno(), destination_file.fileno(), size, buffer_size)
+        if copied is None:
+            copied = 0
+            buffer = bytearray(buffer_size)
+            view = memoryview(buffer)
+            while True:
+                count = source_file.readinto(buffer)
+                if not count:
+                    break
+                destination_file.write(view[:count])
+                copied += count
+    shutil.copystat(source, destination)
+    return copied
+
+
+def file_digest(path: str, buffer_size: int = COPY_BUFFER_SIZE) -> bytes:
+    """BLAKE2b digest of a file"""
+    digest = hashlib.blake2b()
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    with open(path, 'rb') as file:
+        while True:
+            count = file.readinto(buffer)
+            if not count:
+                return digest.digest()
+            digest.update(view[:count])
+
+
+def verify_copy(source: str, destination: str, verify: str = 'size') -> None:
+    """
+    Check a copy against its source
+
+    Raises:
+        OSError: if the copy does not match its source
+    """
+    if verify == 'none':
+        return
+    if os.stat(source).st_size != os.stat(destination).st_size:
+        raise OSError(errno.EIO, "Copy size does not match its source", destination)
+    if verify == 'checksum' and file_digest(source) != file_digest(destination):
+        raise OSError(errno.EIO, "Copy checksum does not match its source", destination)
+
+
+def verify_tree(source: str, destination: str, verify: str = 'size') -> int:
+    """
+    Check every file of a copied directory tree against its source
+
+    Returns:
+        int: number of files checked
+
+    Raises:
+        OSError: if a file of the copy is missing or does not match its source
+    """
+    files = 0
+    for root, _, names in os.walk(source):
+        target = os.path.join(destination, os.path.relpath(root, source))
+        for name in names:
+            if not os.path.isfile(os.path.join(target, name)):
+                raise OSError(errno.ENOENT, "Copy is missing a file of its source", os.path.join(target, name))
+            verify_copy(os.path.join(root, name), os.path.join(target, name), verify)
+            files += 1
+    return files
+
+
+def copy_tree(source: str, destination: str, workers: int = 4, buffer_size: int = COPY_BUFFER_SIZE,
+              verify: str = 'size') -> Tuple[int, int]:
+    """
+    Copy a directory tree, its files in parallel, and verify every copy
+
+    Args:
+        source (str): directory to copy
+        destination (str): path of the copy, must not exist
+        workers (int): files copied at the same time
+        buffer_size (int): bytes copied per call
+        verify (str): verification of each copy, see VERIFY_MODES
+
+    Returns:
+        Tuple[int, int]: number of files and bytes copied
+    """
+    files: List[Tuple[str, str]] = []
+    for root, dirs, names in os.walk(source):
+        target = os.path.join(destination, os.path.relpath(root, source))
+        os.makedirs(target)
+        files.extend((os.path.join(root, name), os.path.join(target, name)) for name in names)
+
+    def copy(paths: Tuple[str, str]) -> int:
+        copied = copy_file(*paths, buffer_size=buffer_size)
+        verify_copy(*paths, verify=verify)
+        return copied
+
+    if workers > 1 and len(files) > 1:
+        with ThreadPoolExecutor(min(workers, len(files)), thread_name_prefix='apolo11-backup-copy') as executor:
+            copied = sum(executor.map(copy, files))
+    else:
+        copied = sum(map(copy, files))
+    for root, _, _ in os.walk(source):
+        shutil.copystat(root, os.path.join(destination, os.path.relpath(root, source)))
+    return len(files), copied
+
+
+class BackupMover:
+    """
+    Move directories to the backups, renaming when possible and copying across filesystems
+
+    Attributes:
+        workers (int): files copied at the same time across filesystems
+        buffer_size (int): bytes copied per call
+        verify (str): verification of each copy, see VERIFY_MODES
+        background (bool): copy across filesystems in a background thread
+        moves_renamed (int): directories moved with a rename
+        moves_copied (int): directories moved by copying
+    """
+    def __init__(self, workers: int = 4, buffer_size: int = COPY_BUFFER_SIZE, verify: str = 'size',
+                 background: bool = True) -> None:
+        if workers < 1:
+            raise ValueError(f"Backup workers must be at least 1: {workers}")
+        if verify not in VERIFY_MODES:
+            raise ValueError(f"Unknown backup verification: {verify}")
+        self.workers: int = workers
+        self.buffer_size: int = buffer_size
+        self.verify: str = verify
+        self.background: bool = background
+        self.moves_renamed: int = 0
+        self.moves_copied: int = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight: Dict[str, Future] = {}
+
+    def move(self, source: str, destination: str) -> Optional[Future]:
+        """
+        Move a directory to its backup path
+
+        Args:
+            source (str): directory to move
+            destination (str): backup path of the directory
+
+        Returns:
+            Optional[Future]: the background copy, None if the move is already done
+        """
+        try:
+            os.rename(source, destination)
+            self.moves_renamed += 1
+            return None
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+
+        # Hidden under its staging name, the cycle is out of sight of the reporter until the copy is done
+        parent, name = os.path.split(os.path.normpath(source))
+        hidden = os.path.join(parent, STAGING_PREFIX + name)
+        os.rename(source, hidden)
+        return self.copy(hidden, destination)
+
+    def copy(self, hidden: str, destination: str) -> Optional[Future]:
+        """Copy a directory hidden by move, or left hidden by an interrupted copy, to its backup path"""
+        if hidden in self._in_flight:
+            return self._in_flight[hidden]
+        if not self.background:
+            self._copy(hidden, destination)
+            return None
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(1, thread_name_prefix='apolo11-backup')
+        future = self._executor.submit(self._copy, hidden, destination)
+        self._in_flight[hidden] = future
+        future.add_done_callback(lambda _: self._in_flight.pop(hidden, None))
+        return future
+
+    def _copy(self, hidden: str, destination: str) -> None:
+        if os.path.exists(destination):
+            # Only the source removal of a previous copy was left undone
+            try:
+                files = verify_tree(hidden, destination, self.verify)
+            except Exception as e:
+                logger.error("Respaldo %s no coincide con su origen %s: %s", destination, hidden, str(e))
+                raise
+            self._remove_source(hidden, destination)
+            logger.info("Respaldo %s ya copiado (%d archivos), se elimina su origen.", destination, files)
+            return
+
+        parent, name = os.path.split(os.path.normpath(destination))
+        staging = os.path.join(parent, STAGING_PREFIX + name)
+        try:
+            if os.path.exists(staging):
+                shutil.rmtree(staging)
+            files, copied = copy_tree(hidden, staging, self.workers, self.buffer_size, self.verify)
+            os.rename(staging, destination)
+        except Exception as e:
+            logger.error("Error copiando %s al respaldo %s: %s", hidden, destination, str(e))
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        self.moves_copied += 1
+        self._remove_source(hidden, destination)
+        logger.info("Respaldo copiado entre sistemas de archivos: %s (%d archivos, %d bytes).", destination,
+                    files, copied)
+
+    def _remove_source(self, hidden: str, destination: str) -> None:
+        """Remove the hidden source of a completed backup, left for the next move if it fails"""
+        try:
+            shutil.rmtree(hidden)
+        except OSError as e:
+            logger.warning("Respaldo %s completo, no se pudo eliminar su origen %s: %s", destination, hidden,
+                           str(e))
+
+    def wait(self) -> None:
+        """Wait for every background copy to finish"""
+        for future in list(self._in_flight.values()):
+            # Failed copies are logged and keep their hidden source for the next move
+            try:
+                future.result()
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        """Finish the background copies and release the thread"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
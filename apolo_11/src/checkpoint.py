@@ -0,0 +1,112 @@
+"""
+Reporter checkpoints for the Apollo 11 reporter.
+
+After every run the reporter saves a snapshot of its aggregate counts
+in a single NumPy .npz file, together with the names of the cycles
+already counted but not yet moved to the backups. On startup it
+warm-starts from the snapshot and skips those cycles, so the cost of a
+run depends on the new cycles and not on the whole history, and a cycle
+left behind by a crash between saving and moving is not counted twice.
+The snapshot is replaced atomically, a crash leaves either the old or
+the new one.
+"""
+
+import json
+import os
+import zipfile
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import numpy as np
+
+from .logging_config import get_logger
+from .status_counts import StatusCounts
+
+logger = get_logger(__name__)
+
+CHECKPOINT_VERSION: int = 1
+
+
+@dataclass
+class Checkpoint:
+    """Saved state of a reporter
+
+    Attributes:
+        devices_reports (StatusCounts): status counts by mission and device type
+        last_cycle (str): name of the last cycle merged by a backfill, in cycle order, empty if none
+        records_processed (int): number of records processed
+        hashes_checked (int): number of record hashes verified
+        hash_mismatches (int): number of record hashes that did not match
+        reported (List[str]): cycles counted but not yet backed up, by name without the -noreport suffix
+    """
+    devices_reports: StatusCounts
+    last_cycle: str = ''
+    records_processed: int = 0
+    hashes_checked: int = 0
+    hash_mismatches: int = 0
+    reported: List[str] = field(default_factory=list)
+
+
+def save_checkpoint(path: str, checkpoint: Checkpoint) -> None:
+    """
+    Atomically replace the checkpoint file with a new snapshot
+
+    Args:
+        path (str): path of the checkpoint file
+        checkpoint (Checkpoint): state to save
+    """
+    counts = checkpoint.devices_reports
+    meta = {
+        'version': CHECKPOINT_VERSION,
+        'last_cycle': checkpoint.last_cycle,
+        'records_processed': checkpoint.records_processed,
+        'hashes_checked': checkpoint.hashes_checked,
+        'hash_mismatches': checkpoint.hash_mismatches,
+        'reported': checkpoint.reported,
+        'missions': counts.mission_names,
+        'types': counts.device_types,
+        'statuses': counts.device_statuses,
+        'overflow': [[*key, count] for key, count in counts.overflow.items()],
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as file:
+        np.savez(file, counts=counts.counts, meta=np.array(json.dumps(meta)))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, path)
+
+
+def load_checkpoint(path: str) -> Optional[Checkpoint]:
+    """
+    Load the checkpoint file
+
+    Args:
+        path (str): path of the checkpoint file
+
+    Returns:
+        Optional[Checkpoint]: the saved state, None if there is no usable checkpoint
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            dense = data['counts']
+        if meta['version'] != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {meta['version']}")
+        counts = StatusCounts(meta['missions'], meta['types'], meta['statuses'])
+        if dense.shape != counts.counts.shape:
+            raise ValueError(f"Checkpoint counts do not match their vocabularies: {dense.shape}")
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+        logger.warning("Checkpoint %s inválido, se ignora: %s", path, str(e))
+        return None
+
+    counts.counts[...] = dense
+    for mission_name, device_type, device_status, count in meta['overflow']:
+        counts.overflow[(mission_name, device_type, device_status)] = count
+    # Checkpoints saved before the reported cycles and the last cycle were tracked have none
+    return Checkpoint(counts, meta.get('last_cycle', ''), meta['records_processed'], meta['hashes_checked'],
+                      meta['hash_mismatches'], meta.get('reported', []))
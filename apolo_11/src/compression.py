@@ -0,0 +1,147 @@
+"""
+Compression codecs for the Apollo 11 cycle output.
+
+Generated files, segments and record files can be compressed on write
+with gzip or lzma from the standard library, or zstd when the optional
+zstandard package is installed. Compressed files carry the codec
+suffix after their own, and readers detect the codec from the magic
+number of the data, so uncompressed files keep working unchanged.
+"""
+
+import gzip
+import lzma
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+@dataclass(frozen=True)
+class Codec:
+    """Compression codec
+
+    Attributes:
+        name (str): name of the codec in the configuration
+        suffix (str): suffix appended to compressed file names
+        magic (bytes): leading bytes of the compressed data
+        compress (Callable[[bytes, Optional[int]], bytes]): compress data at a level, default if None
+        decompress (Callable[[bytes], bytes]): decompress data
+    """
+    name: str
+    suffix: str
+    magic: bytes
+    compress: Callable[[bytes, Optional[int]], bytes]
+    decompress: Callable[[bytes], bytes]
+
+
+def _gzip_compress(data: bytes, level: Optional[int]) -> bytes:
+    # mtime=0 keeps the output reproducible
+    return gzip.compress(data, compresslevel=6 if level is None else level, mtime=0)
+
+
+def _lzma_compress(data: bytes, level: Optional[int]) -> bytes:
+    return lzma.compress(data, preset=level)
+
+
+def _zstd_compress(data: bytes, level: Optional[int]) -> bytes:
+    return zstandard.ZstdCompressor(level=3 if level is None else level).compress(data)
+
+
+def _zstd_decompress(data: bytes) -> bytes:
+    if zstandard is None:
+        raise RuntimeError("zstd data found but the zstandard package is not installed")
+    return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+
+def _identity(data: bytes, level: Optional[int] = None) -> bytes:
+    return data
+
+
+NONE = Codec('none', '', b'', _identity, _identity)
+
+CODECS: Dict[str, Codec] = {
+    'none': NONE,
+    'gzip': Codec('gzip', '.gz', b'\x1f\x8b', _gzip_compress, gzip.decompress),
+    'lzma': Codec('lzma', '.xz', b'\xfd7zXZ\x00', _lzma_compress, lzma.decompress),
+    'zstd': Codec('zstd', '.zst', b'\x28\xb5\x2f\xfd', _zstd_compress, _zstd_decompress),
+}
+
+
+def available_codecs() -> List[str]:
+    """Names of the codecs usable in this environment"""
+    return [name for name in CODECS if name != 'zstd' or zstandard is not None]
+
+
+def get_codec(name: Optional[str]) -> Codec:
+    """
+    Get a codec by name
+
+    Args:
+        name (Optional[str]): name of the codec, 'none' if None
+
+    Returns:
+        Codec: the codec
+
+    Raises:
+        ValueError: if the codec is unknown or its package is not installed
+    """
+    codec = CODECS.get(name or 'none')
+    if codec is None:
+        raise ValueError(f"Unknown compression codec: {name}")
+    if codec.name not in available_codecs():
+        raise ValueError(f"Compression codec {name} requires the zstandard package")
+    return codec
+
+
+def detect_codec(data: bytes) -> Codec:
+    """Codec of data from its magic number, NONE if it is not compressed"""
+    for codec in CODECS.values():
+        if codec.magic and data.startswith(codec.magic):
+            return codec
+    return NONE
+
+
+def decompress(data: bytes) -> bytes:
+    """Decompress data compressed with any codec, returning uncompressed data unchanged"""
+    return detect_codec(data).decompress(data)
+
+
+def split_suffix(filename: str) -> Tuple[str, str]:
+    """
+    Split the codec suffix off a file name
+
+    Returns:
+        Tuple[str, str]: file name without the codec suffix and the suffix, '' if none
+    """
+    for codec in CODECS.values():
+        if codec.suffix and filename.endswith(codec.suffix):
+            return filename[:-len(codec.suffix)], codec.suffix
+    return filename, ''
+
+
+def read_bytes(path: str, size: Optional[int] = None) -> bytes:
+    """
+    Read a file, decompressing it if needed
+
+    Args:
+        path (str): path of the file
+        size (Optional[int]): expected size of the file on disk, read in a single
+            call of that size instead of sizing the read from the file
+
+    Returns:
+        bytes: uncompressed content
+
+    Raises:
+        ValueError: if the file does not have the expected size
+    """
+    with open(path, 'rb') as file:
+        if size is None:
+            return decompress(file.read())
+        # One byte more than expected tells a longer file from a complete one
+        data = file.read(size + 1)
+    if len(data) != size:
+        raise ValueError(f"Unexpected size of {path}: {len(data)} bytes read, {size} expected")
+    return decompress(data)
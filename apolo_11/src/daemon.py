@@ -0,0 +1,165 @@
+"""
+Streaming reporter daemon for the Apollo 11 system.
+
+Instead of reporting every reporter_interval seconds, the daemon
+watches the devices directory and ingests each cycle into the reporter
+counts as soon as it is published. Writing the stats report, saving the
+checkpoint and moving the ingested cycles to backup happen together at
+most once per debounce interval, so the report trails generation by
+seconds while a burst of cycles still costs a single report. A failed
+report keeps the cycles not yet moved and is retried a debounce later.
+"""
+
+import os
+import threading
+import time
+from typing import List, Optional
+
+from .logging_config import get_logger
+from .publish import cycle_number
+from .watcher import create_watcher, list_published
+
+logger = get_logger(__name__)
+
+
+class ReporterDaemon:
+    """
+    Ingest published cycles as they appear and refresh the report on a debounce
+
+    Attributes:
+        reporter_instance (Reporter): reporter the cycles are ingested into
+        devices_directory (str): directory the cycles are published in
+        backup_directory (str): directory reported cycles are moved to
+        debounce (float): maximum seconds between ingesting a cycle and reporting it
+        watcher: watcher of the devices directory
+        cycles_ingested (int): cycles ingested since start
+        reports_written (int): stats reports written since start
+        lock (threading.RLock): held while the reporter counts change, for concurrent readers
+    """
+    IDLE_TIMEOUT: float = 1.0
+
+    def __init__(self, reporter_instance, devices_directory: str, backup_directory: str, debounce: float = 2.0,
+                 watcher=None) -> None:
+        if debounce < 0:
+            raise ValueError(f"Debounce must not be negative: {debounce}")
+        self.reporter_instance = reporter_instance
+        self.devices_directory: str = devices_directory
+        self.backup_directory: str = backup_directory
+        self.debounce: float = debounce
+        self.watcher = watcher or create_watcher(devices_directory)
+        self.cycles_ingested: int = 0
+        self.reports_written: int = 0
+        self.lock = threading.RLock()
+        self._pending: List[str] = []
+        self._deadline: Optional[float] = None
+        self._stop = threading.Event()
+
+    def ingest(self, names: List[str]) -> int:
+        """
+        Ingest published cycles into the reporter counts
+
+        Args:
+            names (List[str]): names of published cycle directories
+
+        Returns:
+            int: number of cycles ingested, cycles already pending or counted are skipped
+        """
+        directories = [os.path.join(self.devices_directory, name)
+                       for name in sorted(set(names), key=lambda name: (cycle_number(name) or 0, name))]
+        directories = [directory for directory in directories if directory not in self._pending]
+        if not directories:
+            return 0
+        with self.lock:
+            try:
+                ingested = self.reporter_instance.ingest_cycles(directories)
+            except Exception as e:
+                logger.error("Error durante el procesamiento: %s", str(e))
+                return 0
+            # Only cycles counted now are moved by the next flush
+            self._pending.extend(ingested)
+        if not ingested:
+            return 0
+        self.cycles_ingested += len(ingested)
+        if self._deadline is None:
+            self._deadline = time.monotonic() + self.debounce
+        return len(ingested)
+
+    def flush(self) -> None:
+        """
+        Write the stats report, save the checkpoint and move the ingested cycles to backup
+
+        The ingested cycles are counted already and never ingested again, so
+        on failure the cycles not moved yet stay pending and the flush is
+        retried once the debounce expires again.
+        """
+        if not self._pending:
+            return
+        with self.lock:
+            moved = 0
+            try:
+                self.reporter_instance.generate_report_folder()
+                self.reporter_instance.generate_stats_report()
+                self.reporter_instance.save_checkpoint()
+                for directory in self._pending:
+                    self.reporter_instance.move_folder_to_backup(directory, self.backup_directory)
+                    moved += 1
+            except Exception as e:
+                logger.error("Error durante el procesamiento: %s", str(e))
+                # A cycle hidden by a failed copy is gone from its path, the next move resumes its copy
+                self._pending = [directory for directory in self._pending[moved:] if os.path.isdir(directory)]
+                self._deadline = time.monotonic() + self.debounce if self._pending else None
+                return
+            self._pending = []
+            self._deadline = None
+        self.reports_written += 1
+
+    def step(self, timeout: Optional[float] = None) -> int:
+        """
+        Wait for published cycles, ingest them and report once the debounce expires
+
+        Args:
+            timeout (Optional[float]): maximum seconds to wait, IDLE_TIMEOUT if None
+
+        Returns:
+            int: number of cycles ingested
+        """
+        wait = self.IDLE_TIMEOUT if timeout is None else timeout
+        if self._deadline is not None:
+            wait = min(wait, max(self._deadline - time.monotonic(), 0))
+        ingested = self.ingest(self.watcher.wait(wait))
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            self.flush()
+        return ingested
+
+    def resume_backups(self) -> None:
+        """Move the cycles a previous run counted but did not back up, and finish its interrupted copies"""
+        with self.lock:
+            try:
+                self.reporter_instance.move_folders_to_backup(self.devices_directory, self.backup_directory)
+            except Exception as e:
+                logger.error("Error durante el procesamiento: %s", str(e))
+
+    def run(self) -> None:
+        """Ingest the cycles already published, then every new one until stop() is called"""
+        logger.info("Reporter en modo continuo sobre %s, intervalo de reporte %.2f s.", self.devices_directory,
+                    self.debounce)
+        try:
+            self.resume_backups()
+            self.ingest(list_published(self.devices_directory))
+            while not self._stop.is_set():
+                self.step()
+        finally:
+            self.flush()
+            self.watcher.close()
+            logger.info("Reporter continuo detenido: %d ciclos, %d reportes.", self.cycles_ingested,
+                        self.reports_written)
+
+    def start(self) -> threading.Thread:
+        """Run the daemon in a background thread"""
+        thread = threading.Thread(target=self.run, name='apolo11-reporter-daemon', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self) -> None:
+        """Ask the daemon to report the pending cycles and return"""
+        self._stop.set()
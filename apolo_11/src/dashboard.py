@@ -3,7 +3,7 @@
 import time
 from datetime import datetime
 from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from rich.console import Console
 from rich.table import Table
@@ -33,6 +33,7 @@ class DashboardStats:
     current_cycle: int
     missions: Dict[str, MissionStats]
     last_report_time: Optional[datetime]
+    windows: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # window name -> summary
 
 
 class Dashboard:
@@ -58,6 +59,7 @@ class Dashboard:
         self.stats.files_generated = generator_stats.get('files_count', 0)
         self.stats.current_cycle = generator_stats.get('cycle', 0)
         self.stats.last_report_time = reporter_stats.get('last_report_time')
+        self.stats.windows = reporter_stats.get('windows', {})
 
         # Update mission statistics
         missions_data = reporter_stats.get('missions', {})
@@ -94,8 +96,14 @@ class Dashboard:
             Layout(name="right")
         )
 
-        # Left side - System Status
-        layout["left"].update(self._render_system_status())
+        # Left side - System Status, with the rolling windows below when configured
+        if self.stats.windows:
+            layout["left"].split_column(
+                Layout(self._render_system_status(), name="status"),
+                Layout(self._render_windows(), name="windows")
+            )
+        else:
+            layout["left"].update(self._render_system_status())
         # Right side - Mission Statistics
         layout["right"].update(self._render_mission_stats())
 
@@ -123,6 +131,26 @@ class Dashboard:
 
         return Panel(table, title="System Overview", border_style="blue")
 
+    def _render_windows(self) -> Panel:
+        """Render the rolling windows panel."""
+        table = Table(title="Rolling Windows", show_header=True, header_style="bold magenta")
+        table.add_column("Window", style="cyan", no_wrap=True)
+        table.add_column("Cycles", style="white")
+        table.add_column("Records", style="white")
+        table.add_column("Disconnections", style="red")
+        table.add_column("Operational", style="green")
+
+        for name, window in self.stats.windows.items():
+            table.add_row(
+                name,
+                str(window.get('cycles', 0)),
+                str(window.get('records', 0)),
+                str(window.get('disconnections', 0)),
+                f"{window.get('operational_percentage', 0.0):.2f}%"
+            )
+
+        return Panel(table, title="Recent Cycles", border_style="blue")
+
     def _render_mission_stats(self) -> Panel:
         """Render the mission statistics panel."""
         if not self.stats.missions:
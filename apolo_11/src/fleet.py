@@ -0,0 +1,168 @@
+"""
+Stateful device fleet model for the Apollo 11 generator.
+
+The fleet keeps every device as one position in a few compact NumPy
+arrays (mission, device type, device status and last-seen cycle), so
+millions of devices need no Python object each. Once per cycle every
+status advances through a Markov transition matrix applied to the
+whole array at once, and records are drawn from the fleet devices.
+"""
+
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+NEVER_SEEN: int = -1
+
+
+def transition_matrix(device_statuses: List[str], transitions: Dict[str, Dict[str, float]]) -> np.ndarray:
+    """
+    Build the row-stochastic status transition matrix from its YAML definition
+
+    Missing probabilities are 0 and each row is normalized to sum 1. A
+    status without a row, or with only zero probabilities, keeps its status.
+
+    Args:
+        device_statuses (List[str]): device statuses, indexed by status index
+        transitions (Dict[str, Dict[str, float]]): probability of moving from
+            each status to each next status
+
+    Returns:
+        np.ndarray: matrix whose [current, next] entry is the transition probability
+
+    Raises:
+        ValueError: if a status is unknown or a probability is negative
+    """
+    positions = {status: index for index, status in enumerate(device_statuses)}
+    matrix = np.zeros((len(device_statuses), len(device_statuses)))
+    for current, row in (transitions or {}).items():
+        if current not in positions:
+            raise ValueError(f"Unknown device status in fleet transitions: {current}")
+        for following, probability in (row or {}).items():
+            if following not in positions:
+                raise ValueError(f"Unknown device status in fleet transitions: {following}")
+            if probability < 0:
+                raise ValueError(f"Negative transition probability from {current} to {following}")
+            matrix[positions[current], positions[following]] = probability
+
+    totals = matrix.sum(axis=1)
+    still = totals == 0
+    matrix[still, still.nonzero()[0]] = 1.0
+    totals[still] = 1.0
+    return matrix / totals[:, None]
+
+
+class DeviceFleet:
+    """
+    Array-backed fleet of devices whose statuses evolve every cycle
+
+    Attributes:
+        mission_idx (np.ndarray): mission index of each device
+        type_idx (np.ndarray): device type index of each device
+        status_idx (np.ndarray): current device status index of each device
+        last_seen (np.ndarray): last cycle a record was drawn from each device, -1 if never
+        transitions (np.ndarray): status transition matrix
+        cycle (int): current cycle of the fleet
+    """
+    def __init__(self, mission_idx: np.ndarray, type_idx: np.ndarray, status_idx: np.ndarray,
+                 transitions: np.ndarray, rng: Optional[np.random.Generator] = None) -> None:
+        if not len(mission_idx) == len(type_idx) == len(status_idx):
+            raise ValueError("Fleet arrays must have the same length")
+        if transitions.shape != (transitions.shape[0], transitions.shape[0]):
+            raise ValueError(f"Transition matrix must be square: {transitions.shape}")
+        self.mission_idx: np.ndarray = np.asarray(mission_idx, dtype=np.int16)
+        self.type_idx: np.ndarray = np.asarray(type_idx, dtype=np.int16)
+        self.status_idx: np.ndarray = np.asarray(status_idx, dtype=np.int16)
+        self.last_seen: np.ndarray = np.full(len(self.mission_idx), NEVER_SEEN, dtype=np.int32)
+        self.transitions: np.ndarray = transitions
+        self.cycle: int = 0
+        self.rng: np.random.Generator = rng or np.random.default_rng()
+        self._cumulative: np.ndarray = np.cumsum(transitions, axis=1)
+        self._cumulative[:, -1] = 1.0
+
+    @classmethod
+    def random(cls, size: int, mission_count: int, type_count: int, transitions: np.ndarray,
+               seed: Union[None, int, np.random.SeedSequence] = None) -> 'DeviceFleet':
+        """
+        Build a fleet with uniformly drawn missions, types and statuses
+
+        Args:
+            size (int): number of devices
+            mission_count (int): number of missions
+            type_count (int): number of device types
+            transitions (np.ndarray): status transition matrix
+            seed: seed of the fleet random stream
+
+        Returns:
+            DeviceFleet: the new fleet
+        """
+        rng = np.random.Generator(np.random.PCG64(seed))
+        return cls(rng.integers(0, mission_count, size=size, dtype=np.int16),
+                   rng.integers(0, type_count, size=size, dtype=np.int16),
+                   rng.integers(0, len(transitions), size=size, dtype=np.int16),
+                   transitions, rng)
+
+    def __len__(self) -> int:
+        return len(self.mission_idx)
+
+    def advance(self, cycle: Optional[int] = None) -> None:
+        """
+        Move every device to its next status and start a new cycle
+
+        Args:
+            cycle (Optional[int]): number of the new cycle, the next one if None
+        """
+        draws = self.rng.random(len(self))
+        following = np.empty_like(self.status_idx)
+        for status in range(len(self.transitions)):
+            devices = self.status_idx == status
+            following[devices] = np.searchsorted(self._cumulative[status], draws[devices], side='right')
+        self.status_idx = following
+        self.cycle = self.cycle + 1 if cycle is None else cycle
+
+    def sample(self, n: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Draw n records from random fleet devices and mark them seen in the current cycle
+
+        Args:
+            n (int): number of records
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: mission, device type
+            and device status indices of the records
+        """
+        devices = self.rng.integers(0, len(self), size=n)
+        self.last_seen[devices] = self.cycle
+        return self.mission_idx[devices], self.type_idx[devices], self.status_idx[devices]
+
+    def status_counts(self) -> np.ndarray:
+        """Number of devices in each status"""
+        return np.bincount(self.status_idx, minlength=len(self.transitions))
+
+
+def load_fleet(fleet_config: dict, mission_names: List[str], device_types: List[str],
+               device_statuses: List[str], size: Optional[int] = None,
+               seed: Union[None, int, np.random.SeedSequence] = None) -> DeviceFleet:
+    """
+    Build a random fleet from the fleet section of the configuration
+
+    Args:
+        fleet_config (dict): fleet section of the configuration
+        mission_names (List[str]): mission names
+        device_types (List[str]): device types
+        device_statuses (List[str]): device statuses
+        size (Optional[int]): number of devices, fleet_config['size'] if None
+        seed: seed of the fleet random stream
+
+    Returns:
+        DeviceFleet: the new fleet
+    """
+    size = fleet_config.get('size', 100000) if size is None else size
+    matrix = transition_matrix(device_statuses, fleet_config.get('transitions', {}))
+    fleet = DeviceFleet.random(size, len(mission_names), len(device_types), matrix, seed)
+    logger.info("Flota de %d dispositivos creada.", size)
+    return fleet
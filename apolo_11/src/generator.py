@@ -1,19 +1,36 @@
-from dataclasses import dataclass
-from typing import Union
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 import os
-import random
 import uuid
 from datetime import datetime
 
+import numpy as np
+
 from .config import ConfigManager
 from .classes import Mission, Device
-from .logging_config import get_logger
+from .compression import Codec, get_codec
+from .cycle_store import CycleSequence
+from .fleet import DeviceFleet
+from .hashing import hash_batch, stable_hash
+from .logging_config import get_logger, log_per_file
+from .manifest import build_manifest, write_manifest
+from .publish import (check_durability, create_staging_directory, fsync_path, publish_directory,
+                      sweep_staging_directories)
+from .records import RECORD_SUFFIX, RecordSchema, encode_records
+from .segment import SEGMENT_SUFFIX, encode_segment, write_segment
+from .templates import ClockCache, ContentTemplates
+from .writer import FileWriterPool
 
 logger = get_logger(__name__)
 
 config: dict = ConfigManager.read_yaml_config()
 
+generator_config: dict = config.get('generator', {})
+
+UNKNOWN_INDEX: int = -1
+OUTPUT_MODES: Tuple[str, ...] = ('files', 'segment', 'binary')
+
 
 @dataclass
 class GeneratedFile:
@@ -51,19 +68,99 @@ class CustomContent(DefaultContent):
         return f"{default_content}\nID: {self.unique_id}" if self.unique_id else default_content
 
 
+@dataclass
+class RecordBatch:
+    """Represents a batch of generated records stored as index arrays
+
+    Records of unknown missions have UNKNOWN_INDEX as device type and
+    device status index.
+
+    Attributes:
+        current_date (str): date shared by every record of the batch
+        file_numbers (np.ndarray): file number of each record
+        mission_idx (np.ndarray): index of each record into the mission names
+        type_idx (np.ndarray): index of each record into the device types
+        status_idx (np.ndarray): index of each record into the device statuses
+        hash_values (np.ndarray): stable uint64 hash of each record, 0 for unknown missions
+        unique_ids (Dict[int, str]): unique id of unknown mission records by batch position
+    """
+    current_date: str
+    file_numbers: np.ndarray
+    mission_idx: np.ndarray
+    type_idx: np.ndarray
+    status_idx: np.ndarray
+    hash_values: np.ndarray
+    unique_ids: Dict[int, str] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.file_numbers)
+
+    @property
+    def known(self) -> np.ndarray:
+        """Boolean mask of the records that belong to a known mission"""
+        return self.type_idx != UNKNOWN_INDEX
+
+
+@dataclass
+class CycleSummary:
+    """Summary of a generation cycle
+
+    Attributes:
+        cycle (int): cycle number used to name the output directory
+        directory (str): output directory of the cycle
+        files_count (int): number of files generated in the cycle
+        status_counts (Dict[str, int]): number of records by device status
+    """
+    cycle: int
+    directory: str
+    files_count: int
+    status_counts: Dict[str, int] = field(default_factory=dict)
+
+
 class Generator:
     """Generate files with mission and devise data
 
     Attributes:
         mission_instance (Mission): instance of the Mission class
         device_instance (Device): instance of the Device class
-        generate_files_call_count (int): number of times generate_files method is called
+        generate_files_call_count (int): number of the last cycle generated
+        rng (np.random.Generator): PCG64 random stream owned by this generator
+        writer (FileWriterPool): pool used to write the files of a cycle
+        output_mode (str): 'files' writes one file per record, 'segment' packs
+            the records of a cycle in one segment file
+        cycle_store (CycleSequence): store handing out cycle numbers
+        clock (ClockCache): current date formatted once per second
 
     """
-    def __init__(self):
+    def __init__(self, seed: Union[None, int, np.random.SeedSequence] = None, writer_workers: Optional[int] = None,
+                 writer_backend: Optional[str] = None, output_mode: Optional[str] = None,
+                 cycle_store: Optional[CycleSequence] = None, fleet: Optional[DeviceFleet] = None,
+                 compression: Optional[str] = None, durability: Optional[str] = None):
         self.mission_instance: Mission = Mission()
         self.device_instance: Device = Device()
         self.generate_files_call_count: int = 0
+        self.rng: np.random.Generator = np.random.Generator(np.random.PCG64(seed))
+        self.durability: str = check_durability(durability or generator_config.get('durability', 'none'))
+        self.writer: FileWriterPool = FileWriterPool(
+            writer_workers or generator_config.get('writer_workers', 1),
+            writer_backend or generator_config.get('writer_backend', 'thread'),
+            fsync=self.durability == 'per-file')
+        self.output_mode: str = output_mode or generator_config.get('output_mode', 'files')
+        if self.output_mode not in OUTPUT_MODES:
+            raise ValueError(f"Unknown output mode: {self.output_mode}")
+        self.codec: Codec = get_codec(compression or generator_config.get('compression', 'none'))
+        self.compression_level: Optional[int] = generator_config.get('compression_level')
+        self.cycle_store: CycleSequence = cycle_store or CycleSequence(
+            generator_config.get('cycle_store',
+                                 os.path.join(config['routes'][0]['results'], 'cycle_sequence.db')),
+            generator_config.get('cycle_block_size', 16),
+            legacy_path=os.path.join(os.path.dirname(__file__), 'cycle_number.txt'))
+        self.clock: ClockCache = ClockCache(config['date_format'], lambda: datetime.now())
+        self.log_per_file: bool = log_per_file(config)
+        self.fleet: Optional[DeviceFleet] = fleet
+        self._templates: Optional[ContentTemplates] = None
+        self._record_schema: Optional[RecordSchema] = None
+        self._file_suffixes: np.ndarray = np.empty(0, dtype=object)
 
     def generate_device_folder(self, base_path='./apolo_11/results') -> None:
         """Generate folder for storing device files
@@ -81,107 +178,350 @@ class Generator:
         mission_code: str = config['missions']['codes'].get(mission_name, 'UNKN')
         return f"APL{mission_code}-{file_number:04d}.log"
 
+    def generate_segment_name(self, start_number: int) -> str:
+        """Generate the name of the segment file holding records from start_number
+
+        Returns:
+            str: generated segment name
+        """
+        return f"APLSEG-{start_number:04d}{SEGMENT_SUFFIX}"
+
+    def generate_record_file_name(self, start_number: int) -> str:
+        """Generate the name of the binary record file holding records from start_number
+
+        Returns:
+            str: generated record file name
+        """
+        return f"APLREC-{start_number:04d}{RECORD_SUFFIX}"
+
     def generate_contentfile(self, file_number: int) -> GeneratedFile:
         """Generate content for a log file
         Returns:
             GeneratedFile: containing file name and file content
         """
+        batch = self.generate_batch(1, start_number=file_number)
+        filename, content = next(self.iter_batch_files(batch))
 
-        mission_name: str = random.choice(self.mission_instance.name)
-        device_type: str = random.choice(self.device_instance.type)
-        device_status: str = random.choice(self.device_instance.status)
-        date_format: str = config['date_format']
-        current_date: str = datetime.now().strftime(date_format)
+        return GeneratedFile(filename, content.decode())
 
-        if mission_name in config['missions']['codes']:
-            hash_value: int = self.generate_hash(current_date, mission_name, device_type, device_status)
-            content = DefaultContent(current_date, mission_name,
-                                     device_type, device_status,
-                                     hash_value).generate_content_string()
-        else:
-            hash_value = 'unknown'
-            device_status = 'unknown'
-            device_type = 'unknown'
-            unique_id = uuid.uuid4()
-            content = CustomContent(current_date, mission_name,
-                                    device_type, device_status,
-                                    hash_value, unique_id).generate_content_string()
+    def draw_devices(self, n: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Draw the mission, device type and device status indices of n records
 
-        filename = self.generate_filename(mission_name, file_number)
+        Records come from the fleet devices when the generator has a fleet,
+        otherwise each index is drawn independently from the generator random stream.
+
+        Args:
+            n (int): number of records
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: int16 index arrays of the records
+        """
+        if self.fleet is not None:
+            return self.fleet.sample(n)
+        mission_idx = self.rng.integers(0, len(self.mission_instance.name), size=n, dtype=np.int16)
+        type_idx = self.rng.integers(0, len(self.device_instance.type), size=n, dtype=np.int16)
+        status_idx = self.rng.integers(0, len(self.device_instance.status), size=n, dtype=np.int16)
+        return mission_idx, type_idx, status_idx
 
-        return GeneratedFile(filename, content)
+    def generate_batch(self, n: int, start_number: int = 1,
+                       devices: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None) -> RecordBatch:
+        """Generate the data of n records at once
+
+        Mission, device type and device status indices are drawn for the
+        whole batch as NumPy arrays, see draw_devices.
+
+        Args:
+            n (int): number of records to generate
+            start_number (int): file number of the first record
+            devices (Optional[Tuple]): index arrays already drawn by draw_devices
+
+        Returns:
+            RecordBatch: index arrays, hashes and unique ids of the records
+        """
+        mission_names: List[str] = self.mission_instance.name
+        device_types: List[str] = self.device_instance.type
+        device_statuses: List[str] = self.device_instance.status
+        mission_codes: Dict[str, str] = config['missions']['codes']
+        current_date: str = self.clock.now()
 
-    def generate_files(self, num_files_min: int, num_files_max: int):
+        mission_idx, type_idx, status_idx = devices if devices is not None else self.draw_devices(n)
+        type_idx = type_idx.copy()
+        status_idx = status_idx.copy()
+
+        known_missions = np.array([name in mission_codes for name in mission_names], dtype=bool)
+        unknown = ~known_missions[mission_idx]
+        type_idx[unknown] = UNKNOWN_INDEX
+        status_idx[unknown] = UNKNOWN_INDEX
+
+        hash_values = hash_batch(current_date, mission_names, device_types, device_statuses,
+                                 mission_idx, type_idx, status_idx)
+
+        unknown_positions = np.flatnonzero(unknown)
+        raw_ids: bytes = self.rng.bytes(16 * len(unknown_positions))
+        unique_ids: Dict[int, str] = {
+            int(position): str(uuid.UUID(bytes=raw_ids[i * 16:(i + 1) * 16], version=4))
+            for i, position in enumerate(unknown_positions)
+        }
+
+        file_numbers = np.arange(start_number, start_number + n)
+
+        return RecordBatch(current_date, file_numbers, mission_idx, type_idx,
+                           status_idx, hash_values, unique_ids)
+
+    def content_templates(self) -> ContentTemplates:
+        """Get the content templates of the current mission and device names
+
+        Returns:
+            ContentTemplates: templates, rebuilt only when the names change
+        """
+        mission_names: List[str] = self.mission_instance.name
+        device_types: List[str] = self.device_instance.type
+        device_statuses: List[str] = self.device_instance.status
+        if self._templates is None or not self._templates.matches(mission_names, device_types, device_statuses):
+            self._templates = ContentTemplates(mission_names, device_types, device_statuses)
+        return self._templates
+
+    def record_schema(self) -> RecordSchema:
+        """Get the binary record schema of the current mission and device names
+
+        Returns:
+            RecordSchema: schema, rebuilt only when the names change
+        """
+        mission_names: List[str] = self.mission_instance.name
+        device_types: List[str] = self.device_instance.type
+        device_statuses: List[str] = self.device_instance.status
+        if self._record_schema is None or \
+                not self._record_schema.matches(mission_names, device_types, device_statuses):
+            self._record_schema = RecordSchema(mission_names, device_types, device_statuses, config['date_format'],
+                                               generator_config.get('record_uuid_bytes', 16))
+        return self._record_schema
+
+    def iter_batch_files(self, batch: RecordBatch) -> Iterator[Tuple[str, bytes]]:
+        """Render the records of a batch as log files
+
+        Args:
+            batch (RecordBatch): batch returned by generate_batch
+
+        Yields:
+            Tuple[str, bytes]: file name and ready-to-write content of each record
+        """
+        templates = self.content_templates()
+        contents = templates.render_batch(batch.current_date, batch.mission_idx, batch.type_idx,
+                                          batch.status_idx, batch.hash_values, batch.unique_ids)
+        yield from zip(self.batch_filenames(batch), contents)
+
+    def batch_filenames(self, batch: RecordBatch) -> List[str]:
+        """Log file name of each record of a batch
+
+        Args:
+            batch (RecordBatch): batch returned by generate_batch
+
+        Returns:
+            List[str]: file name of each record, in batch order
+        """
+        mission_codes: Dict[str, str] = config['missions']['codes']
+        prefixes = np.array([f"APL{mission_codes.get(name, 'UNKN')}-"
+                             for name in self.content_templates().mission_names], dtype=object)
+
+        last_number = int(batch.file_numbers.max()) if len(batch) else 0
+        if last_number >= len(self._file_suffixes):
+            self._file_suffixes = np.array([f"{number:04d}.log" for number in range(last_number * 2 + 1)],
+                                           dtype=object)
+        return (prefixes[batch.mission_idx] + self._file_suffixes[batch.file_numbers]).tolist()
+
+    def generate_files(self, num_files_min: int, num_files_max: int) -> Optional[CycleSummary]:
         """Generate log files with random data
 
         Args:
             num_files_min (int): Minimum number of files to generate
             num_files_max (int): Maximum number of files to generate
+
+        Returns:
+            Optional[CycleSummary]: summary of the cycle, None if interrupted
         """
         try:
-            self.load_cycle_number()
+            cycle: int = self.cycle_store.next()
+            self.generate_files_call_count = cycle
             times_stamp: str = datetime.now().strftime('%Y%m%d%H%M%S')
-            output_directory: str = self.create_output_directory(times_stamp, self.generate_files_call_count)
+            output_directory: str = self.create_output_directory(times_stamp, cycle)
+            if self.fleet is not None:
+                self.fleet.advance(cycle)
+
+            random_number: int = int(self.rng.integers(num_files_min, num_files_max, endpoint=True))
+            batch = self.generate_batch(random_number)
 
-            random_number: int = random.randint(num_files_min, num_files_max)
+            records = self.write_batch(output_directory, batch)
+            status_counts = self.count_statuses(batch)
+            self.write_cycle_manifest(output_directory, cycle, self.written_files(batch), status_counts)
 
-            for file_number in range(1, random_number + 1):
-                generated_file = self.generate_contentfile(file_number)
-                file_path: str = os.path.join(output_directory, generated_file.filename)
+            output_directory = self.publish_output_directory(output_directory)
 
-                with open(file_path, 'w') as file:
-                    file.write(generated_file.content)
-                logger.info("Archivo de misión creado: %s", os.path.basename(file_path))
-                logger.info("Datos del archivo creado:\n%s", generated_file.content)
+            summary = CycleSummary(cycle, output_directory, len(batch), status_counts)
+            if self.log_per_file:
+                for filename, content in records:
+                    logger.info("Archivo de misión creado: %s", filename)
+                    if self.output_mode != 'binary':
+                        logger.info("Datos del archivo creado:\n%s", content.decode())
+            else:
+                logger.info("Ciclo %d: %d archivos generados en %s, estados: %s",
+                            cycle, summary.files_count, output_directory, summary.status_counts)
 
-            self.save_cycle_number()
+            return summary
 
         except KeyboardInterrupt:
             logger.info("Generación de archivos interrumpida por teclado.")
+            return None
+
+    def count_statuses(self, batch: RecordBatch) -> Dict[str, int]:
+        """Count the records of a batch by device status
+
+        Args:
+            batch (RecordBatch): batch returned by generate_batch
 
-    def load_cycle_number(self):
+        Returns:
+            Dict[str, int]: number of records of each status present in the batch
+        """
+        device_statuses: List[str] = self.device_instance.status
+        known = batch.known
+        counts = np.bincount(batch.status_idx[known], minlength=len(device_statuses))
+        status_counts: Dict[str, int] = {status: int(count) for status, count in zip(device_statuses, counts) if count}
+        unknown_count = len(batch) - int(known.sum())
+        if unknown_count:
+            status_counts['unknown'] = status_counts.get('unknown', 0) + unknown_count
+        return status_counts
+
+    def write_batch(self, output_directory: str, batch: RecordBatch) -> List[Tuple[str, bytes]]:
+        """Write the records of a batch according to the output mode
+
+        Args:
+            output_directory (str): directory of the cycle
+            batch (RecordBatch): batch returned by generate_batch
+
+        Returns:
+            List[Tuple[str, bytes]]: file name and content of each written record,
+            or of the record file in binary mode
         """
-        Load generate_files_call_count from a file or
-        set to 0 if not found
+        if self.output_mode == 'binary':
+            if not len(batch):
+                return []
+            record_name = self.generate_record_file_name(int(batch.file_numbers[0]))
+            content = encode_records(self.record_schema(), batch.current_date, batch.file_numbers,
+                                     batch.mission_idx, batch.type_idx, batch.status_idx,
+                                     batch.hash_values, batch.unique_ids)
+            self.writer.write_all([self.compressed_file(output_directory, record_name, content)])
+            return [(record_name, content)]
+
+        records = list(self.iter_batch_files(batch))
+
+        if self.output_mode == 'segment':
+            if records:
+                segment_name = self.generate_segment_name(int(batch.file_numbers[0]))
+                if self.codec.suffix:
+                    self.writer.write_all([self.compressed_file(output_directory, segment_name,
+                                                                encode_segment(records))])
+                else:
+                    segment_path = os.path.join(output_directory, segment_name)
+                    write_segment(segment_path, records)
+                    if self.durability == 'per-file':
+                        fsync_path(segment_path)
+        else:
+            self.writer.write_all([self.compressed_file(output_directory, filename, content)
+                                   for filename, content in records])
+
+        return records
+
+    def written_files(self, batch: RecordBatch) -> List[Tuple[str, int]]:
+        """Name and record count of each file write_batch writes for a batch
+
+        Args:
+            batch (RecordBatch): batch returned by generate_batch
+
+        Returns:
+            List[Tuple[str, int]]: file name with the codec suffix and its number of records
         """
+        if not len(batch):
+            return []
+        suffix = self.codec.suffix
+        if self.output_mode == 'binary':
+            return [(self.generate_record_file_name(int(batch.file_numbers[0])) + suffix, len(batch))]
+        if self.output_mode == 'segment':
+            return [(self.generate_segment_name(int(batch.file_numbers[0])) + suffix, len(batch))]
+        return [(filename + suffix, 1) for filename in self.batch_filenames(batch)]
+
+    def write_cycle_manifest(self, output_directory: str, cycle: int, files: List[Tuple[str, int]],
+                             status_counts: Dict[str, int]) -> str:
+        """Write the manifest of a cycle into its staging directory, before it is published
 
-        try:
-            with open(os.path.join(os.path.dirname(__file__), 'cycle_number.txt'), 'r') as file:
-                self.generate_files_call_count = int(file.read().strip())
-        except FileNotFoundError:
-            self.generate_files_call_count = 0
-            self.save_cycle_number()
+        Args:
+            output_directory (str): staging directory of the cycle
+            cycle (int): cycle number
+            files (List[Tuple[str, int]]): name and record count of each written file
+            status_counts (Dict[str, int]): number of records by device status
 
-    def save_cycle_number(self):
+        Returns:
+            str: path of the manifest
         """
-        Increment and save the generate_files_call_count to a file
+        manifest = build_manifest(output_directory, cycle, files, status_counts)
+        return write_manifest(output_directory, manifest, fsync=self.durability == 'per-file')
+
+    def compressed_file(self, output_directory: str, filename: str, content: bytes) -> Tuple[str, bytes]:
+        """Path and content of a file compressed with the generator codec
+
+        Returns:
+            Tuple[str, bytes]: path with the codec suffix and compressed content
         """
-        self.generate_files_call_count += 1
+        return (os.path.join(output_directory, filename + self.codec.suffix),
+                self.codec.compress(content, self.compression_level))
 
-        with open(os.path.join(os.path.dirname(__file__), 'cycle_number.txt'), 'w') as file:
-            file.write(str(self.generate_files_call_count))
+    def close(self) -> None:
+        """Release the writer pool and the cycle store"""
+        self.writer.close()
+        self.cycle_store.close()
 
     def create_output_directory(self, times_stamp: str, generate_files_call_count: int) -> str:
-        """Create the output directory path based on timestamp and call count
+        """Create the hidden staging directory a cycle is written to
+
+        The cycle only becomes visible to the reporter once
+        publish_output_directory renames it to its -noreport name.
 
         Args:
             times_stamp (str): timestamp for the output directory
             generate_files_call_count (int): call count for the output directory
 
         Returns:
-            str: output directory path
+            str: staging directory path
         """
+        return create_staging_directory(self.devices_directory(), f"cycle-{generate_files_call_count}-{times_stamp}")
+
+    def devices_directory(self) -> str:
+        """Directory the cycles are staged and published in"""
         current_directory: str = os.path.dirname(os.path.abspath(__file__))
-        output_directory: str = os.path.join(
-            current_directory,
-            f"./../results/devices/cycle-{generate_files_call_count}-{times_stamp}-noreport")
+        return os.path.join(current_directory, "./../results/devices")
+
+    def discard_interrupted_cycles(self) -> List[str]:
+        """Remove the staging directories left by a run interrupted before publishing its cycle
+
+        Called when the generator starts, before its first cycle, since the
+        reporter never sees a staging directory and nothing else removes it.
+
+        Returns:
+            List[str]: paths of the removed staging directories
+        """
+        return sweep_staging_directories(self.devices_directory())
+
+    def publish_output_directory(self, staging_directory: str) -> str:
+        """Atomically publish a written cycle under its -noreport name
+
+        Args:
+            staging_directory (str): directory returned by create_output_directory
 
-        os.makedirs(output_directory, exist_ok=True)
-        return output_directory
+        Returns:
+            str: published directory path
+        """
+        return publish_directory(staging_directory, self.durability)
 
     def generate_hash(self, *args: Union[str, int]) -> int:
         """
-        Generate hash number
+        Generate a stable hash number, reproducible across processes
         """
-        data: str = ''.join(map(str, args))
-        return hash(data)
+        return stable_hash(*args)
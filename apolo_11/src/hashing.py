@@ -0,0 +1,59 @@
+"""
+Stable content hashing for Apollo 11 records.
+
+The hash of a record is a blake2b digest truncated to 64 bits of its
+date, mission, device type and device status. Unlike the built-in
+hash() it does not depend on PYTHONHASHSEED, so it can be verified by
+any process later on.
+"""
+
+from hashlib import blake2b
+from typing import List, Union
+
+import numpy as np
+
+DIGEST_SIZE: int = 8
+
+
+def stable_hash(*args: Union[str, int]) -> int:
+    """
+    Hash the concatenation of the given fields
+
+    Returns:
+        int: unsigned 64-bit digest
+    """
+    data: str = ''.join(map(str, args))
+    return int.from_bytes(blake2b(data.encode(), digest_size=DIGEST_SIZE).digest(), 'big')
+
+
+def hash_batch(current_date: str, mission_names: List[str], device_types: List[str],
+               device_statuses: List[str], mission_idx: np.ndarray, type_idx: np.ndarray,
+               status_idx: np.ndarray) -> np.ndarray:
+    """
+    Hash a batch of records sharing the same date
+
+    Only the distinct (mission, device type, device status) combinations
+    of the batch are hashed, then the digests are broadcast to every
+    record. Records with a negative type or status index get 0.
+
+    Returns:
+        np.ndarray: uint64 digest of each record
+    """
+    hashes = np.zeros(len(mission_idx), dtype=np.uint64)
+    known = (type_idx >= 0) & (status_idx >= 0)
+    if not known.any():
+        return hashes
+
+    mission_types = mission_idx[known].astype(np.int64) * len(device_types) + type_idx[known]
+    combos = mission_types * len(device_statuses) + status_idx[known]
+    unique_combos, inverse = np.unique(combos, return_inverse=True)
+
+    digests = np.empty(len(unique_combos), dtype=np.uint64)
+    for position, combo in enumerate(unique_combos.tolist()):
+        mission_type, status = divmod(combo, len(device_statuses))
+        mission, device_type = divmod(mission_type, len(device_types))
+        digests[position] = stable_hash(current_date, mission_names[mission],
+                                        device_types[device_type], device_statuses[status])
+
+    hashes[known] = digests[inverse]
+    return hashes
@@ -4,12 +4,141 @@ Centralized logging configuration module for Apollo 11 system.
 This module provides a unified logging setup that reads configuration
 from the YAML config file and ensures consistent logging format across
 all modules.
+
+With ``async: true`` records are handed to a queue and formatted and
+written by a background listener thread, so logging never blocks the
+generator or the reporter on the output stream. Per-logger sampling and
+rate limits drop INFO and DEBUG records before they reach the queue.
 """
 
+import atexit
 import logging
-from typing import Optional
+import logging.handlers
+import queue
+import time
+from typing import Callable, Dict, Optional
 from .config import ConfigManager
 
+DEFAULT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep one out of every `every` records below WARNING
+
+    Attributes:
+        every (int): sampling period
+    """
+    def __init__(self, every: int) -> None:
+        super().__init__()
+        if every < 1:
+            raise ValueError(f"Sampling period must be at least 1: {every}")
+        self.every: int = every
+        self._seen: int = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        keep = self._seen % self.every == 0
+        self._seen += 1
+        return keep
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Let at most `rate` records below WARNING through per second
+
+    Attributes:
+        rate (float): records per second
+        dropped (int): records dropped since start
+    """
+    def __init__(self, rate: float, clock: Callable[[], float] = time.monotonic) -> None:
+        super().__init__()
+        if rate <= 0:
+            raise ValueError(f"Rate limit must be positive: {rate}")
+        self.rate: float = rate
+        self.dropped: int = 0
+        self._clock = clock
+        self._tokens: float = rate
+        self._last: float = clock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        now = self._clock()
+        self._tokens = min(self.rate, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        self.dropped += 1
+        return False
+
+
+def _configure_loggers(loggers_config: Dict[str, dict]) -> None:
+    """Install the sampling and rate limit filters of each configured logger"""
+    for name, options in loggers_config.items():
+        target = logging.getLogger(name)
+        for existing in [f for f in target.filters if isinstance(f, (SamplingFilter, RateLimitFilter))]:
+            target.removeFilter(existing)
+        options = options or {}
+        if options.get('sample'):
+            target.addFilter(SamplingFilter(int(options['sample'])))
+        if options.get('rate_limit'):
+            target.addFilter(RateLimitFilter(float(options['rate_limit'])))
+
+
+def _start_queue_listener(log_level: int, log_format: str, queue_size: int) -> None:
+    """Route the root logger through a queue drained by a background listener"""
+    global _listener
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(log_format))
+    log_queue: queue.Queue = queue.Queue(queue_size)
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(log_level)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Stop the background listener after writing every queued record"""
+    global _listener
+    if _listener is not None:
+        root = logging.getLogger()
+        for handler in [h for h in root.handlers if isinstance(h, logging.handlers.QueueHandler)]:
+            root.removeHandler(handler)
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def init_worker_logging() -> None:
+    """
+    Write the records of a forked worker process directly to the output stream
+
+    The queue listener thread does not survive a fork, so records queued
+    in a worker would never be written. Meant as a process pool initializer.
+    """
+    if _listener is None:
+        return
+    root = logging.getLogger()
+    for handler in [h for h in root.handlers if isinstance(h, logging.handlers.QueueHandler)]:
+        root.removeHandler(handler)
+    for handler in _listener.handlers:
+        root.addHandler(handler)
+
+
+atexit.register(shutdown_logging)
+
 
 def setup_logging(config_path: Optional[str] = None) -> logging.Logger:
     """
@@ -34,15 +163,21 @@ def setup_logging(config_path: Optional[str] = None) -> logging.Logger:
         # Get logging configuration with defaults
         logging_config = config.get('logging', {})
         log_level = logging_config.get('level', 'INFO')
-        log_format = logging_config.get('format', 
-                                       '%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        log_format = logging_config.get('format', DEFAULT_FORMAT)
 
-        # Configure root logger
-        logging.basicConfig(
-            level=getattr(logging, log_level.upper()),
-            format=log_format,
-            force=True  # Override any existing configuration
-        )
+        shutdown_logging()
+        if logging_config.get('async', False):
+            _start_queue_listener(getattr(logging, log_level.upper()), log_format,
+                                  logging_config.get('queue_size', 0))
+        else:
+            # Configure root logger
+            logging.basicConfig(
+                level=getattr(logging, log_level.upper()),
+                format=log_format,
+                force=True  # Override any existing configuration
+            )
+
+        _configure_loggers(logging_config.get('loggers') or {})
 
         # Create and return Apollo 11 specific logger
         logger = logging.getLogger('apolo_11')
@@ -52,9 +187,10 @@ def setup_logging(config_path: Optional[str] = None) -> logging.Logger:
 
     except Exception as e:
         # Fallback to basic logging if config fails
+        shutdown_logging()
         logging.basicConfig(
             level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            format=DEFAULT_FORMAT
         )
         logger = logging.getLogger('apolo_11')
         logger.warning("Failed to load logging config, using defaults: %s", str(e))
@@ -75,3 +211,18 @@ def get_logger(name: str) -> logging.Logger:
         logging.Logger: Logger instance with the specified name.
     """
     return logging.getLogger(f'apolo_11.{name}')
+
+
+def log_per_file(config: dict) -> bool:
+    """
+    Whether the generator and the reporter log one line per file.
+
+    With the default ``detail: cycle`` they log one summary per cycle instead.
+
+    Args:
+        config: loaded configuration.
+
+    Returns:
+        bool: True if the logging detail is ``file``.
+    """
+    return config.get('logging', {}).get('detail', 'cycle') == 'file'
@@ -0,0 +1,142 @@
+"""
+Per-cycle manifests for the Apollo 11 generator and reporter.
+
+The generator finishes every cycle by writing a compact manifest.json
+next to its files, listing the name, size and record count of each
+file and the status totals of the cycle. The reporter then finds the
+files of a cycle without listing its directory, reads each file with a
+single read of the expected size and checks the records it counted
+against the manifest. Cycles without a manifest are still discovered by
+walking their directory.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .logging_config import get_logger
+from .publish import fsync_path
+
+logger = get_logger(__name__)
+
+MANIFEST_NAME: str = 'manifest.json'
+MANIFEST_VERSION: int = 1
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    """File listed in a manifest
+
+    Attributes:
+        name (str): file name, relative to the cycle directory
+        size (int): size of the file in bytes, as written
+        records (int): number of records in the file
+    """
+    name: str
+    size: int
+    records: int
+
+
+@dataclass
+class Manifest:
+    """Contents of a cycle
+
+    Attributes:
+        cycle (int): cycle number
+        files (List[ManifestEntry]): every file of the cycle
+        status_counts (Dict[str, int]): number of records by device status
+    """
+    cycle: int
+    files: List[ManifestEntry] = field(default_factory=list)
+    status_counts: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def records(self) -> int:
+        """Number of records of the cycle"""
+        return sum(entry.records for entry in self.files)
+
+    def to_json(self) -> bytes:
+        """Encode the manifest as compact JSON, files as [name, size, records] rows"""
+        return json.dumps({
+            'version': MANIFEST_VERSION,
+            'cycle': self.cycle,
+            'files': [[entry.name, entry.size, entry.records] for entry in self.files],
+            'status_counts': self.status_counts,
+        }, separators=(',', ':')).encode()
+
+    @classmethod
+    def from_json(cls, data: bytes) -> 'Manifest':
+        """
+        Decode a manifest
+
+        Raises:
+            ValueError: if the data is not a valid manifest
+        """
+        try:
+            fields = json.loads(data)
+            if fields['version'] != MANIFEST_VERSION:
+                raise ValueError(f"Unsupported manifest version: {fields['version']}")
+            return cls(fields['cycle'], [ManifestEntry(name, size, records) for name, size, records in fields['files']],
+                       fields['status_counts'])
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid manifest: {e}") from e
+
+
+def build_manifest(directory: str, cycle: int, files: Sequence[Tuple[str, int]],
+                   status_counts: Dict[str, int]) -> Manifest:
+    """
+    Build the manifest of written files, taking their sizes from disk
+
+    Args:
+        directory (str): directory of the cycle
+        cycle (int): cycle number
+        files (Sequence[Tuple[str, int]]): name and record count of each written file
+        status_counts (Dict[str, int]): number of records by device status
+
+    Returns:
+        Manifest: manifest of the cycle
+    """
+    entries = [ManifestEntry(name, os.stat(os.path.join(directory, name)).st_size, records)
+               for name, records in files]
+    return Manifest(cycle, entries, dict(status_counts))
+
+
+def write_manifest(directory: str, manifest: Manifest, fsync: bool = False) -> str:
+    """
+    Write the manifest of a cycle into its directory
+
+    Args:
+        directory (str): directory of the cycle
+        manifest (Manifest): manifest to write
+        fsync (bool): flush the manifest to disk before returning
+
+    Returns:
+        str: path of the manifest
+    """
+    path = os.path.join(directory, MANIFEST_NAME)
+    with open(path, 'wb') as file:
+        file.write(manifest.to_json())
+    if fsync:
+        fsync_path(path)
+    return path
+
+
+def read_manifest(directory: str) -> Optional[Manifest]:
+    """
+    Read the manifest of a cycle
+
+    Args:
+        directory (str): directory of the cycle
+
+    Returns:
+        Optional[Manifest]: the manifest, None if the cycle has no valid manifest
+    """
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME), 'rb') as file:
+            return Manifest.from_json(file.read())
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        logger.warning("Manifiesto inválido en %s, se recorre el directorio: %s", directory, str(e))
+        return None
@@ -0,0 +1,251 @@
+"""
+Rate-controlled load profiles for the Apollo 11 generator.
+
+A load profile gives the target files-per-second rate over time. The
+Pacer turns that rate into a number of files per generation cycle with
+a token bucket, and keeps cycles on an absolute schedule so sleeping
+does not accumulate drift. Phases that do not generate, such as a
+synchronous reporter run, pause the pacer so they neither mint tokens
+nor count as missed deadlines.
+"""
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Type
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+Clock = Callable[[], float]
+
+
+@dataclass
+class ConstantProfile:
+    """Constant target rate"""
+    rate: float
+
+    def rate_at(self, elapsed: float) -> float:
+        return self.rate
+
+
+@dataclass
+class RampProfile:
+    """Linear ramp from start_rate to end_rate over duration seconds, then hold"""
+    start_rate: float
+    end_rate: float
+    duration: float
+
+    def rate_at(self, elapsed: float) -> float:
+        progress = min(max(elapsed / self.duration, 0.0), 1.0) if self.duration > 0 else 1.0
+        return self.start_rate + (self.end_rate - self.start_rate) * progress
+
+
+@dataclass
+class SpikeProfile:
+    """Base rate with a spike_rate burst between spike_start and spike_start + spike_duration"""
+    rate: float
+    spike_rate: float
+    spike_start: float
+    spike_duration: float
+
+    def rate_at(self, elapsed: float) -> float:
+        if self.spike_start <= elapsed < self.spike_start + self.spike_duration:
+            return self.spike_rate
+        return self.rate
+
+
+@dataclass
+class DiurnalProfile:
+    """Sinusoidal rate around rate with the given amplitude and period, never below zero"""
+    rate: float
+    amplitude: float
+    period: float = 86400.0
+
+    def rate_at(self, elapsed: float) -> float:
+        return max(0.0, self.rate + self.amplitude * math.sin(2 * math.pi * elapsed / self.period))
+
+
+PROFILE_TYPES: Dict[str, Type] = {
+    'constant': ConstantProfile,
+    'ramp': RampProfile,
+    'spike': SpikeProfile,
+    'diurnal': DiurnalProfile,
+}
+
+
+def load_profile(name: str, profiles_config: Dict[str, dict]):
+    """
+    Build a load profile from its YAML definition
+
+    Args:
+        name (str): name of the profile in the profiles section
+        profiles_config (Dict[str, dict]): profiles section of the configuration
+
+    Returns:
+        The load profile
+
+    Raises:
+        KeyError: if the profile is not defined
+        ValueError: if the profile type is unknown
+    """
+    params = dict(profiles_config[name])
+    profile_type = params.pop('type', 'constant')
+    if profile_type not in PROFILE_TYPES:
+        raise ValueError(f"Unknown load profile type: {profile_type}")
+    return PROFILE_TYPES[profile_type](**params)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at the rate of a load profile
+
+    Attributes:
+        profile: load profile giving the refill rate
+        burst (float): seconds of target rate the bucket can hold
+        tokens (float): tokens currently available
+        minted (float): tokens minted since start, the target file count
+    """
+    def __init__(self, profile, burst: float = 2.0, clock: Clock = time.monotonic) -> None:
+        self.profile = profile
+        self.burst: float = burst
+        self.tokens: float = 0.0
+        self.minted: float = 0.0
+        self._clock: Clock = clock
+        self._start: float = clock()
+        self._last: float = self._start
+
+    @property
+    def elapsed(self) -> float:
+        return self._last - self._start
+
+    def refill(self) -> None:
+        """Add the tokens minted since the last refill, capped at the burst size"""
+        now = self._clock()
+        previous = self._last - self._start
+        current = now - self._start
+        minted = (self.profile.rate_at(previous) + self.profile.rate_at(current)) / 2 * (current - previous)
+        self._last = now
+        self.minted += minted
+        capacity = max(1.0, self.profile.rate_at(current) * self.burst)
+        self.tokens = min(self.tokens + minted, capacity)
+
+    def pause(self) -> None:
+        """Mint the tokens up to now and stop minting until resume"""
+        self.refill()
+
+    def resume(self) -> None:
+        """Start minting again, leaving the time paused out of the profile"""
+        paused = self._clock() - self._last
+        self._start += paused
+        self._last += paused
+
+    def take(self) -> int:
+        """
+        Take every whole token available
+
+        Returns:
+            int: number of tokens taken
+        """
+        self.refill()
+        tokens = int(self.tokens)
+        self.tokens -= tokens
+        return tokens
+
+
+@dataclass
+class PacingStats:
+    """Achieved rate against the target rate"""
+    elapsed: float
+    files: int
+    target_rate: float
+    achieved_rate: float
+    current_target_rate: float
+
+
+class Pacer:
+    """
+    Pace generation cycles to follow a load profile
+
+    Attributes:
+        bucket (TokenBucket): token bucket minting one token per file
+        interval (float): seconds between the start of two cycles
+        files (int): files generated since start
+        missed_cycles (int): cycles that started late because the previous one overran
+    """
+    def __init__(self, profile, interval: float, burst: Optional[float] = None,
+                 clock: Clock = time.monotonic) -> None:
+        self.interval: float = interval
+        self.bucket = TokenBucket(profile, burst if burst is not None else 2 * interval, clock)
+        self.files: int = 0
+        self.missed_cycles: int = 0
+        self._clock: Clock = clock
+        self._deadline: float = clock() + interval
+        self._paused_at: Optional[float] = None
+
+    def files_for_cycle(self) -> int:
+        """
+        Number of files the next cycle must generate to stay on target
+
+        Returns:
+            int: files to generate
+        """
+        return self.bucket.take()
+
+    def record(self, files: int) -> PacingStats:
+        """
+        Record the files generated by a cycle and log the achieved rate
+
+        Args:
+            files (int): files generated by the cycle
+
+        Returns:
+            PacingStats: achieved rate against the target rate
+        """
+        self.files += files
+        stats = self.stats()
+        logger.info("Ritmo de generación: objetivo %.2f archivos/s, logrado %.2f archivos/s",
+                    stats.target_rate, stats.achieved_rate)
+        return stats
+
+    def stats(self) -> PacingStats:
+        """Achieved rate against the target rate since start"""
+        self.bucket.refill()
+        elapsed = self.bucket.elapsed
+        target_rate = self.bucket.minted / elapsed if elapsed > 0 else 0.0
+        achieved_rate = self.files / elapsed if elapsed > 0 else 0.0
+        return PacingStats(elapsed, self.files, target_rate, achieved_rate,
+                           self.bucket.profile.rate_at(elapsed))
+
+    def delay(self) -> float:
+        """
+        Advance to the next cycle deadline, skipping deadlines already missed
+
+        Returns:
+            float: seconds to sleep before the next cycle
+        """
+        now = self._clock()
+        if now < self._deadline:
+            seconds = self._deadline - now
+            self._deadline += self.interval
+            return seconds
+
+        missed = int((now - self._deadline) // self.interval) + 1
+        self.missed_cycles += missed
+        self._deadline += missed * self.interval
+        logger.warning("Generación saturada: %d ciclo(s) retrasado(s) respecto al objetivo", missed)
+        return 0.0
+
+    def pause(self) -> None:
+        """Stop the pacing clock while generation is suspended"""
+        if self._paused_at is None:
+            self.bucket.pause()
+            self._paused_at = self._clock()
+
+    def resume(self) -> None:
+        """Restart the pacing clock, moving the next deadline by the time paused"""
+        if self._paused_at is not None:
+            self._deadline += self._clock() - self._paused_at
+            self.bucket.resume()
+            self._paused_at = None
@@ -0,0 +1,132 @@
+"""
+asyncio pipeline runner for the Apollo 11 system.
+
+Generation, reporting and the dashboard run as cooperating tasks.
+Blocking file I/O runs on one single-thread executor per stage, so
+reporting the cycles already finished overlaps with generating the
+next one. On stop, generation finishes its current cycle, the reporter
+drains every finished cycle and only then the pipeline returns.
+"""
+
+import asyncio
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from .generator import CycleSummary
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class AsyncPipeline:
+    """
+    Run generator, reporter and dashboard as asyncio tasks
+
+    Attributes:
+        reporter_instance (Reporter): reporter processing finished cycles
+        backup_directory (str): directory reported cycles are moved to
+        reporter_interval (float): seconds between two reports
+        files_generated (int): files generated since start
+        cycles_reported (int): cycles reported since start
+    """
+    def __init__(self, generate_cycle: Callable[[], Optional[CycleSummary]], next_delay: Callable[[], float],
+                 reporter_instance, backup_directory: str, reporter_interval: float,
+                 update_dashboard: Optional[Callable[[], None]] = None) -> None:
+        """
+        Args:
+            generate_cycle: runs one blocking generation cycle
+            next_delay: seconds to wait before the next generation cycle
+            reporter_instance: reporter processing finished cycles
+            backup_directory: directory reported cycles are moved to
+            reporter_interval: seconds between two reports
+            update_dashboard: refreshes the dashboard, called once per second
+        """
+        self.reporter_instance = reporter_instance
+        self.backup_directory: str = backup_directory
+        self.reporter_interval: float = reporter_interval
+        self.files_generated: int = 0
+        self.cycles_reported: int = 0
+        self._generate_cycle = generate_cycle
+        self._next_delay = next_delay
+        self._update_dashboard = update_dashboard
+        self._finished: List[CycleSummary] = []
+        self._stop: Optional[asyncio.Event] = None
+        self._generator_executor = ThreadPoolExecutor(1, thread_name_prefix='apolo11-generator')
+        self._reporter_executor = ThreadPoolExecutor(1, thread_name_prefix='apolo11-reporter')
+
+    def stop(self) -> None:
+        """Ask every task to finish its current work and return"""
+        if self._stop is not None:
+            self._stop.set()
+
+    async def _sleep(self, seconds: float) -> None:
+        """Sleep unless the pipeline is stopped first"""
+        try:
+            await asyncio.wait_for(self._stop.wait(), timeout=max(seconds, 0))
+        except asyncio.TimeoutError:
+            pass
+
+    async def _generator_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while not self._stop.is_set():
+            summary = await loop.run_in_executor(self._generator_executor, self._generate_cycle)
+            if summary:
+                self.files_generated += summary.files_count
+                self._finished.append(summary)
+            await self._sleep(self._next_delay())
+
+    async def _report_finished(self) -> None:
+        """Report every cycle finished so far"""
+        cycles, self._finished = self._finished, []
+        if not cycles:
+            return
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._reporter_executor, self.reporter_instance.process_cycles,
+                                   [cycle.directory for cycle in cycles], self.backup_directory)
+        self.cycles_reported += len(cycles)
+
+    async def _reporter_loop(self) -> None:
+        while not self._stop.is_set():
+            await self._sleep(self.reporter_interval)
+            if not self._stop.is_set():
+                await self._report_finished()
+
+    async def _dashboard_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while not self._stop.is_set():
+            # The reporter executor serializes dashboard reads with report updates
+            await loop.run_in_executor(self._reporter_executor, self._update_dashboard)
+            await self._sleep(1)
+
+    def _install_signal_handler(self, loop: asyncio.AbstractEventLoop) -> bool:
+        try:
+            loop.add_signal_handler(signal.SIGINT, self.stop)
+            return True
+        except (NotImplementedError, RuntimeError):
+            return False
+
+    async def run(self) -> None:
+        """Run the pipeline until stop() is called or SIGINT is received"""
+        loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        handles_signal = self._install_signal_handler(loop)
+
+        tasks = [asyncio.create_task(self._generator_loop()), asyncio.create_task(self._reporter_loop())]
+        if self._update_dashboard:
+            tasks.append(asyncio.create_task(self._dashboard_loop()))
+
+        try:
+            await asyncio.wait(tasks + [asyncio.create_task(self._stop.wait())],
+                               return_when=asyncio.FIRST_COMPLETED)
+            self.stop()
+            await asyncio.gather(*tasks)
+            logger.info("Deteniendo pipeline: reportando ciclos pendientes.")
+            await self._report_finished()
+            if self._update_dashboard:
+                await loop.run_in_executor(self._reporter_executor, self._update_dashboard)
+        finally:
+            if handles_signal:
+                loop.remove_signal_handler(signal.SIGINT)
+            self._generator_executor.shutdown(wait=True)
+            self._reporter_executor.shutdown(wait=True)
@@ -0,0 +1,141 @@
+"""
+Atomic cycle publication for the Apollo 11 generator.
+
+A cycle is written into a hidden staging directory next to the
+published cycles and made visible with a single rename to its
+-noreport name, so the reporter never sees a half-written cycle. The
+durability policy decides what is flushed to disk before and after the
+rename:
+
+- none: nothing, the page cache decides
+- per-cycle: every file of the cycle once the whole cycle is written
+- per-file: every file right after it is written
+"""
+
+import os
+import re
+import shutil
+from typing import List, Optional, Tuple
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DURABILITY_POLICIES: Tuple[str, ...] = ('none', 'per-cycle', 'per-file')
+STAGING_PREFIX: str = '.'
+PUBLISHED_SUFFIX: str = '-noreport'
+
+CYCLE_NAME = re.compile(r'cycle-(\d+)-')
+
+
+def check_durability(durability: str) -> str:
+    """
+    Validate a durability policy
+
+    Raises:
+        ValueError: if the policy is unknown
+    """
+    if durability not in DURABILITY_POLICIES:
+        raise ValueError(f"Unknown durability policy: {durability}")
+    return durability
+
+
+def fsync_path(path: str) -> None:
+    """Flush a file or a directory entry list to disk"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def is_staging(name: str) -> bool:
+    """Whether a directory name is a hidden staging directory"""
+    return name.startswith(STAGING_PREFIX)
+
+
+def cycle_number(name: str) -> Optional[int]:
+    """Number of a published or backed up cycle directory, None if the name is not a cycle"""
+    match = CYCLE_NAME.match(name)
+    return int(match.group(1)) if match else None
+
+
+def cycle_name(name: str) -> str:
+    """Name of a cycle directory without its staging prefix and -noreport suffix, as it is backed up"""
+    if is_staging(name):
+        name = name[len(STAGING_PREFIX):]
+    return name[:-len(PUBLISHED_SUFFIX)] if name.endswith(PUBLISHED_SUFFIX) else name
+
+
+def create_staging_directory(parent_directory: str, name: str) -> str:
+    """
+    Create the hidden staging directory of a cycle
+
+    Args:
+        parent_directory (str): directory holding the published cycles
+        name (str): name of the cycle without the -noreport suffix
+
+    Returns:
+        str: path of the staging directory
+    """
+    staging_directory = os.path.join(parent_directory, STAGING_PREFIX + name)
+    os.makedirs(staging_directory)
+    return staging_directory
+
+
+def sweep_staging_directories(parent_directory: str) -> List[str]:
+    """
+    Remove the staging directories of cycles interrupted before they were published
+
+    Only safe before a generator writes its first cycle. Hidden -noreport
+    directories are published cycles whose backup copy is in progress
+    and are kept.
+
+    Args:
+        parent_directory (str): directory holding the published cycles
+
+    Returns:
+        List[str]: paths of the removed staging directories
+    """
+    removed: List[str] = []
+    if not os.path.isdir(parent_directory):
+        return removed
+    with os.scandir(parent_directory) as entries:
+        for entry in entries:
+            unpublished = is_staging(entry.name) and not entry.name.endswith(PUBLISHED_SUFFIX)
+            if unpublished and cycle_number(cycle_name(entry.name)) is not None and entry.is_dir():
+                shutil.rmtree(entry.path)
+                logger.warning("Ciclo %s interrumpido antes de publicarse, se elimina.", entry.path)
+                removed.append(entry.path)
+    return sorted(removed)
+
+
+def publish_directory(staging_directory: str, durability: str = 'none') -> str:
+    """
+    Publish a staging directory with one atomic rename to its -noreport name
+
+    Args:
+        staging_directory (str): directory holding every file of the cycle
+        durability (str): durability policy, see DURABILITY_POLICIES
+
+    Returns:
+        str: path of the published directory
+    """
+    check_durability(durability)
+    parent_directory, name = os.path.split(os.path.normpath(staging_directory))
+    published_name = (name[len(STAGING_PREFIX):] if is_staging(name) else name) + PUBLISHED_SUFFIX
+    published_directory = os.path.join(parent_directory, published_name)
+
+    if durability == 'per-cycle':
+        with os.scandir(staging_directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    fsync_path(entry.path)
+    if durability != 'none':
+        fsync_path(staging_directory)
+
+    os.rename(staging_directory, published_directory)
+
+    if durability != 'none':
+        fsync_path(parent_directory)
+    return published_directory
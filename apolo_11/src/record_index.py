@@ -0,0 +1,330 @@
+"""
+SQLite record index for the Apollo 11 reporter.
+
+When enabled, the reporter inserts every record it processes into a
+local SQLite database: the record date as seconds since the epoch and
+the mission, device type and device status as integer codes of a small
+names table. Rows are buffered and inserted in large transactions in
+WAL mode, together with the names of the files they come from, so a
+file is indexed once even when its cycle is processed again from the
+backups. A single index on (mission, device type, status, date)
+answers a question such as how many faulty Rovers VacMars had last week
+without reading any report or backup file. Queries that leave a leading
+column out match it against its few codes, so they still seek in the
+index and no second index slows the inserts down.
+
+Run from the repository root:
+    python -m apolo_11.src.record_index query --mission VacMars --device_type Rover --status faulty --days 7
+    python -m apolo_11.src.record_index index ./apolo_11/results/backups
+"""
+
+import argparse
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .config import ConfigManager
+from .logging_config import get_logger
+from .publish import cycle_name, cycle_number
+from .records import RecordSchema
+
+logger = get_logger(__name__)
+
+FIELDS: Tuple[str, ...] = ('mission', 'device_type', 'device_status')
+
+SCHEMA: Tuple[str, ...] = (
+    "CREATE TABLE IF NOT EXISTS names (id INTEGER PRIMARY KEY, field TEXT NOT NULL, name TEXT NOT NULL, "
+    "UNIQUE (field, name))",
+    "CREATE TABLE IF NOT EXISTS records (date INTEGER, mission INTEGER NOT NULL, device_type INTEGER NOT NULL, "
+    "device_status INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS files (key TEXT PRIMARY KEY) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS records_by_device ON records (mission, device_type, device_status, date)",
+)
+
+Moment = Union[datetime, float, None]
+
+
+def file_key(file_path: str) -> str:
+    """Name of a file that survives the move of its cycle to the backups"""
+    cycle_directory, name = os.path.split(os.path.abspath(file_path))
+    directory_name = cycle_name(os.path.basename(cycle_directory))
+    if cycle_number(directory_name) is None:
+        return os.path.abspath(file_path)
+    # Cycle numbers restart with a new cycle sequence, the timestamp in the name keeps cycles apart
+    return f"{directory_name}/{name}"
+
+
+def _seconds(moment: Moment) -> int:
+    return int(moment.timestamp()) if isinstance(moment, datetime) else int(moment)
+
+
+class RecordIndex:
+    """
+    Index of processed records in a SQLite database
+
+    Attributes:
+        path (str): path of the SQLite file
+        date_format (str): strftime format of the record dates
+        batch_size (int): records buffered before a transaction is committed
+        records_indexed (int): records committed by this instance
+        files_skipped (int): files not indexed because they already were
+    """
+    def __init__(self, path: str, date_format: str, batch_size: int = 100_000, timeout: float = 60.0) -> None:
+        if batch_size < 1:
+            raise ValueError(f"Batch size must be at least 1: {batch_size}")
+        self.path: str = path
+        self.date_format: str = date_format
+        self.batch_size: int = batch_size
+        self.records_indexed: int = 0
+        self.files_skipped: int = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection: Optional[sqlite3.Connection] = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        # WAL keeps committed transactions safe from application crashes without an fsync per commit
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        # Index pages touched by a batch stay cached between transactions
+        self._connection.execute("PRAGMA cache_size=-65536")
+        for statement in SCHEMA:
+            self._connection.execute(statement)
+        self._ids: Dict[Tuple[str, str], int] = {}
+        self._dates: Dict[bytes, Optional[int]] = {}
+        self._rows: List[Tuple[Optional[int], int, int, int]] = []
+        self._files: List[str] = []
+
+    def name_id(self, field: str, name: str) -> int:
+        """Code of a name, added to the names table the first time it is seen"""
+        key = (field, name)
+        code = self._ids.get(key)
+        if code is None:
+            self._connection.execute("INSERT OR IGNORE INTO names (field, name) VALUES (?, ?)", key)
+            code = self._connection.execute("SELECT id FROM names WHERE field = ? AND name = ?", key).fetchone()[0]
+            self._ids[key] = code
+        return code
+
+    def date_seconds(self, date: bytes) -> Optional[int]:
+        """Seconds since the epoch of a record date, None if it is unknown or malformed"""
+        if date not in self._dates:
+            try:
+                self._dates[date] = int(datetime.strptime(date.decode(), self.date_format).timestamp())
+            except ValueError:
+                self._dates[date] = None
+        return self._dates[date]
+
+    def open_file(self, file_path: str) -> bool:
+        """
+        Start indexing the records of a file
+
+        Buffered rows are committed first once the batch is full, so a
+        transaction never holds part of a file.
+
+        Args:
+            file_path (str): file about to be processed
+
+        Returns:
+            bool: False if the file is already indexed and its records must not be added
+        """
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+        key = file_key(file_path)
+        if key in self._files or self._connection.execute("SELECT 1 FROM files WHERE key = ?", (key,)).fetchone():
+            self.files_skipped += 1
+            return False
+        self._files.append(key)
+        return True
+
+    def add(self, date: bytes, mission_name: str, device_type: str, device_status: str) -> None:
+        """Buffer a text record"""
+        self._rows.append((self.date_seconds(date), self.name_id('mission', mission_name),
+                           self.name_id('device_type', device_type), self.name_id('device_status', device_status)))
+
+    def add_records(self, schema: RecordSchema, records: np.ndarray) -> None:
+        """
+        Buffer the records of a binary record file in bulk
+
+        Args:
+            schema (RecordSchema): schema of the records
+            records (np.ndarray): structured array of the records
+        """
+        # Unknown (-1) type and status indices pick the trailing 'unknown' code
+        missions = np.array([self.name_id('mission', name) for name in schema.mission_names], dtype=np.int64)
+        types = np.array([self.name_id('device_type', name) for name in schema.device_types + ['unknown']],
+                         dtype=np.int64)
+        statuses = np.array([self.name_id('device_status', name) for name in schema.device_statuses + ['unknown']],
+                            dtype=np.int64)
+        self._rows.extend(zip(records['timestamp'].tolist(), missions[records['mission']].tolist(),
+                              types[records['type']].tolist(), statuses[records['status']].tolist()))
+
+    def flush(self) -> int:
+        """
+        Commit the buffered records and files in one transaction
+
+        Returns:
+            int: number of records committed
+        """
+        if not self._rows and not self._files:
+            return 0
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany(
+                "INSERT INTO records (date, mission, device_type, device_status) VALUES (?, ?, ?, ?)", self._rows)
+            connection.executemany("INSERT OR IGNORE INTO files (key) VALUES (?)", [(key,) for key in self._files])
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        committed = len(self._rows)
+        self.records_indexed += committed
+        self._rows = []
+        self._files = []
+        return committed
+
+    def _where(self, filters: Dict[str, Optional[str]], since: Moment, until: Moment,
+               group_by: Optional[str] = None) -> Optional[Tuple[str, list]]:
+        """
+        WHERE clause and parameters of a query on the index
+
+        Unfiltered columns ahead of a filtered one, of the grouped one or of
+        the date range are matched against every code of their field, so
+        the query is a set of seeks in the index instead of a scan.
+
+        Returns:
+            Optional[Tuple[str, list]]: clause and parameters, None if a name was never indexed
+        """
+        used = [field for field, name in filters.items() if name is not None] + ([group_by] if group_by else [])
+        depth = max([FIELDS.index(field) + 1 for field in used], default=0)
+        if since is not None or until is not None:
+            depth = len(FIELDS)
+        clauses: List[str] = []
+        parameters: list = []
+        for field in FIELDS[:depth]:
+            name = filters[field]
+            if name is None:
+                codes = [code for code, in self._connection.execute("SELECT id FROM names WHERE field = ?", (field,))]
+            else:
+                codes = [code for code, in self._connection.execute(
+                    "SELECT id FROM names WHERE field = ? AND name = ?", (field, name))]
+            if not codes:
+                return None
+            clauses.append(f"{field} IN ({', '.join('?' * len(codes))})")
+            parameters.extend(codes)
+        for clause, moment in (("date >= ?", since), ("date < ?", until)):
+            if moment is not None:
+                clauses.append(clause)
+                parameters.append(_seconds(moment))
+        return (" WHERE " + " AND ".join(clauses) if clauses else "", parameters)
+
+    def count(self, mission: Optional[str] = None, device_type: Optional[str] = None,
+              device_status: Optional[str] = None, since: Moment = None, until: Moment = None) -> int:
+        """
+        Count the indexed records matching every given filter
+
+        Args:
+            mission (Optional[str]): mission name
+            device_type (Optional[str]): device type
+            device_status (Optional[str]): device status
+            since (Moment): first date included, as a datetime or seconds since the epoch
+            until (Moment): first date excluded
+
+        Returns:
+            int: number of matching records
+        """
+        where = self._where({'mission': mission, 'device_type': device_type, 'device_status': device_status},
+                            since, until)
+        if where is None:
+            return 0
+        clause, parameters = where
+        return self._connection.execute(f"SELECT COUNT(*) FROM records{clause}", parameters).fetchone()[0]
+
+    def count_by(self, field: str, mission: Optional[str] = None, device_type: Optional[str] = None,
+                 device_status: Optional[str] = None, since: Moment = None, until: Moment = None) -> Dict[str, int]:
+        """
+        Count the indexed records matching every given filter by mission, device type or device status
+
+        Args:
+            field (str): 'mission', 'device_type' or 'device_status'
+
+        Returns:
+            Dict[str, int]: number of matching records by name, largest first
+        """
+        if field not in FIELDS:
+            raise ValueError(f"Unknown field: {field}")
+        where = self._where({'mission': mission, 'device_type': device_type, 'device_status': device_status},
+                            since, until, field)
+        if where is None:
+            return {}
+        clause, parameters = where
+        rows = self._connection.execute(
+            f"SELECT names.name, counts.count FROM (SELECT {field} AS id, COUNT(*) AS count FROM records{clause} "
+            f"GROUP BY {field}) AS counts JOIN names ON names.id = counts.id ORDER BY counts.count DESC, names.name",
+            parameters).fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        """Commit the buffered records and close the database"""
+        if self._connection is None:
+            return
+        self.flush()
+        self._connection.close()
+        self._connection = None
+
+
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    index_config = ConfigManager.read_yaml_config().get('reporter', {}).get('index', {})
+    parser = argparse.ArgumentParser(description='Query or fill the SQLite index of Apollo 11 records')
+    parser.add_argument('--index', default=index_config.get('path') or './apolo_11/results/records.db',
+                        help='SQLite file of the index')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    query = commands.add_parser('query', help='Count indexed records')
+    query.add_argument('--mission')
+    query.add_argument('--device_type')
+    query.add_argument('--status')
+    query.add_argument('--since', type=datetime.fromisoformat, help='First date included, ISO format')
+    query.add_argument('--until', type=datetime.fromisoformat, help='First date excluded, ISO format')
+    query.add_argument('--days', type=float, help='Only the last days, instead of --since')
+    query.add_argument('--by', choices=list(FIELDS), help='Count by mission, device type or status')
+
+    index = commands.add_parser('index', help='Index the files under directories, such as the backups')
+    index.add_argument('directories', nargs='+')
+    index.add_argument('--workers', type=int, default=1, help='Processes the files are split across')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = _parse_args(argv)
+    if args.command == 'index':
+        # The reporter imports this module
+        from .reporter import Reporter
+
+        reporter_instance = Reporter(workers=args.workers, index_path=args.index)
+        try:
+            for directory in args.directories:
+                reporter_instance.process_directory(directory)
+        finally:
+            reporter_instance.close()
+        print(f"{reporter_instance.records_processed} records processed")
+        return
+
+    record_index = RecordIndex(args.index, ConfigManager.read_yaml_config()['date_format'])
+    try:
+        since = datetime.now() - timedelta(days=args.days) if args.days is not None else args.since
+        filters = dict(mission=args.mission, device_type=args.device_type, device_status=args.status,
+                       since=since, until=args.until)
+        if args.by:
+            for name, count in record_index.count_by(args.by, **filters).items():
+                print(f"{name}\t{count}")
+        else:
+            print(record_index.count(**filters))
+    finally:
+        record_index.close()
+
+
+if __name__ == '__main__':
+    main()
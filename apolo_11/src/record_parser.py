@@ -0,0 +1,83 @@
+"""
+Single-pass parser of text records for the Apollo 11 reporter.
+
+Records written by the generator follow one canonical layout, matched
+by a single precompiled regular expression over the raw bytes. Any
+other layout falls back to one pass over the lines, matching each key
+exactly and keeping the first occurrence. Missing fields are unknown.
+"""
+
+import re
+from typing import Dict, NamedTuple, Optional
+
+UNKNOWN: bytes = b'unknown'
+
+# A value starts and ends with a non-space after exactly one space, anything else takes the line by line
+# path; the lookbehind rejects trailing whitespace without backtracking
+_VALUE = rb' (\S[^\n]*(?<=\S))'
+RECORD_PATTERN = re.compile(b''.join([
+    rb'Date:', _VALUE, rb'\nMission:', _VALUE, rb'\nDevice Type:', _VALUE,
+    rb'\nDevice Status:', _VALUE, rb'\nHash:', _VALUE, rb'(?:\nID:', _VALUE, rb')?\Z',
+]))
+
+
+class ParsedRecord(NamedTuple):
+    """Fields of a text record, as raw bytes
+
+    Attributes:
+        date (bytes): Date field
+        mission (bytes): Mission field
+        device_type (bytes): Device Type field
+        device_status (bytes): Device Status field
+        hash (bytes): Hash field
+        unique_id (Optional[bytes]): ID field of unknown mission records, None if absent
+    """
+    date: bytes
+    mission: bytes
+    device_type: bytes
+    device_status: bytes
+    hash: bytes
+    unique_id: Optional[bytes]
+
+
+# Skips the keyword handling of the NamedTuple constructor on the fast path
+_new_record = tuple.__new__
+
+
+def parse_record(data: bytes) -> ParsedRecord:
+    """
+    Parse a text record in one pass
+
+    Args:
+        data (bytes): content of the record
+
+    Returns:
+        ParsedRecord: fields of the record, b'unknown' for missing fields
+    """
+    match = RECORD_PATTERN.match(data)
+    if match:
+        return _new_record(ParsedRecord, match.groups())
+    return parse_lines(data)
+
+
+def parse_lines(data: bytes) -> ParsedRecord:
+    """
+    Parse a text record of any layout, one "Key: value" line at a time
+
+    Keys and values are stripped, keys must match exactly and the first
+    occurrence of a key wins.
+
+    Args:
+        data (bytes): content of the record
+
+    Returns:
+        ParsedRecord: fields of the record, b'unknown' for missing fields
+    """
+    fields: Dict[bytes, bytes] = {}
+    for line in data.split(b'\n'):
+        key, separator, value = line.partition(b':')
+        if separator:
+            fields.setdefault(key.strip(), value.strip())
+    return ParsedRecord(fields.get(b'Date', UNKNOWN), fields.get(b'Mission', UNKNOWN),
+                        fields.get(b'Device Type', UNKNOWN), fields.get(b'Device Status', UNKNOWN),
+                        fields.get(b'Hash', UNKNOWN), fields.get(b'ID'))
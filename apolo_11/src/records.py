@@ -0,0 +1,168 @@
+"""
+Compact binary record files for the Apollo 11 generator and reporter.
+
+A record file holds every record of a batch as fixed-width rows: a
+magic header, the length-prefixed JSON schema with the vocabularies the
+indices refer to, and the rows of a NumPy structured dtype (timestamp,
+file number, mission, device type and device status indices, hash and
+optionally the unique id), so the reporter decodes a whole file with a
+single numpy.frombuffer call.
+"""
+
+import json
+import struct
+import uuid
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+RECORD_SUFFIX: str = '.rec'
+RECORD_MAGIC: bytes = b'APLREC1\n'
+
+HEADER_LENGTH = struct.Struct('<I')
+
+
+def index_dtype(size: int) -> np.dtype:
+    """Smallest signed little-endian integer type holding indices of a vocabulary and -1"""
+    for dtype in ('i1', '<i2', '<i4'):
+        if size <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    raise ValueError(f"Vocabulary too large: {size}")
+
+
+class RecordSchema:
+    """
+    Row layout and vocabularies of a record file
+
+    Attributes:
+        mission_names (List[str]): mission names, indexed by mission index
+        device_types (List[str]): device types, indexed by type index
+        device_statuses (List[str]): device statuses, indexed by status index
+        date_format (str): strftime format of the record dates
+        uuid_bytes (int): bytes of unique id stored per row, 0 to drop it
+        dtype (np.dtype): structured dtype of a row
+    """
+    def __init__(self, mission_names: List[str], device_types: List[str], device_statuses: List[str],
+                 date_format: str, uuid_bytes: int = 16) -> None:
+        if not 0 <= uuid_bytes <= 16:
+            raise ValueError(f"Unique id bytes must be between 0 and 16: {uuid_bytes}")
+        self.mission_names: List[str] = list(mission_names)
+        self.device_types: List[str] = list(device_types)
+        self.device_statuses: List[str] = list(device_statuses)
+        self.date_format: str = date_format
+        self.uuid_bytes: int = uuid_bytes
+        fields = [
+            ('timestamp', '<i8'),
+            ('file_number', '<u4'),
+            ('mission', index_dtype(len(self.mission_names))),
+            ('type', index_dtype(len(self.device_types))),
+            ('status', index_dtype(len(self.device_statuses))),
+            ('hash', '<u8'),
+        ]
+        if uuid_bytes:
+            fields.append(('uuid', f'V{uuid_bytes}'))
+        self.dtype: np.dtype = np.dtype(fields)
+
+    def matches(self, mission_names: List[str], device_types: List[str], device_statuses: List[str]) -> bool:
+        """Whether the schema was built for these names"""
+        return (self.mission_names, self.device_types, self.device_statuses) == \
+            (mission_names, device_types, device_statuses)
+
+    def to_header(self) -> bytes:
+        """Encode the schema as the header of a record file"""
+        return json.dumps({
+            'missions': self.mission_names,
+            'types': self.device_types,
+            'statuses': self.device_statuses,
+            'date_format': self.date_format,
+            'uuid_bytes': self.uuid_bytes,
+        }).encode()
+
+    @classmethod
+    def from_header(cls, header: bytes) -> 'RecordSchema':
+        """Decode the schema from the header of a record file"""
+        fields: Dict = json.loads(header)
+        return cls(fields['missions'], fields['types'], fields['statuses'], fields['date_format'],
+                   fields['uuid_bytes'])
+
+    def timestamp(self, current_date: str) -> int:
+        """Seconds since the epoch of a date formatted with date_format"""
+        return int(datetime.strptime(current_date, self.date_format).timestamp())
+
+    def format_date(self, timestamp: int) -> str:
+        """Date formatted with date_format of seconds since the epoch"""
+        return datetime.fromtimestamp(timestamp).strftime(self.date_format)
+
+
+def encode_records(schema: RecordSchema, current_date: str, file_numbers: np.ndarray, mission_idx: np.ndarray,
+                   type_idx: np.ndarray, status_idx: np.ndarray, hash_values: np.ndarray,
+                   unique_ids: Dict[int, str]) -> bytes:
+    """
+    Encode a batch of records as the content of a record file
+
+    Args:
+        schema (RecordSchema): layout of the rows
+        current_date (str): date shared by every record
+        file_numbers (np.ndarray): file number of each record
+        mission_idx (np.ndarray): mission index of each record
+        type_idx (np.ndarray): device type index of each record, -1 if unknown
+        status_idx (np.ndarray): device status index of each record, -1 if unknown
+        hash_values (np.ndarray): hash of each record, 0 if unknown
+        unique_ids (Dict[int, str]): unique id of unknown mission records by position
+
+    Returns:
+        bytes: content of the record file
+    """
+    rows = np.zeros(len(file_numbers), dtype=schema.dtype)
+    rows['timestamp'] = schema.timestamp(current_date)
+    rows['file_number'] = file_numbers
+    rows['mission'] = mission_idx
+    rows['type'] = type_idx
+    rows['status'] = status_idx
+    rows['hash'] = hash_values
+    if schema.uuid_bytes:
+        for position, unique_id in unique_ids.items():
+            rows['uuid'][position] = np.void(uuid.UUID(unique_id).bytes[:schema.uuid_bytes])
+
+    header = schema.to_header()
+    return RECORD_MAGIC + HEADER_LENGTH.pack(len(header)) + header + rows.tobytes()
+
+
+def decode_records(data: bytes) -> Tuple[RecordSchema, np.ndarray]:
+    """
+    Decode the content of a record file
+
+    Args:
+        data (bytes): content of the record file
+
+    Returns:
+        Tuple[RecordSchema, np.ndarray]: schema and read-only structured array of the rows
+
+    Raises:
+        ValueError: if the data is not a valid record file
+    """
+    if not data.startswith(RECORD_MAGIC) or len(data) < len(RECORD_MAGIC) + HEADER_LENGTH.size:
+        raise ValueError("Not a record file")
+    header_start = len(RECORD_MAGIC) + HEADER_LENGTH.size
+    (header_length,) = HEADER_LENGTH.unpack_from(data, len(RECORD_MAGIC))
+    schema = RecordSchema.from_header(data[header_start:header_start + header_length])
+
+    rows_start = header_start + header_length
+    if (len(data) - rows_start) % schema.dtype.itemsize:
+        raise ValueError("Truncated record file")
+    return schema, np.frombuffer(data, dtype=schema.dtype, offset=rows_start)
+
+
+def read_records(path: str) -> Tuple[RecordSchema, np.ndarray]:
+    """
+    Read every record of a record file
+
+    Args:
+        path (str): path of the record file
+
+    Returns:
+        Tuple[RecordSchema, np.ndarray]: schema and structured array of the rows
+    """
+    with open(path, 'rb') as file:
+        return decode_records(file.read())
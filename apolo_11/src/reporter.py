@@ -1,27 +1,215 @@
 import os
-import shutil
+import threading
+import time
 
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
-from collections import defaultdict
-from typing import List
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from .backup import BackupMover
+from .checkpoint import Checkpoint, load_checkpoint, save_checkpoint
 from .config import ConfigManager
-from .logging_config import get_logger
+from .hashing import hash_batch, stable_hash
+from .logging_config import get_logger, init_worker_logging, log_per_file
+from .compression import read_bytes, split_suffix
+from .manifest import ManifestEntry, read_manifest
+from .record_index import RecordIndex
+from .publish import PUBLISHED_SUFFIX, STAGING_PREFIX, cycle_name, is_staging
+from .record_parser import UNKNOWN, ParsedRecord, parse_record
+from .records import RECORD_SUFFIX, RecordSchema, decode_records
+from .rolling import RollingWindows, cycle_deltas_by_directory
+from .segment import SEGMENT_SUFFIX, iter_segment_data
+from .stats_output import (STATS_FORMATS, Cells, Reports, append_time_series, count_cells, operational_percentage,
+                           stats_csv, stats_json)
+from .status_counts import StatusCounts
 
 logger = get_logger(__name__)
 
 config = ConfigManager.read_yaml_config()
 
+reporter_config: dict = config.get('reporter', {})
+stats_config: dict = reporter_config.get('stats', {})
+index_config: dict = reporter_config.get('index', {})
+windows_config: dict = reporter_config.get('windows', {})
+
+
+def new_status_counts() -> StatusCounts:
+    """Empty status counts over the missions, device types and statuses of the configuration"""
+    return StatusCounts(config['missions']['names'], config['devices']['types'], config['devices']['status'])
+
+
+@dataclass
+class PartialReport:
+    """Counts built by a worker over a chunk of files
+
+    Attributes:
+        devices_reports (StatusCounts): status counts by mission and device type
+        records_processed (int): number of records processed
+        hashes_checked (int): number of record hashes verified
+        hash_mismatches (int): number of record hashes that did not match
+        incomplete_files (int): number of manifest files missing, of another size or record count
+        cycle_deltas (List[Tuple[str, np.ndarray]]): directory and dense counts of each cycle, in order
+    """
+    devices_reports: StatusCounts
+    records_processed: int
+    hashes_checked: int
+    hash_mismatches: int
+    incomplete_files: int = 0
+    cycle_deltas: List[Tuple[str, np.ndarray]] = field(default_factory=list)
+
+
+def process_chunk(file_paths: Sequence[str], verify_hash: bool,
+                  expected_files: Optional[Dict[str, ManifestEntry]] = None,
+                  index_path: Optional[str] = None) -> PartialReport:
+    """
+    Process a chunk of files in a worker process
+
+    Args:
+        file_paths (Sequence[str]): files to process, in order
+        verify_hash (bool): recompute and check the hash of every record
+        expected_files (Optional[Dict[str, ManifestEntry]]): manifest entries of the files listed in one
+        index_path (Optional[str]): record index the worker inserts the records into, None to disable
+
+    Returns:
+        PartialReport: counts of the chunk
+    """
+    worker = Reporter(verify_hash=verify_hash, workers=1, index_path=index_path)
+    worker.log_per_file = False
+    worker.expected_files = expected_files or {}
+    try:
+        for file_path in file_paths:
+            worker.process_path(file_path)
+    finally:
+        worker.close()
+    worker.finish_cycle()
+    return PartialReport(worker.devices_reports, worker.records_processed,
+                         worker.hashes_checked, worker.hash_mismatches, worker.incomplete_files,
+                         worker.cycle_deltas)
+
 
 class Reporter:
     """
     Generate reports based on log files
 
     Attributes:
-        devices_reports (defaultdict): List to store reports categorized
-        by mission and device type.
+        devices_reports (StatusCounts): status counts by mission and device type
+        verify_hash (bool): recompute and check the hash of every record read
+        hashes_checked (int): number of record hashes verified
+        hash_mismatches (int): number of record hashes that did not match
+        last_report_time (Optional[datetime]): time of the last stats report
+        records_processed (int): number of records processed since start
+        log_per_file (bool): log every record instead of one line per directory
+        workers (int): processes files are split across, 1 processes them serially
+        checkpoint_path (Optional[str]): snapshot saved after every run and loaded on start, None to disable
+        reported (Set[str]): cycles counted but not yet backed up, by name without the -noreport suffix;
+            they are skipped and only they are moved to the backups
+        expected_files (Dict[str, ManifestEntry]): manifest entries of the discovered files not processed yet
+        incomplete_files (int): number of manifest files missing, of another size or record count
+        backup_mover (BackupMover): moves reported cycles to the backups directory
+        index_path (Optional[str]): SQLite record index every processed record is inserted into, None to disable
+        record_index (Optional[RecordIndex]): the record index, None if disabled
+        windows (Optional[RollingWindows]): counts of the recent cycles, None if no window is configured
+        cycle_deltas (List[Tuple[str, np.ndarray]]): directory and dense counts of the cycles not yet in the windows
     """
-    def __init__(self) -> None:
-        self.devices_reports = defaultdict(list)
+    CHUNKS_PER_WORKER: int = 4
+
+    def __init__(self, verify_hash: Optional[bool] = None, workers: Optional[int] = None,
+                 checkpoint_path: Optional[str] = None, index_path: Optional[str] = None) -> None:
+        self.devices_reports: StatusCounts = new_status_counts()
+        self.last_report_time: Optional[datetime] = None
+        self.verify_hash: bool = reporter_config.get('verify_hash', False) if verify_hash is None else verify_hash
+        self.hashes_checked: int = 0
+        self.hash_mismatches: int = 0
+        self.records_processed: int = 0
+        self.log_per_file: bool = log_per_file(config)
+        self.workers: int = reporter_config.get('workers', 1) if workers is None else workers
+        if self.workers < 1:
+            raise ValueError(f"Reporter workers must be at least 1: {self.workers}")
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.reported: Set[str] = set()
+        # Background backup copies forget the cycles they finish from another thread
+        self._reported_lock = threading.Lock()
+        self.expected_files: Dict[str, ManifestEntry] = {}
+        self.incomplete_files: int = 0
+        backup_config: dict = reporter_config.get('backup', {})
+        self.backup_mover: BackupMover = BackupMover(backup_config.get('workers', 4),
+                                                     backup_config.get('buffer_size', 8 * 1024 * 1024),
+                                                     backup_config.get('verify', 'size'),
+                                                     backup_config.get('background', True))
+        self.index_path: Optional[str] = index_path
+        self.record_index: Optional[RecordIndex] = None
+        if index_path:
+            self.record_index = RecordIndex(index_path, config['date_format'], index_config.get('batch_size', 100_000))
+        # Whether the records of the file being processed go to the record index
+        self._indexing: bool = False
+        self.windows: Optional[RollingWindows] = None
+        if windows_config.get('ranges'):
+            self.windows = RollingWindows(self.devices_reports.counts.shape, windows_config['ranges'],
+                                          windows_config.get('capacity', 8640))
+        self.cycle_deltas: List[Tuple[str, np.ndarray]] = []
+        self._cycle_directory: Optional[str] = None
+        self._cycle_start: Optional[np.ndarray] = None
+        self.checkpoint_path: Optional[str] = checkpoint_path
+        if checkpoint_path:
+            self.load_checkpoint()
+        # Counts at the last time series append, the next one writes what changed since
+        self._series_cells: Cells = count_cells(list(self.devices_reports.items()))
+
+    def load_checkpoint(self) -> None:
+        """Warm-start the counts and the cycles not yet backed up from the checkpoint file, if any"""
+        checkpoint = load_checkpoint(self.checkpoint_path)
+        if checkpoint is None:
+            return
+        # Checkpoints written with other vocabularies are remapped by name
+        self.devices_reports = new_status_counts()
+        self.devices_reports.merge(checkpoint.devices_reports)
+        self.reported = set(checkpoint.reported)
+        self.records_processed = checkpoint.records_processed
+        self.hashes_checked = checkpoint.hashes_checked
+        self.hash_mismatches = checkpoint.hash_mismatches
+        logger.info("Reporte reanudado desde %s: %d registros, %d ciclos pendientes de respaldo.",
+                    self.checkpoint_path, self.records_processed, len(self.reported))
+
+    def save_checkpoint(self) -> None:
+        """Save the counts and the cycles not yet backed up to the checkpoint file, if enabled"""
+        if self.checkpoint_path:
+            with self._reported_lock:
+                reported = sorted(self.reported)
+            save_checkpoint(self.checkpoint_path, Checkpoint(self.devices_reports,
+                                                             records_processed=self.records_processed,
+                                                             hashes_checked=self.hashes_checked,
+                                                             hash_mismatches=self.hash_mismatches,
+                                                             reported=reported))
+
+    def is_reported(self, directory_name: str) -> bool:
+        """Whether a directory is a cycle already counted and not yet backed up"""
+        return cycle_name(directory_name) in self.reported
+
+    def mark_reported(self, directories: Iterable[str]) -> None:
+        """
+        Remember the given cycle directories as counted
+
+        Cycle numbers are not published in order, each generator process
+        takes its own block of them, so every counted cycle is kept by
+        name until its backup is done.
+        """
+        names = {cycle_name(os.path.basename(os.path.normpath(directory))) for directory in directories}
+        with self._reported_lock:
+            self.reported |= names
+
+    def forget_reported(self, name: str) -> None:
+        """Stop tracking a cycle once it is backed up"""
+        with self._reported_lock:
+            self.reported.discard(name)
+
+    def prune_reported(self, source_directory: str) -> None:
+        """Forget the counted cycles no longer in the devices directory, backed up by a run that stopped early"""
+        present = {cycle_name(name) for name in os.listdir(source_directory) if name.endswith(PUBLISHED_SUFFIX)}
+        with self._reported_lock:
+            self.reported &= present
 
     def generate_report_folder(self, base_path=None) -> None:
         """
@@ -41,23 +229,287 @@ class Reporter:
         try:
             self.generate_report_folder()
 
-            for root, _, files in os.walk(input_directory):
-                for file in files:
-                    if file.endswith(".log"):
-                        file_path = os.path.join(root, file)
-                        self.process_file(file_path)
+            self.process_directory(input_directory)
+
+            if self.verify_hash:
+                logger.info("Hashes verificados: %d, inválidos: %d", self.hashes_checked, self.hash_mismatches)
 
             self.generate_stats_report()
 
+            self.save_checkpoint()
+
             self.move_folders_to_backup(input_directory, backup_directory)
 
         except Exception as e:
             logger.error("Error durante el procesamiento: %s", str(e))
 
+    def process_cycles(self, cycle_directories: List[str], backup_directory: str) -> None:
+        """
+        Process the given cycle directories, generate reports, and move them to backup
+
+        Args:
+            cycle_directories (List[str]): -noreport directories of finished cycles
+            backup_directory (str): backup directory to move the cycles to
+        """
+        try:
+            self.generate_report_folder()
+
+            self.ingest_cycles(cycle_directories)
+
+            self.generate_stats_report()
+
+            self.save_checkpoint()
+
+            for cycle_directory in cycle_directories:
+                self.move_folder_to_backup(cycle_directory, backup_directory)
+
+        except Exception as e:
+            logger.error("Error durante el procesamiento: %s", str(e))
+
+    def ingest_cycles(self, cycle_directories: List[str]) -> List[str]:
+        """
+        Add the records of the given cycle directories to the counts, without reporting or moving them
+
+        Cycles already counted are skipped.
+
+        Args:
+            cycle_directories (List[str]): -noreport directories of finished cycles
+
+        Returns:
+            List[str]: the directories ingested, in order
+        """
+        records_before = self.records_processed
+        new_cycles = [cycle_directory for cycle_directory in cycle_directories
+                      if not self.is_reported(os.path.basename(os.path.normpath(cycle_directory)))]
+        if len(new_cycles) < len(cycle_directories):
+            logger.warning("%d ciclos ya reportados omitidos.", len(cycle_directories) - len(new_cycles))
+        self.process_paths([file_path for cycle_directory in new_cycles
+                            for file_path in self.cycle_files(cycle_directory)])
+        self.mark_reported(new_cycles)
+        if not self.log_per_file:
+            logger.info("%d ciclos procesados: %d registros.", len(new_cycles),
+                        self.records_processed - records_before)
+        return new_cycles
+
+    def process_directory(self, input_directory: str) -> None:
+        """
+        Process every log and segment file under a directory, skipping cycles already reported
+        """
+        records_before = self.records_processed
+        file_paths, cycle_directories = self.discover_cycles(input_directory)
+        self.process_paths(file_paths)
+        self.mark_reported(cycle_directories)
+        if not self.log_per_file:
+            logger.info("Directorio %s procesado: %d registros.", input_directory,
+                        self.records_processed - records_before)
+
+    def cycle_files(self, cycle_directory: str) -> List[str]:
+        """
+        List the files of a cycle from its manifest, walking the directory if it has none
+
+        Args:
+            cycle_directory (str): directory of the cycle
+
+        Returns:
+            List[str]: paths of the files to process
+        """
+        file_paths = self.manifest_files(cycle_directory)
+        return self.discover_files(cycle_directory) if file_paths is None else file_paths
+
+    def manifest_files(self, directory: str) -> Optional[List[str]]:
+        """
+        List the files of a directory from its manifest and remember their expected sizes and records
+
+        Args:
+            directory (str): directory of a cycle
+
+        Returns:
+            Optional[List[str]]: paths of the files listed, None if the directory has no manifest
+        """
+        manifest = read_manifest(directory)
+        if manifest is None:
+            return None
+        file_paths: List[str] = []
+        for entry in manifest.files:
+            file_path = os.path.join(directory, entry.name)
+            self.expected_files[file_path] = entry
+            file_paths.append(file_path)
+        return file_paths
+
+    def discover_files(self, input_directory: str) -> List[str]:
+        """
+        List every log, segment and record file under a directory
+
+        Subdirectories with a manifest are listed from it instead of being walked.
+
+        Args:
+            input_directory (str): directory to walk
+
+        Returns:
+            List[str]: paths of the files to process
+        """
+        return self.discover_cycles(input_directory)[0]
+
+    def discover_cycles(self, input_directory: str) -> Tuple[List[str], List[str]]:
+        """
+        List every log, segment and record file under a directory and the cycle directories listed
+
+        Args:
+            input_directory (str): directory to walk
+
+        Returns:
+            Tuple[List[str], List[str]]: paths of the files to process and of the -noreport directories they are in
+        """
+        file_paths: List[str] = []
+        cycle_directories: List[str] = []
+        for root, dirs, files in os.walk(input_directory):
+            walked: List[str] = []
+            for dir_name in dirs:
+                # Hidden staging directories hold cycles still being written
+                if is_staging(dir_name) or self.is_reported(dir_name):
+                    continue
+                if dir_name.endswith(PUBLISHED_SUFFIX):
+                    cycle_directories.append(os.path.join(root, dir_name))
+                listed = self.manifest_files(os.path.join(root, dir_name))
+                if listed is None:
+                    walked.append(dir_name)
+                else:
+                    file_paths.extend(listed)
+            dirs[:] = walked
+            for file in files:
+                # Compressed files keep their own suffix before the codec suffix
+                name, _ = split_suffix(file)
+                if name.endswith((".log", SEGMENT_SUFFIX, RECORD_SUFFIX)):
+                    file_paths.append(os.path.join(root, file))
+        return file_paths, cycle_directories
+
+    def process_path(self, file_path: str) -> None:
+        """
+        Process a log, segment or record file according to its suffix
+
+        Files listed in a manifest are read with their expected size and
+        their record count is checked against it.
+        """
+        entry = self.expected_files.pop(file_path, None)
+        size = entry.size if entry else None
+        self.track_cycle(os.path.dirname(file_path))
+        self._indexing = self.record_index is not None and self.record_index.open_file(file_path)
+        records_before = self.records_processed
+        name, _ = split_suffix(file_path)
+        try:
+            if name.endswith(SEGMENT_SUFFIX):
+                self.process_segment(file_path, size)
+            elif name.endswith(RECORD_SUFFIX):
+                self.process_record_file(file_path, size)
+            else:
+                self.process_file(file_path, size)
+        except (OSError, ValueError) as e:
+            if entry is None:
+                raise
+            self.incomplete_files += 1
+            logger.error("Archivo del manifiesto ilegible %s: %s", file_path, str(e))
+            return
+
+        if entry is not None and self.records_processed - records_before != entry.records:
+            self.incomplete_files += 1
+            logger.warning("Archivo incompleto %s: %d registros, %d en el manifiesto.", file_path,
+                           self.records_processed - records_before, entry.records)
+
+    def process_paths(self, file_paths: List[str]) -> None:
+        """
+        Process files serially, or split in contiguous chunks across the worker processes
+
+        Workers build partial counts that are merged in chunk order, so the
+        result is identical to processing the files serially.
+
+        Args:
+            file_paths (List[str]): files to process
+        """
+        if self.workers == 1 or len(file_paths) <= 1:
+            for file_path in file_paths:
+                self.process_path(file_path)
+            if self.record_index is not None:
+                self.record_index.flush()
+            self.update_windows()
+            return
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker_logging)
+        chunk_count = min(len(file_paths), self.workers * self.CHUNKS_PER_WORKER)
+        chunk_size = -(-len(file_paths) // chunk_count)
+        chunks = [file_paths[i:i + chunk_size] for i in range(0, len(file_paths), chunk_size)]
+        expected = [{file_path: self.expected_files.pop(file_path) for file_path in chunk
+                     if file_path in self.expected_files} for chunk in chunks]
+        for partial in self._executor.map(process_chunk, chunks, [self.verify_hash] * len(chunks), expected,
+                                          [self.index_path] * len(chunks)):
+            self.merge(partial)
+        self.update_windows()
+
+    def track_cycle(self, directory: str) -> None:
+        """Start the counts of a cycle when processing moves on to the files of another directory"""
+        if directory != self._cycle_directory:
+            self.finish_cycle()
+            self._cycle_directory = directory
+            self._cycle_start = self.devices_reports.counts.copy()
+
+    def finish_cycle(self) -> None:
+        """Keep the counts of the cycle being processed for the rolling windows"""
+        if self._cycle_directory is not None:
+            self.cycle_deltas.append((self._cycle_directory, self.devices_reports.counts - self._cycle_start))
+            self._cycle_directory = None
+            self._cycle_start = None
+
+    def update_windows(self) -> None:
+        """Add the cycles processed since the last update to the rolling windows"""
+        self.finish_cycle()
+        deltas, self.cycle_deltas = self.cycle_deltas, []
+        if self.windows is None:
+            return
+        # A cycle split across worker chunks arrives as consecutive deltas of its directory
+        now = time.time()
+        for counts in cycle_deltas_by_directory(deltas):
+            self.windows.add(counts, now)
+
+    def window_summary(self) -> Dict[str, dict]:
+        """
+        Records, disconnections and operational percentage of every rolling window, up to now
+
+        Returns:
+            Dict[str, dict]: summary of each window by name, empty if no window is configured
+        """
+        if self.windows is None:
+            return {}
+        self.windows.expire(time.time())
+        return self.windows.summary(self.devices_reports)
+
+    def merge(self, partial: PartialReport) -> None:
+        """
+        Add the counts of a worker to the report
+        """
+        self.devices_reports.merge(partial.devices_reports)
+        self.records_processed += partial.records_processed
+        self.hashes_checked += partial.hashes_checked
+        self.hash_mismatches += partial.hash_mismatches
+        self.incomplete_files += partial.incomplete_files
+        self.cycle_deltas.extend(partial.cycle_deltas)
+
+    def close(self) -> None:
+        """Shut down the worker processes, finish the backup copies and close the record index"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.backup_mover.close()
+        if self.record_index is not None:
+            self.record_index.close()
+            self.record_index = None
+
     def move_folders_to_backup(self, source_directory=None, backup_directory=None):
         """
         Move folders with noreport to backup directory
 
+        Only cycles already counted are moved, a cycle published after the
+        last count stays for the next run.
+
         Args:
             source_directory: Source directory containing folders to be moved.
                             If None, uses config default (results/devices).
@@ -67,29 +519,176 @@ class Reporter:
         source_directory = source_directory or config['routes'][1]['devices']
         backup_directory = backup_directory or config['routes'][2]['backups']
 
+        self.prune_reported(source_directory)
         for root, dirs, _ in os.walk(source_directory):
             for dir_name in dirs:
-                if dir_name.endswith("-noreport"):
-                    source_dir = os.path.join(root, dir_name)
-                    dest_dir_name = dir_name[:-9]  # Remove "-noreport" suffix
-                    dest_dir = os.path.join(backup_directory, dest_dir_name)
-                    shutil.move(source_dir, dest_dir)
+                # Hidden -noreport folders are counted cycles whose copy to another filesystem was interrupted
+                if is_staging(dir_name) and dir_name.endswith(PUBLISHED_SUFFIX):
+                    self.forget_when_backed_up(
+                        cycle_name(dir_name),
+                        self.backup_mover.copy(os.path.join(root, dir_name),
+                                               self.backup_path(dir_name[len(STAGING_PREFIX):], backup_directory)))
+            dirs[:] = [dir_name for dir_name in dirs if not is_staging(dir_name)]
+            for dir_name in dirs:
+                if dir_name.endswith(PUBLISHED_SUFFIX) and self.is_reported(dir_name):
+                    self.move_folder_to_backup(os.path.join(root, dir_name), backup_directory)
+
+    def move_folder_to_backup(self, source_dir: str, backup_directory: str) -> None:
+        """
+        Move a counted noreport folder to the backup directory without its "-noreport" suffix
+
+        The move is a rename on the same filesystem and a background copy across filesystems.
+        """
+        dir_name = os.path.basename(os.path.normpath(source_dir))
+        if not self.is_reported(dir_name):
+            logger.warning("Ciclo %s sin reportar, no se mueve al respaldo.", source_dir)
+            return
+        self.forget_when_backed_up(cycle_name(dir_name),
+                                   self.backup_mover.move(source_dir, self.backup_path(dir_name, backup_directory)))
+
+    def forget_when_backed_up(self, name: str, copy: Optional[Future]) -> None:
+        """Stop tracking a counted cycle once its move is done, or once its background copy succeeds"""
+        if copy is None:
+            self.forget_reported(name)
+            return
+
+        def forget(done: Future) -> None:
+            # A failed copy keeps the cycle counted and its hidden source for the next move
+            if done.exception() is None:
+                self.forget_reported(name)
+
+        copy.add_done_callback(forget)
+
+    def backup_path(self, dir_name: str, backup_directory: str) -> str:
+        """Backup path of a noreport folder, without its "-noreport" suffix"""
+        dest_dir_name = dir_name[:-len(PUBLISHED_SUFFIX)] if dir_name.endswith(PUBLISHED_SUFFIX) else dir_name
+        return os.path.join(backup_directory, dest_dir_name)
+
+    def process_file(self, file_path: str, size: Optional[int] = None) -> None:
+        """
+        Process a log file, compressed or not, and extract relevant information
+        """
+        self.process_record(read_bytes(file_path, size))
+
+    def process_segment(self, segment_path: str, size: Optional[int] = None) -> None:
+        """
+        Process every record packed in a segment file
+        """
+        for _, payload in iter_segment_data(read_bytes(segment_path, size)):
+            self.process_record(payload)
+
+    def process_record_file(self, record_path: str, size: Optional[int] = None) -> None:
+        """
+        Process every record of a binary record file
+        """
+        schema, records = decode_records(read_bytes(record_path, size))
+        self.process_records(schema, records)
+        if self.log_per_file:
+            logger.info("Archivo binario '%s' registrado con éxito: %d registros.", record_path, len(records))
+
+    def process_records(self, schema: RecordSchema, records: np.ndarray) -> None:
+        """
+        Count binary records by mission, device type and device status in bulk
 
-    def process_file(self, file_path: str) -> None:
+        Args:
+            schema (RecordSchema): schema of the records
+            records (np.ndarray): structured array of the records
         """
-        Process a log file and extract relevant information
+        mission_names = schema.mission_names
+        device_types = schema.device_types + ['unknown']
+        device_statuses = schema.device_statuses + ['unknown']
+        # Unknown (-1) type and status indices wrap to the trailing 'unknown' entries
+        type_idx = np.where(records['type'] < 0, len(device_types) - 1, records['type']).astype(np.int64)
+        status_idx = np.where(records['status'] < 0, len(device_statuses) - 1, records['status']).astype(np.int64)
+        mission_types = records['mission'].astype(np.int64) * len(device_types) + type_idx
+        combos = mission_types * len(device_statuses) + status_idx
+
+        unique_combos, counts = np.unique(combos, return_counts=True)
+        for combo, count in zip(unique_combos.tolist(), counts.tolist()):
+            mission_type, status = divmod(combo, len(device_statuses))
+            mission, device_type = divmod(mission_type, len(device_types))
+            self.devices_reports.add(mission_names[mission], device_types[device_type], device_statuses[status],
+                                     count)
+        self.records_processed += len(records)
+        if self._indexing:
+            self.record_index.add_records(schema, records)
+
+        if self.verify_hash:
+            self.verify_record_hashes(schema, records)
+
+    def verify_record_hashes(self, schema: RecordSchema, records: np.ndarray) -> int:
+        """
+        Check the hashes of binary records of known missions in bulk
+
+        Args:
+            schema (RecordSchema): schema of the records
+            records (np.ndarray): structured array of the records
+
+        Returns:
+            int: number of records whose hash does not match
+        """
+        mismatches = 0
+        known = records[records['type'] >= 0]
+        for timestamp in np.unique(known['timestamp']).tolist():
+            rows = known[known['timestamp'] == timestamp]
+            expected = hash_batch(schema.format_date(timestamp), schema.mission_names, schema.device_types,
+                                  schema.device_statuses, rows['mission'], rows['type'], rows['status'])
+            mismatches += int(np.count_nonzero(expected != rows['hash']))
+        self.hashes_checked += len(known)
+        self.hash_mismatches += mismatches
+        if mismatches:
+            logger.warning("%d hashes inválidos en registros binarios.", mismatches)
+        return mismatches
+
+    def process_content(self, content: str) -> None:
+        """
+        Extract relevant information from the content of a record
+        """
+        self.process_record(content.encode())
+
+    def process_record(self, data: bytes) -> None:
+        """
+        Extract relevant information from the raw bytes of a text record
+        """
+        record = parse_record(data)
+        mission_name = record.mission.decode()
+        device_type = record.device_type.decode()
+        device_status = record.device_status.decode()
+
+        self.devices_reports.add(mission_name, device_type, device_status)
+        self.records_processed += 1
+        if self._indexing:
+            self.record_index.add(record.date, mission_name, device_type, device_status)
+
+        if self.verify_hash:
+            self.verify_record_hash(record, mission_name, device_type, device_status)
+
+        if self.log_per_file:
+            logger.info("Mision '%s' y dispositivo '%s' registrada con éxito.", mission_name, device_type)
+
+    def verify_record_hash(self, record: ParsedRecord, mission_name: str, device_type: str,
+                           device_status: str) -> bool:
         """
-        with open(file_path, 'r') as file:
-            content = file.read()
+        Check the Hash field of a record against its date and device fields
 
-        lines = content.split('\n')
-        mission_name = self.extract_value(lines, "Mission")
-        device_type = self.extract_value(lines, "Device Type")
-        device_status = self.extract_value(lines, "Device Status")
+        Args:
+            record (ParsedRecord): parsed fields of the record
+            mission_name (str): mission of the record
+            device_type (str): device type of the record
+            device_status (str): device status of the record
 
-        self.devices_reports[(mission_name, device_type)].append(device_status)
+        Returns:
+            bool: False if the hash does not match, True otherwise
+        """
+        if record.hash == UNKNOWN:
+            return True
 
-        logger.info("Mision '%s' y dispositivo '%s' registrada con éxito.", mission_name, device_type)
+        self.hashes_checked += 1
+        if str(stable_hash(record.date.decode(), mission_name, device_type, device_status)) != record.hash.decode():
+            self.hash_mismatches += 1
+            logger.warning("Hash inválido para la misión '%s' y dispositivo '%s'.", mission_name, device_type)
+            return False
+        return True
 
     def extract_value(self, lines: List[str], keyword: str) -> str:
         """
@@ -114,37 +713,79 @@ class Reporter:
     def generate_stats_report(self) -> None:
         """
         Generate a stats report based on processed log files
+
+        The report is written as prose and, as configured, as JSON and CSV,
+        each with a single write, and the counts added since the previous
+        report are appended to the time series.
         """
-        stats_filename = f"APLSTATS-REPORT-{datetime.now().strftime(config['date_format'])}.log"
-        stats_path = os.path.join(config['routes'][3]['reports'], stats_filename)
-
-        with open(stats_path, 'w') as stats_file:
-            # Analysis
-            stats_file.write("Análisis de eventos:\n")
-            for (mission, device_type), statuses in self.devices_reports.items():
-                stats_file.write(f"Misión: {mission}, Tipo de Dispositivo: {device_type}\n")
-                for status in set(statuses):
-                    count = statuses.count(status)
-                    stats_file.write(f"   Estado: {status}, Cantidad: {count}\n")
-
-            # Management
-            stats_file.write("\nGestión de desconexiones:\n")
-            for (mission, device_type), statuses in self.devices_reports.items():
-                unknown_count = statuses.count("unknown")
-                stats_file.write(f"Misión: {mission}, Tipo de Dispositivo: {device_type}\n")
-                stats_file.write(f"   Desconexiones (unknown): {unknown_count}\n")
-
-            # Consolidation
-            stats_file.write("\nConsolidación de misiones:\n")
-            total_unoperational = sum(1 for statuses in self.devices_reports.values() if "unknown" in statuses)
-            stats_file.write(f"Total de dispositivos inoperables: {total_unoperational}\n")
-
-            # Percentage
-            stats_file.write("\nCálculo de porcentajes:\n")
-            for (mission, device_type), statuses in self.devices_reports.items():
-                percentage = len([status for status in statuses if status != "unknown"]) / len(statuses) * 100
-                stats_file.write(
-                    f"Misión: {mission}, Tipo de Dispositivo: {device_type}, "
-                    f"Porcentaje: {percentage:.2f}%\n")
+        timestamp = time.time()
+        reports_directory = config['routes'][3]['reports']
+        stats_name = f"APLSTATS-REPORT-{datetime.now().strftime(config['date_format'])}"
+        stats_path = os.path.join(reports_directory, f"{stats_name}.log")
+        reports = list(self.devices_reports.items())
+        windows = self.window_summary()
+
+        outputs = {
+            'log': lambda: self.format_stats_report(reports, windows),
+            'json': lambda: stats_json(reports, self.records_processed, timestamp, windows),
+            'csv': lambda: stats_csv(reports),
+        }
+        for extension in stats_config.get('formats', STATS_FORMATS):
+            with open(os.path.join(reports_directory, f"{stats_name}.{extension}"), 'w', encoding='utf-8',
+                      newline='') as stats_file:
+                stats_file.write(outputs[extension]())
+
+        time_series = stats_config.get('time_series', 'APLSTATS-SERIES.csv')
+        if time_series:
+            cells = count_cells(reports)
+            append_time_series(os.path.join(reports_directory, time_series), timestamp, cells, self._series_cells)
+            self._series_cells = cells
 
+        self.last_report_time = datetime.now()
         logger.info("Informe estadístico generado en: %s", stats_path)
+
+    def format_stats_report(self, reports: Reports, windows: Optional[Dict[str, dict]] = None) -> str:
+        """
+        Format the prose stats report
+
+        Args:
+            reports (Reports): status counts by mission and device type
+            windows (Optional[Dict[str, dict]]): summary of each rolling window by name
+
+        Returns:
+            str: the report
+        """
+        # Analysis
+        lines: List[str] = ["Análisis de eventos:"]
+        for (mission, device_type), statuses in reports:
+            lines.append(f"Misión: {mission}, Tipo de Dispositivo: {device_type}")
+            for status, count in statuses.items():
+                lines.append(f"   Estado: {status}, Cantidad: {count}")
+
+        # Management
+        lines.append("\nGestión de desconexiones:")
+        for (mission, device_type), statuses in reports:
+            unknown_count = statuses.get("unknown", 0)
+            lines.append(f"Misión: {mission}, Tipo de Dispositivo: {device_type}")
+            lines.append(f"   Desconexiones (unknown): {unknown_count}")
+
+        # Consolidation
+        lines.append("\nConsolidación de misiones:")
+        total_unoperational = sum(1 for _, statuses in reports if "unknown" in statuses)
+        lines.append(f"Total de dispositivos inoperables: {total_unoperational}")
+
+        # Percentage
+        lines.append("\nCálculo de porcentajes:")
+        for (mission, device_type), statuses in reports:
+            percentage = operational_percentage(statuses)
+            lines.append(f"Misión: {mission}, Tipo de Dispositivo: {device_type}, Porcentaje: {percentage:.2f}%")
+
+        # Rolling windows
+        if windows:
+            lines.append("\nVentanas móviles:")
+            for name, window in windows.items():
+                lines.append(f"Ventana: {name}, Ciclos: {window['cycles']}, Registros: {window['records']}, "
+                             f"Desconexiones (unknown): {window['disconnections']}, "
+                             f"Porcentaje: {window['operational_percentage']:.2f}%")
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,155 @@
+"""
+Rolling-window status counts for the Apollo 11 reporter.
+
+The reporter counts since it started, which hides a recent degradation
+behind the whole history. Rolling windows keep the counts of the last
+N cycles, or of the cycles reported in the last hour or day, next to
+the cumulative ones. Every window shares one ring buffer holding the
+dense count array of each recent cycle, and keeps a running total and
+the position of its oldest cycle in the buffer. Adding a cycle adds
+its array to every total; a cycle leaving a window is subtracted once,
+so a cycle costs the same whatever the length of the history.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .status_counts import UNKNOWN, StatusCounts
+
+
+@dataclass
+class Window:
+    """A rolling window over the recent cycles
+
+    Attributes:
+        name (str): name shown in the report and the dashboard
+        cycles (Optional[int]): maximum cycles held, None for no limit
+        seconds (Optional[float]): maximum age of the cycles held, None for no limit
+        totals (np.ndarray): counts of the cycles held, by mission, device type and device status
+        start (int): number of the oldest cycle held, counted from the first cycle added
+    """
+    name: str
+    cycles: Optional[int]
+    seconds: Optional[float]
+    totals: np.ndarray
+    start: int = 0
+
+
+class RollingWindows:
+    """
+    Rolling windows of status counts sharing one ring buffer of per-cycle arrays
+
+    A window holds at most capacity cycles, time windows included.
+
+    Attributes:
+        capacity (int): cycles held by the ring buffer
+        windows (Dict[str, Window]): windows by name
+        added (int): cycles added since start
+    """
+    def __init__(self, shape: Tuple[int, ...], windows: Sequence[dict], capacity: int = 8640) -> None:
+        if capacity < 1:
+            raise ValueError(f"Window capacity must be at least 1: {capacity}")
+        self.capacity: int = capacity
+        self.windows: Dict[str, Window] = {}
+        for window in windows:
+            if window.get('cycles') is None and window.get('seconds') is None:
+                raise ValueError(f"Window {window['name']} needs cycles or seconds")
+            self.windows[window['name']] = Window(window['name'], window.get('cycles'), window.get('seconds'),
+                                                  np.zeros(shape, dtype=np.int64))
+        # Cycle counts fit in 32 bits, halving the memory of the buffer
+        self._buffer: np.ndarray = np.zeros((capacity,) + tuple(shape), dtype=np.int32)
+        self._times: np.ndarray = np.zeros(capacity, dtype=np.float64)
+        self.added: int = 0
+
+    def add(self, counts: np.ndarray, timestamp: float) -> None:
+        """
+        Add the counts of a cycle to every window
+
+        Args:
+            counts (np.ndarray): counts of the cycle, shaped like the window totals
+            timestamp (float): time the cycle was reported, in seconds since the epoch
+        """
+        slot = self.added % self.capacity
+        # The cycle about to be overwritten leaves the windows still holding it
+        for window in self.windows.values():
+            if window.start <= self.added - self.capacity:
+                self._evict(window)
+        self._buffer[slot] = counts
+        self._times[slot] = timestamp
+        self.added += 1
+        for window in self.windows.values():
+            window.totals += counts
+        self.expire(timestamp)
+
+    def expire(self, now: float) -> None:
+        """Remove from every window the cycles it no longer covers at the given time"""
+        for window in self.windows.values():
+            while window.start < self.added and self._expired(window, now):
+                self._evict(window)
+
+    def _expired(self, window: Window, now: float) -> bool:
+        """Whether the oldest cycle of a window is out of it"""
+        if window.cycles is not None and self.added - window.start > window.cycles:
+            return True
+        return window.seconds is not None and self._times[window.start % self.capacity] <= now - window.seconds
+
+    def _evict(self, window: Window) -> None:
+        window.totals -= self._buffer[window.start % self.capacity]
+        window.start += 1
+
+    def held(self, name: str) -> int:
+        """Number of cycles held by a window"""
+        return self.added - self.windows[name].start
+
+    def counts(self, name: str, like: StatusCounts) -> StatusCounts:
+        """
+        Counts of a window
+
+        Args:
+            name (str): name of the window
+            like (StatusCounts): counts whose vocabularies the window totals are indexed by
+
+        Returns:
+            StatusCounts: the counts of the cycles held by the window
+        """
+        counts = StatusCounts(like.mission_names, like.device_types, like.device_statuses)
+        counts.counts[...] = self.windows[name].totals
+        return counts
+
+    def summary(self, like: StatusCounts) -> Dict[str, dict]:
+        """
+        Records, disconnections and operational percentage of every window
+
+        Args:
+            like (StatusCounts): counts whose vocabularies the window totals are indexed by
+
+        Returns:
+            Dict[str, dict]: summary of each window by name
+        """
+        unknown = like.device_statuses.index(UNKNOWN)
+        summaries: Dict[str, dict] = {}
+        for name, window in self.windows.items():
+            records = int(window.totals.sum())
+            disconnections = int(window.totals[..., unknown].sum())
+            summaries[name] = {
+                'cycles': self.held(name),
+                'records': records,
+                'disconnections': disconnections,
+                'operational_percentage': round((records - disconnections) / records * 100, 2) if records else 0.0,
+            }
+        return summaries
+
+
+def cycle_deltas_by_directory(deltas: Sequence[Tuple[str, np.ndarray]]) -> List[np.ndarray]:
+    """Counts of each cycle, adding up consecutive deltas of the same directory"""
+    cycles: List[np.ndarray] = []
+    previous: Optional[str] = None
+    for directory, delta in deltas:
+        if directory == previous:
+            cycles[-1] = cycles[-1] + delta
+        else:
+            cycles.append(delta)
+            previous = directory
+    return cycles
@@ -0,0 +1,151 @@
+"""
+Packed segment files for the Apollo 11 generator and reporter.
+
+A segment holds every record of a cycle in a single file: a magic
+header, the record payloads appended back to back, an offset index
+and a fixed-size footer pointing at the index.
+"""
+
+import io
+import struct
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+
+SEGMENT_SUFFIX: str = '.seg'
+SEGMENT_MAGIC: bytes = b'APLSEG1\n'
+INDEX_MAGIC: bytes = b'APLSEGIX'
+
+INDEX_ENTRY = struct.Struct('<QIH')  # offset, length, name length
+FOOTER = struct.Struct('<QI8s')  # index offset, record count, index magic
+
+
+class SegmentWriter:
+    """
+    Append records to a segment file and write its index on close
+
+    Attributes:
+        path (Optional[str]): path of the segment file, None when writing to a file object
+        count (int): number of records appended
+    """
+    def __init__(self, target: Union[str, BinaryIO]) -> None:
+        self.path: Optional[str] = target if isinstance(target, str) else None
+        self._owns_file: bool = self.path is not None
+        self._file: BinaryIO = open(target, 'wb') if self._owns_file else target
+        self._closed: bool = False
+        self._file.write(SEGMENT_MAGIC)
+        self._offset: int = len(SEGMENT_MAGIC)
+        self._index: List[Tuple[int, int, bytes]] = []
+
+    @property
+    def count(self) -> int:
+        return len(self._index)
+
+    def append(self, name: str, payload: Union[str, bytes]) -> None:
+        """
+        Append a record to the segment
+
+        Args:
+            name (str): name of the record, the file name in per-file mode
+            payload (Union[str, bytes]): content of the record
+        """
+        data = payload.encode() if isinstance(payload, str) else payload
+        self._file.write(data)
+        self._index.append((self._offset, len(data), name.encode()))
+        self._offset += len(data)
+
+    def close(self) -> None:
+        """Write the offset index and the footer, then close the file if the writer opened it"""
+        if self._closed:
+            return
+        self._closed = True
+        index = bytearray()
+        for offset, length, name in self._index:
+            index += INDEX_ENTRY.pack(offset, length, len(name))
+            index += name
+        self._file.write(bytes(index))
+        self._file.write(FOOTER.pack(self._offset, len(self._index), INDEX_MAGIC))
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self) -> 'SegmentWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def write_segment(path: str, records: List[Tuple[str, Union[str, bytes]]]) -> int:
+    """
+    Write every record to a new segment file
+
+    Args:
+        path (str): path of the segment file
+        records (List): (name, payload) pairs
+
+    Returns:
+        int: number of records written
+    """
+    with SegmentWriter(path) as writer:
+        for name, payload in records:
+            writer.append(name, payload)
+        return writer.count
+
+
+def encode_segment(records: List[Tuple[str, Union[str, bytes]]]) -> bytes:
+    """
+    Encode every record as the content of a segment file
+
+    Args:
+        records (List): (name, payload) pairs
+
+    Returns:
+        bytes: content of the segment file
+    """
+    buffer = io.BytesIO()
+    with SegmentWriter(buffer) as writer:
+        for name, payload in records:
+            writer.append(name, payload)
+    return buffer.getvalue()
+
+
+def iter_segment_data(data: bytes) -> Iterator[Tuple[str, bytes]]:
+    """
+    Iterate over the records of an in-memory segment
+
+    Args:
+        data (bytes): whole content of a segment file
+
+    Yields:
+        Tuple[str, bytes]: name and payload of each record
+
+    Raises:
+        ValueError: if the data is not a complete segment
+    """
+    if not data.startswith(SEGMENT_MAGIC) or len(data) < len(SEGMENT_MAGIC) + FOOTER.size:
+        raise ValueError("Invalid segment header")
+    index_offset, count, magic = FOOTER.unpack_from(data, len(data) - FOOTER.size)
+    if magic != INDEX_MAGIC:
+        raise ValueError("Invalid segment footer")
+
+    view = memoryview(data)
+    position = index_offset
+    for _ in range(count):
+        offset, length, name_length = INDEX_ENTRY.unpack_from(data, position)
+        position += INDEX_ENTRY.size
+        name = bytes(view[position:position + name_length]).decode()
+        position += name_length
+        yield name, bytes(view[offset:offset + length])
+
+
+def read_segment(path: str) -> Iterator[Tuple[str, bytes]]:
+    """
+    Iterate over the records of a segment file
+
+    Args:
+        path (str): path of the segment file
+
+    Yields:
+        Tuple[str, bytes]: name and payload of each record
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+    yield from iter_segment_data(data)
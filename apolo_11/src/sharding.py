@@ -0,0 +1,207 @@
+"""
+Multi-process sharded generation for the Apollo 11 system.
+
+The parent process owns the cycle numbering and the cycle directory.
+Each cycle's file-number range is split into contiguous, disjoint
+slices, one per shard, and generated by a pool of worker processes
+writing into the same staging directory, so file names never collide.
+The parent publishes the cycle once every shard is done.
+A device fleet stays in the parent, which draws the devices of the
+whole cycle and sends each shard the slice of its range.
+Per-shard counts and files are merged into a single cycle summary and
+manifest.
+"""
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .generator import CycleSummary, Generator
+from .logging_config import get_logger, init_worker_logging
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class ShardTask:
+    """Work of one shard in a cycle
+
+    Attributes:
+        shard (int): shard index
+        seed (np.random.SeedSequence): seed of the shard stream for this cycle
+        output_directory (str): directory of the cycle
+        start_number (int): first file number of the shard
+        count (int): number of files of the shard
+        output_mode (str): output mode of the generator
+        compression (str): compression codec of the generator
+        durability (str): durability policy of the generator
+        devices (Optional[Tuple]): index arrays drawn from the parent fleet, if any
+    """
+    shard: int
+    seed: np.random.SeedSequence
+    output_directory: str
+    start_number: int
+    count: int
+    output_mode: str
+    compression: str = 'none'
+    durability: str = 'none'
+    devices: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+
+@dataclass
+class ShardResult:
+    """Counts produced by one shard
+
+    Attributes:
+        shard (int): shard index
+        files_count (int): number of files generated by the shard
+        status_counts (Dict[str, int]): number of records by device status
+        files (List[Tuple[str, int]]): name and record count of each file written by the shard
+    """
+    shard: int
+    files_count: int
+    status_counts: Dict[str, int]
+    files: List[Tuple[str, int]] = field(default_factory=list)
+
+
+_worker_generators: Dict[Tuple[str, str, str], Generator] = {}
+
+
+def generate_shard(task: ShardTask) -> ShardResult:
+    """
+    Generate and write the file-number range of a shard
+
+    Runs in a worker process, which keeps one Generator per output mode, codec and durability.
+
+    Args:
+        task (ShardTask): work of the shard
+
+    Returns:
+        ShardResult: counts produced by the shard
+    """
+    key = (task.output_mode, task.compression, task.durability)
+    shard_generator = _worker_generators.get(key)
+    if shard_generator is None:
+        shard_generator = Generator(writer_workers=1, output_mode=task.output_mode, compression=task.compression,
+                                    durability=task.durability)
+        _worker_generators[key] = shard_generator
+    shard_generator.rng = np.random.Generator(np.random.PCG64(task.seed))
+
+    batch = shard_generator.generate_batch(task.count, start_number=task.start_number, devices=task.devices)
+    shard_generator.write_batch(task.output_directory, batch)
+    return ShardResult(task.shard, len(batch), shard_generator.count_statuses(batch),
+                       shard_generator.written_files(batch))
+
+
+def split_range(total: int, shards: int, start_number: int = 1) -> List[Tuple[int, int]]:
+    """
+    Split total file numbers into contiguous, disjoint ranges
+
+    Args:
+        total (int): number of files of the cycle
+        shards (int): number of shards
+        start_number (int): first file number of the cycle
+
+    Returns:
+        List[Tuple[int, int]]: (start_number, count) of each non-empty shard
+    """
+    base, extra = divmod(total, shards)
+    ranges: List[Tuple[int, int]] = []
+    number = start_number
+    for shard in range(shards):
+        count = base + (1 if shard < extra else 0)
+        if count:
+            ranges.append((number, count))
+        number += count
+    return ranges
+
+
+def merge_shard_results(cycle: int, directory: str, results: Sequence[ShardResult]) -> CycleSummary:
+    """
+    Merge per-shard counts into one cycle summary
+
+    Returns:
+        CycleSummary: summary of the whole cycle
+    """
+    status_counts: Counter = Counter()
+    for result in results:
+        status_counts.update(result.status_counts)
+    return CycleSummary(cycle, directory, sum(result.files_count for result in results), dict(status_counts))
+
+
+class ShardedGenerator(Generator):
+    """Generate each cycle with a pool of worker processes
+
+    Attributes:
+        shards (int): number of worker processes
+        seed_sequence (np.random.SeedSequence): root of the per-shard streams
+    """
+    def __init__(self, shards: int, seed: Optional[int] = None, **kwargs) -> None:
+        if shards < 1:
+            raise ValueError(f"Shards must be at least 1: {shards}")
+        super().__init__(seed=seed, **kwargs)
+        self.shards: int = shards
+        self.seed_sequence: np.random.SeedSequence = np.random.SeedSequence(seed)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def shard_seed(self, cycle: int, shard: int) -> np.random.SeedSequence:
+        """Independent, reproducible seed of a shard stream for a cycle"""
+        return np.random.SeedSequence(self.seed_sequence.entropy, spawn_key=(cycle, shard))
+
+    def generate_files(self, num_files_min: int, num_files_max: int) -> Optional[CycleSummary]:
+        """Generate the files of a cycle across the shard processes
+
+        Args:
+            num_files_min (int): Minimum number of files to generate
+            num_files_max (int): Maximum number of files to generate
+
+        Returns:
+            Optional[CycleSummary]: merged summary of the cycle, None if interrupted
+        """
+        try:
+            cycle: int = self.cycle_store.next()
+            self.generate_files_call_count = cycle
+            times_stamp: str = datetime.now().strftime('%Y%m%d%H%M%S')
+            output_directory: str = self.create_output_directory(times_stamp, cycle)
+
+            total: int = int(self.rng.integers(num_files_min, num_files_max, endpoint=True))
+            devices = None
+            if self.fleet is not None:
+                self.fleet.advance(cycle)
+                devices = self.fleet.sample(total)
+
+            tasks = []
+            for shard, (start_number, count) in enumerate(split_range(total, self.shards)):
+                shard_devices = None
+                if devices is not None:
+                    offset = start_number - 1
+                    shard_devices = tuple(indices[offset:offset + count] for indices in devices)
+                tasks.append(ShardTask(shard, self.shard_seed(cycle, shard), output_directory,
+                                       start_number, count, self.output_mode, self.codec.name,
+                                       self.durability, shard_devices))
+
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.shards, initializer=init_worker_logging)
+            results = list(self._executor.map(generate_shard, tasks))
+            summary = merge_shard_results(cycle, output_directory, results)
+            self.write_cycle_manifest(output_directory, cycle, [file for result in results for file in result.files],
+                                      summary.status_counts)
+            summary.directory = self.publish_output_directory(output_directory)
+
+            logger.info("Ciclo %d generado por %d shards: %d archivos.", cycle, len(results), summary.files_count)
+            return summary
+
+        except KeyboardInterrupt:
+            logger.info("Generación de archivos interrumpida por teclado.")
+            return None
+
+    def close(self) -> None:
+        """Shut down the shard processes and release the generator resources"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        super().close()
@@ -0,0 +1,139 @@
+"""
+Machine-readable stats output for the Apollo 11 reporter.
+
+Next to the prose report, every run can write its stats as JSON and as
+CSV, each built in memory and written with a single call; both hold the
+running totals of the reporter. Every run also appends to a CSV time
+series what it counted since the previous run, in long format: one row
+per mission, device type and status that changed. The trend of any
+count is read from one file, without differencing consecutive rows,
+and a run only costs the rows of the cells it touched.
+"""
+
+import csv
+import io
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .logging_config import get_logger
+from .status_counts import UNKNOWN
+
+logger = get_logger(__name__)
+
+STATS_FORMATS: Tuple[str, ...] = ('log', 'json', 'csv')
+STATS_CSV_HEADER: Tuple[str, ...] = ('mission', 'device_type', 'status', 'count')
+TIME_SERIES_HEADER: Tuple[str, ...] = ('timestamp',) + STATS_CSV_HEADER
+
+Reports = Sequence[Tuple[Tuple[str, str], Dict[str, int]]]
+Cells = Dict[Tuple[str, str, str], int]
+
+
+def operational_percentage(statuses: Dict[str, int]) -> float:
+    """Percentage of the records of a mission and device type whose status is known"""
+    total = sum(statuses.values())
+    return (total - statuses.get(UNKNOWN, 0)) / total * 100 if total else 0.0
+
+
+def stats_json(reports: Reports, records_processed: int, timestamp: float,
+               windows: Optional[Dict[str, dict]] = None) -> str:
+    """
+    Encode the stats of a run as JSON
+
+    Args:
+        reports (Reports): status counts by mission and device type
+        records_processed (int): number of records processed
+        timestamp (float): time of the run, in seconds since the epoch
+        windows (Optional[Dict[str, dict]]): summary of each rolling window by name
+
+    Returns:
+        str: the JSON document
+    """
+    return json.dumps({
+        'timestamp': timestamp,
+        'records_processed': records_processed,
+        'inoperable_devices': sum(1 for _, statuses in reports if UNKNOWN in statuses),
+        'devices': [{
+            'mission': mission,
+            'device_type': device_type,
+            'statuses': statuses,
+            'disconnections': statuses.get(UNKNOWN, 0),
+            'operational_percentage': round(operational_percentage(statuses), 2),
+        } for (mission, device_type), statuses in reports],
+        'windows': windows or {},
+    }, ensure_ascii=False, separators=(',', ':'))
+
+
+def stats_csv(reports: Reports) -> str:
+    """Encode the stats of a run as CSV, one row per mission, device type and status"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(STATS_CSV_HEADER)
+    writer.writerows((mission, device_type, status, count)
+                     for (mission, device_type), statuses in reports for status, count in statuses.items())
+    return buffer.getvalue()
+
+
+def count_cells(reports: Reports) -> Cells:
+    """Count of every mission, device type and status with records"""
+    return {(mission, device_type, status): count
+            for (mission, device_type), statuses in reports for status, count in statuses.items()}
+
+
+def append_time_series(path: str, timestamp: float, cells: Cells, previous: Cells) -> int:
+    """
+    Append the counts of a run to the time series
+
+    Only the cells that changed since the previous run are written, with
+    the count added in between. The rows are written with a single append,
+    so concurrent runs never interleave them. A series written with other
+    columns is renamed aside and a new one started.
+
+    Args:
+        path (str): CSV file of the time series
+        timestamp (float): time of the run, in seconds since the epoch
+        cells (Cells): running counts of the reporter
+        previous (Cells): running counts at the previous run
+
+    Returns:
+        int: number of rows appended
+    """
+    header = ','.join(TIME_SERIES_HEADER) + '\n'
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as file:
+            current = file.readline()
+    except FileNotFoundError:
+        current = ''
+    if current and current != header:
+        rotated = f"{os.path.splitext(path)[0]}-{int(timestamp)}.csv"
+        os.replace(path, rotated)
+        logger.warning("Serie temporal con otras columnas, se movió a %s.", rotated)
+        current = ''
+
+    rows = [(round(timestamp, 3), *key, count - previous.get(key, 0))
+            for key, count in cells.items() if count != previous.get(key, 0)]
+    buffer = io.StringIO()
+    if not current:
+        buffer.write(header)
+    csv.writer(buffer, lineterminator='\n').writerows(rows)
+    if buffer.tell():
+        with open(path, 'a', encoding='utf-8', newline='') as file:
+            file.write(buffer.getvalue())
+    return len(rows)
+
+
+def read_time_series(path: str) -> List[Tuple[float, str, str, str, int]]:
+    """
+    Read the time series
+
+    Args:
+        path (str): CSV file of the time series
+
+    Returns:
+        List[Tuple[float, str, str, str, int]]: timestamp, mission, device type, status and count added of each row
+    """
+    with open(path, 'r', encoding='utf-8', newline='') as file:
+        reader = csv.reader(file)
+        next(reader)
+        return [(float(timestamp), mission, device_type, status, int(count))
+                for timestamp, mission, device_type, status, count in reader]
@@ -0,0 +1,107 @@
+"""
+Constant-memory device status counts for the Apollo 11 reporter.
+
+Counts live in one dense integer array indexed by mission, device type
+and device status, so memory depends on the size of the vocabularies
+and not on the number of records processed. Names outside the
+configured vocabularies, such as a mission written by another
+configuration, go to a small overflow counter instead.
+"""
+
+from collections import Counter
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+UNKNOWN: str = 'unknown'
+
+
+def _with_unknown(names: List[str]) -> List[str]:
+    return list(names) if UNKNOWN in names else list(names) + [UNKNOWN]
+
+
+class StatusCounts(Mapping):
+    """
+    Number of records of each device status by mission and device type
+
+    Reads like a mapping from (mission, device type) to a dict of the
+    non-zero status counts of the pair.
+
+    Attributes:
+        mission_names (List[str]): missions, indexed by the first axis of counts
+        device_types (List[str]): device types and 'unknown', indexed by the second axis
+        device_statuses (List[str]): device statuses and 'unknown', indexed by the third axis
+        counts (np.ndarray): records by mission, device type and device status
+        overflow (Counter): records whose mission, device type or status is outside the vocabularies
+    """
+    def __init__(self, mission_names: List[str], device_types: List[str], device_statuses: List[str]) -> None:
+        self.mission_names: List[str] = list(mission_names)
+        self.device_types: List[str] = _with_unknown(device_types)
+        self.device_statuses: List[str] = _with_unknown(device_statuses)
+        self.counts: np.ndarray = np.zeros(
+            (len(self.mission_names), len(self.device_types), len(self.device_statuses)), dtype=np.int64)
+        self.overflow: Counter = Counter()
+        self._missions: Dict[str, int] = {name: index for index, name in enumerate(self.mission_names)}
+        self._types: Dict[str, int] = {name: index for index, name in enumerate(self.device_types)}
+        self._statuses: Dict[str, int] = {name: index for index, name in enumerate(self.device_statuses)}
+
+    def add(self, mission_name: str, device_type: str, device_status: str, count: int = 1) -> None:
+        """Count records of a mission, device type and device status"""
+        try:
+            index = (self._missions[mission_name], self._types[device_type], self._statuses[device_status])
+        except KeyError:
+            self.overflow[(mission_name, device_type, device_status)] += count
+            return
+        self.counts[index] += count
+
+    def merge(self, other: 'StatusCounts') -> None:
+        """Add the counts of another instance"""
+        if other.same_vocabularies(self):
+            self.counts += other.counts
+        else:
+            for (mission_name, device_type), statuses in other.dense_items():
+                for device_status, count in statuses.items():
+                    self.add(mission_name, device_type, device_status, count)
+        for (mission_name, device_type, device_status), count in other.overflow.items():
+            self.add(mission_name, device_type, device_status, count)
+
+    def same_vocabularies(self, other: 'StatusCounts') -> bool:
+        """Whether both instances index their counts the same way"""
+        return (self.mission_names, self.device_types, self.device_statuses) == \
+            (other.mission_names, other.device_types, other.device_statuses)
+
+    def total(self) -> int:
+        """Number of records counted"""
+        return int(self.counts.sum()) + sum(self.overflow.values())
+
+    def dense_items(self) -> Iterator[Tuple[Tuple[str, str], Dict[str, int]]]:
+        """Non-zero status counts of the pairs held in the dense array, overflow excluded"""
+        for mission, device_type in np.argwhere(self.counts.any(axis=2)).tolist():
+            row = self.counts[mission, device_type].tolist()
+            yield (self.mission_names[mission], self.device_types[device_type]), \
+                {status: count for status, count in zip(self.device_statuses, row) if count}
+
+    def _overflow_keys(self) -> Dict[Tuple[str, str], None]:
+        return dict.fromkeys((mission_name, device_type) for mission_name, device_type, _ in self.overflow)
+
+    def __getitem__(self, key: Tuple[str, str]) -> Dict[str, int]:
+        mission_name, device_type = key
+        statuses: Dict[str, int] = {}
+        if mission_name in self._missions and device_type in self._types:
+            row = self.counts[self._missions[mission_name], self._types[device_type]].tolist()
+            statuses = {status: count for status, count in zip(self.device_statuses, row) if count}
+        for (overflow_mission, overflow_type, device_status), count in self.overflow.items():
+            if (overflow_mission, overflow_type) == key and count:
+                statuses[device_status] = statuses.get(device_status, 0) + count
+        if not statuses:
+            raise KeyError(key)
+        return statuses
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        dense_keys = [key for key, _ in self.dense_items()]
+        yield from dense_keys
+        yield from (key for key in self._overflow_keys() if key not in dense_keys)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
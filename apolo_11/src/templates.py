@@ -0,0 +1,145 @@
+"""
+Precompiled content templates for the Apollo 11 generator.
+
+Every known record is fully determined by its date and its (mission,
+device type, device status) combination, so the constant part of each
+combination is encoded once and the rendered bytes are reused for as
+long as the formatted date stays the same.
+"""
+
+from datetime import datetime
+from typing import Callable, Dict, List
+
+import numpy as np
+
+
+class ClockCache:
+    """
+    Format the current time once per second
+
+    Attributes:
+        date_format (str): strftime format of the record dates
+    """
+    def __init__(self, date_format: str, clock: Callable[[], datetime] = datetime.now) -> None:
+        self.date_format: str = date_format
+        self._clock: Callable[[], datetime] = clock
+        self._second = None
+        self._formatted: str = ''
+
+    def now(self) -> str:
+        """
+        Current time formatted with date_format
+
+        Returns:
+            str: formatted date, recomputed only when the second changes
+        """
+        current = self._clock()
+        second = current.replace(microsecond=0)
+        if second != self._second:
+            self._second = second
+            self._formatted = current.strftime(self.date_format)
+        return self._formatted
+
+
+class ContentTemplates:
+    """
+    Byte templates of every (mission, device type, device status) combination
+
+    Attributes:
+        mission_names (List[str]): mission names, indexed by mission index
+        device_types (List[str]): device types, indexed by type index
+        device_statuses (List[str]): device statuses, indexed by status index
+    """
+    def __init__(self, mission_names: List[str], device_types: List[str], device_statuses: List[str]) -> None:
+        self.mission_names: List[str] = list(mission_names)
+        self.device_types: List[str] = list(device_types)
+        self.device_statuses: List[str] = list(device_statuses)
+        self._bodies: List[bytes] = [
+            f"\nMission: {mission}\nDevice Type: {device_type}\nDevice Status: {status}\nHash: ".encode()
+            for mission in self.mission_names
+            for device_type in self.device_types
+            for status in self.device_statuses
+        ]
+        self._unknown_bodies: List[bytes] = [
+            f"\nMission: {mission}\nDevice Type: unknown\nDevice Status: unknown\nHash: unknown\nID: ".encode()
+            for mission in self.mission_names
+        ]
+        self._date: str = ''
+        self._date_prefix: bytes = b''
+        self._rendered: Dict[int, bytes] = {}
+
+    def matches(self, mission_names: List[str], device_types: List[str], device_statuses: List[str]) -> bool:
+        """Whether the templates were built for these names"""
+        return (self.mission_names, self.device_types, self.device_statuses) == \
+            (mission_names, device_types, device_statuses)
+
+    def combo(self, mission: int, device_type: int, status: int) -> int:
+        """Index of a (mission, device type, device status) combination"""
+        return (mission * len(self.device_types) + device_type) * len(self.device_statuses) + status
+
+    def _set_date(self, current_date: str) -> None:
+        if current_date != self._date:
+            self._date = current_date
+            self._date_prefix = f"Date: {current_date}".encode()
+            self._rendered = {}
+
+    def _render_combo(self, combo: int, hash_value: int) -> bytes:
+        content = self._rendered.get(combo)
+        if content is None:
+            content = self._date_prefix + self._bodies[combo] + str(hash_value).encode()
+            self._rendered[combo] = content
+        return content
+
+    def render(self, current_date: str, mission: int, device_type: int, status: int, hash_value: int) -> bytes:
+        """
+        Render a known record
+
+        Returns:
+            bytes: content of the record
+        """
+        self._set_date(current_date)
+        return self._render_combo(self.combo(mission, device_type, status), hash_value)
+
+    def render_unknown(self, current_date: str, mission: int, unique_id: str) -> bytes:
+        """
+        Render a record of an unknown mission
+
+        Returns:
+            bytes: content of the record
+        """
+        self._set_date(current_date)
+        return self._date_prefix + self._unknown_bodies[mission] + unique_id.encode()
+
+    def render_batch(self, current_date: str, mission_idx: np.ndarray, type_idx: np.ndarray,
+                     status_idx: np.ndarray, hash_values: np.ndarray, unique_ids: Dict[int, str]) -> List[bytes]:
+        """
+        Render every record of a batch
+
+        Each distinct combination of the batch is rendered once and shared
+        by all its records, since records with the same date and
+        combination have the same hash. Records with a negative type index
+        are rendered as unknown mission records with the unique id of
+        their batch position.
+
+        Returns:
+            List[bytes]: content of each record
+        """
+        self._set_date(current_date)
+        contents = np.empty(len(mission_idx), dtype=object)
+
+        known = type_idx >= 0
+        if known.any():
+            mission_types = mission_idx[known].astype(np.int64) * len(self.device_types) + type_idx[known]
+            combos = mission_types * len(self.device_statuses) + status_idx[known]
+            unique_combos, first, inverse = np.unique(combos, return_index=True, return_inverse=True)
+            first_hashes = hash_values[known][first]
+            rendered = np.empty(len(unique_combos), dtype=object)
+            for position, (combo, hash_value) in enumerate(zip(unique_combos.tolist(), first_hashes.tolist())):
+                rendered[position] = self._render_combo(combo, hash_value)
+            contents[known] = rendered[inverse]
+
+        for position in np.flatnonzero(~known).tolist():
+            contents[position] = self._date_prefix + self._unknown_bodies[mission_idx[position]] + \
+                unique_ids[position].encode()
+
+        return contents.tolist()
@@ -0,0 +1,174 @@
+"""
+Published cycle watchers for the Apollo 11 reporter daemon.
+
+A watcher reports the cycle directories published in the devices
+directory, that is renamed to their -noreport name. On Linux it is
+driven by inotify through ctypes, so a publication is seen as soon as
+the rename happens; elsewhere, or when inotify is unavailable, it
+lists the devices directory with os.scandir at a fixed interval.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from typing import List, Set
+
+from .logging_config import get_logger
+from .publish import PUBLISHED_SUFFIX, is_staging
+
+logger = get_logger(__name__)
+
+WATCHERS = ('auto', 'inotify', 'poll')
+
+IN_CREATE: int = 0x00000100
+IN_MOVED_TO: int = 0x00000080
+IN_Q_OVERFLOW: int = 0x00004000
+IN_ISDIR: int = 0x40000000
+IN_NONBLOCK: int = 0o4000
+IN_CLOEXEC: int = 0o2000000
+
+EVENT_HEADER = struct.Struct('iIII')
+EVENT_BUFFER_SIZE: int = 64 * 1024
+
+
+def is_published(name: str) -> bool:
+    """Whether a directory name is a published cycle"""
+    return name.endswith(PUBLISHED_SUFFIX) and not is_staging(name)
+
+
+def list_published(directory: str) -> List[str]:
+    """Names of the published cycle directories, from a single listing without stat calls"""
+    with os.scandir(directory) as entries:
+        return [entry.name for entry in entries if is_published(entry.name) and entry.is_dir(follow_symlinks=False)]
+
+
+class PollingWatcher:
+    """
+    Watch a directory by listing it at a fixed interval
+
+    Attributes:
+        directory (str): directory the cycles are published in
+        poll_interval (float): seconds between two listings
+    """
+    def __init__(self, directory: str, poll_interval: float = 0.5) -> None:
+        self.directory: str = directory
+        self.poll_interval: float = poll_interval
+        self._seen: Set[str] = set()
+
+    def wait(self, timeout: float) -> List[str]:
+        """
+        Wait until cycles are published or the timeout expires
+
+        Args:
+            timeout (float): maximum seconds to wait
+
+        Returns:
+            List[str]: names of the cycles published since the previous call
+        """
+        deadline = time.monotonic() + max(timeout, 0)
+        while True:
+            current = set(list_published(self.directory))
+            # Cycles moved away are forgotten, so the set stays as small as the directory
+            new = sorted(current - self._seen)
+            self._seen = current
+            remaining = deadline - time.monotonic()
+            if new or remaining <= 0:
+                return new
+            time.sleep(min(self.poll_interval, remaining))
+
+    def close(self) -> None:
+        """Release the watcher"""
+
+
+class InotifyWatcher:
+    """
+    Watch a directory with Linux inotify, through ctypes
+
+    Attributes:
+        directory (str): directory the cycles are published in
+    """
+    def __init__(self, directory: str) -> None:
+        if not sys.platform.startswith('linux'):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.directory: str = directory
+        self._fd: int = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code))
+        # Publication is a rename into the directory, IN_CREATE covers cycles copied in
+        if libc.inotify_add_watch(self._fd, os.fsencode(directory), IN_MOVED_TO | IN_CREATE) < 0:
+            code = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(code, os.strerror(code), directory)
+
+    def wait(self, timeout: float) -> List[str]:
+        """
+        Wait until cycles are published or the timeout expires
+
+        Args:
+            timeout (float): maximum seconds to wait
+
+        Returns:
+            List[str]: names of the cycles published since the previous call
+        """
+        readable, _, _ = select.select([self._fd], [], [], max(timeout, 0))
+        if not readable:
+            return []
+        try:
+            data = os.read(self._fd, EVENT_BUFFER_SIZE)
+        except BlockingIOError:
+            return []
+
+        names: List[str] = []
+        offset = 0
+        while offset < len(data):
+            _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                logger.warning("Cola de inotify desbordada, se lista %s.", self.directory)
+                return list_published(self.directory)
+            if mask & IN_ISDIR and is_published(name):
+                names.append(name)
+        return names
+
+    def close(self) -> None:
+        """Release the inotify descriptor"""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(directory: str, watcher: str = 'auto', poll_interval: float = 0.5):
+    """
+    Create the watcher of a devices directory
+
+    Args:
+        directory (str): directory the cycles are published in
+        watcher (str): 'inotify', 'poll', or 'auto' for inotify with a polling fallback
+        poll_interval (float): seconds between two listings of the polling watcher
+
+    Returns:
+        InotifyWatcher or PollingWatcher: the watcher
+
+    Raises:
+        ValueError: if the watcher is unknown
+        OSError: if inotify was requested and is not available
+    """
+    if watcher not in WATCHERS:
+        raise ValueError(f"Unknown watcher: {watcher}")
+    if watcher != 'poll':
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError) as e:
+            if watcher == 'inotify':
+                raise
+            logger.info("inotify no disponible (%s), se listará %s cada %.2f s.", str(e), directory, poll_interval)
+    return PollingWatcher(directory, poll_interval)
@@ -0,0 +1,42 @@
+"""
+Benchmark the compression codecs on a cycle of generated records.
+
+Compares the CPU cost of each codec against the bytes it writes, both
+for one file per record and for a whole-cycle segment.
+
+Run from the repository root:
+    python -m benchmarks.bench_compression
+"""
+
+from apolo_11.src.compression import available_codecs, decompress, get_codec
+from apolo_11.src.generator import Generator
+from apolo_11.src.segment import encode_segment
+
+from .common import best_of, report
+
+RECORDS: int = 20_000
+
+
+def main() -> None:
+    generator = Generator(seed=0)
+    records = list(generator.iter_batch_files(generator.generate_batch(RECORDS)))
+    contents = [content for _, content in records]
+    segment = encode_segment(records)
+    raw_files = sum(len(content) for content in contents)
+
+    for name in available_codecs():
+        codec = get_codec(name)
+        files = [codec.compress(content, None) for content in contents]
+        packed = codec.compress(segment, None)
+
+        report(f'{name} per-file compress', best_of(lambda: [codec.compress(c, None) for c in contents], 1),
+               RECORDS)
+        report(f'{name} per-file decompress', best_of(lambda: [decompress(f) for f in files], 3), RECORDS)
+        report(f'{name} segment compress', best_of(lambda: codec.compress(segment, None), 3), RECORDS)
+        report(f'{name} segment decompress', best_of(lambda: decompress(packed), 3), RECORDS)
+        print(f"{name:<8} per-file bytes {sum(map(len, files)):>12,} ({sum(map(len, files)) / raw_files:6.1%})"
+              f"   segment bytes {len(packed):>12,} ({len(packed) / len(segment):6.1%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmark the durability policies of cycle publication.
+
+Writes and publishes the same cycle under each policy in a temporary
+directory next to the results, so the numbers reflect the results disk.
+
+Run from the repository root:
+    python -m benchmarks.bench_durability
+"""
+
+import os
+import shutil
+import tempfile
+
+from apolo_11.src.generator import Generator
+from apolo_11.src.publish import DURABILITY_POLICIES, create_staging_directory
+
+from .common import best_of, report
+
+RECORDS: int = 2_000
+
+
+def main() -> None:
+    results = os.path.join('apolo_11', 'results')
+    os.makedirs(results, exist_ok=True)
+    parent = tempfile.mkdtemp(prefix='bench-durability-', dir=results)
+    try:
+        for output_mode in ('files', 'segment'):
+            for durability in DURABILITY_POLICIES:
+                generator = Generator(seed=0, output_mode=output_mode, durability=durability)
+                batch = generator.generate_batch(RECORDS)
+                cycles = iter(range(1_000_000))
+
+                def publish_cycle():
+                    staging = create_staging_directory(parent, f'cycle-{next(cycles)}')
+                    generator.write_batch(staging, batch)
+                    shutil.rmtree(generator.publish_output_directory(staging))
+
+                report(f'{output_mode} {durability}', best_of(publish_cycle, 3), RECORDS)
+                generator.writer.close()
+    finally:
+        shutil.rmtree(parent)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""
+Benchmark rendering of generated records.
+
+Run from the repository root:
+    python -m benchmarks.bench_generation
+"""
+
+from apolo_11.src.generator import CustomContent, DefaultContent, Generator
+
+from .common import best_of, report
+
+RECORDS: int = 100_000
+
+
+def main() -> None:
+    generator = Generator(seed=0)
+    batch = generator.generate_batch(RECORDS)
+    missions = generator.mission_instance.name
+    types = generator.device_instance.type
+    statuses = generator.device_instance.status
+    records = list(zip(batch.mission_idx.tolist(), batch.type_idx.tolist(),
+                       batch.status_idx.tolist(), batch.hash_values.tolist()))
+
+    def dataclass_render():
+        for position, (m, t, s, hash_value) in enumerate(records):
+            if t < 0:
+                content = CustomContent(batch.current_date, missions[m], 'unknown', 'unknown', 'unknown',
+                                        batch.unique_ids[position]).generate_content_string()
+            else:
+                content = DefaultContent(batch.current_date, missions[m], types[t], statuses[s],
+                                         hash_value).generate_content_string()
+            content.encode()
+
+    def template_render():
+        for _ in generator.iter_batch_files(batch):
+            pass
+
+    report('dataclass f-string + encode', best_of(dataclass_render), RECORDS)
+    report('iter_batch_files (templates)', best_of(template_render), RECORDS)
+    report('generate_batch', best_of(lambda: generator.generate_batch(RECORDS)), RECORDS)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark record hashing and the overhead of hash verification.
+
+Run from the repository root:
+    python -m benchmarks.bench_hashing
+"""
+
+import os
+from tempfile import TemporaryDirectory
+
+from apolo_11.src.generator import Generator
+from apolo_11.src.hashing import hash_batch, stable_hash
+from apolo_11.src.reporter import Reporter
+
+from .common import best_of, report
+
+RECORDS: int = 100_000
+FILES: int = 5_000
+
+
+def bench_generation_hashing(generator: Generator) -> None:
+    batch = generator.generate_batch(RECORDS)
+    missions = generator.mission_instance.name
+    types = generator.device_instance.type
+    statuses = generator.device_instance.status
+    records = list(zip(batch.mission_idx.tolist(), batch.type_idx.tolist(), batch.status_idx.tolist()))
+
+    def builtin_per_record():
+        for m, t, s in records:
+            hash(''.join((batch.current_date, missions[m], types[t], statuses[s])))
+
+    def blake2b_per_record():
+        for m, t, s in records:
+            stable_hash(batch.current_date, missions[m], types[t], statuses[s])
+
+    def blake2b_batch():
+        hash_batch(batch.current_date, missions, types, statuses,
+                   batch.mission_idx, batch.type_idx, batch.status_idx)
+
+    report('builtin hash() per record', best_of(builtin_per_record), RECORDS)
+    report('blake2b-64 per record', best_of(blake2b_per_record), RECORDS)
+    report('blake2b-64 hash_batch', best_of(blake2b_batch), RECORDS)
+
+
+def bench_verification(generator: Generator) -> None:
+    with TemporaryDirectory() as tmp_dir:
+        paths = []
+        for filename, content in generator.iter_batch_files(generator.generate_batch(FILES)):
+            path = os.path.join(tmp_dir, filename)
+            with open(path, 'wb') as file:
+                file.write(content)
+            paths.append(path)
+
+        for verify_hash in (False, True):
+            def process():
+                reporter = Reporter(verify_hash=verify_hash)
+                for path in paths:
+                    reporter.process_file(path)
+
+            report(f'Reporter.process_file verify_hash={verify_hash}', best_of(process, 3), FILES)
+
+
+def main() -> None:
+    generator = Generator(seed=0)
+    bench_generation_hashing(generator)
+    bench_verification(generator)
+
+
+if __name__ == '__main__':
+    main()
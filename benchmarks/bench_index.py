@@ -0,0 +1,70 @@
+"""
+Benchmark the SQLite record index of the reporter.
+
+Fills an index with ROWS binary records spread over a month, in the
+batches the reporter commits, and times typical queries on it. Like the
+cycles the reporter reads, every file is dated after the previous one.
+
+Run from the repository root:
+    python -m benchmarks.bench_index
+"""
+
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from apolo_11.src.config import ConfigManager
+from apolo_11.src.record_index import RecordIndex
+from apolo_11.src.records import RecordSchema
+
+from .common import best_of, report
+
+ROWS: int = 10_000_000
+FILE_ROWS: int = 100_000
+DAYS: int = 30
+
+
+def main() -> None:
+    config = ConfigManager.read_yaml_config()
+    schema = RecordSchema(config['missions']['names'], config['devices']['types'], config['devices']['status'],
+                          config['date_format'], uuid_bytes=0)
+    rng = np.random.default_rng(0)
+    now = datetime.now()
+    start = int((now - timedelta(days=DAYS)).timestamp())
+    file_seconds = DAYS * 86400 // (ROWS // FILE_ROWS)
+
+    with tempfile.TemporaryDirectory() as directory:
+        record_index = RecordIndex(os.path.join(directory, 'records.db'), config['date_format'], batch_size=FILE_ROWS)
+        began = time.perf_counter()
+        for file_number in range(ROWS // FILE_ROWS):
+            records = np.zeros(FILE_ROWS, dtype=schema.dtype)
+            file_start = start + file_number * file_seconds
+            records['timestamp'] = np.sort(rng.integers(file_start, file_start + file_seconds, FILE_ROWS))
+            records['mission'] = rng.integers(0, len(schema.mission_names), FILE_ROWS)
+            records['type'] = rng.integers(-1, len(schema.device_types), FILE_ROWS)
+            records['status'] = rng.integers(-1, len(schema.device_statuses), FILE_ROWS)
+            record_index.open_file(f'/backups/cycle-{file_number}-bench/APLREC.rec')
+            record_index.add_records(schema, records)
+        record_index.flush()
+        report(f'insert {ROWS:,} rows', time.perf_counter() - began, ROWS)
+        print(f"database size: {os.path.getsize(os.path.join(directory, 'records.db')) / 1e6:.1f} MB")
+
+        last_week = now - timedelta(days=7)
+        report('count faulty Rovers on VacMars, 7 days',
+               best_of(lambda: record_index.count('VacMars', 'Rover', 'faulty', since=last_week)), 1)
+        report('count faulty Rovers on VacMars, all',
+               best_of(lambda: record_index.count('VacMars', 'Rover', 'faulty')), 1)
+        report('count by status of VacMars, 7 days',
+               best_of(lambda: record_index.count_by('device_status', 'VacMars', since=last_week)), 1)
+        report('count all records, last day',
+               best_of(lambda: record_index.count(since=now - timedelta(days=1))), 1)
+        report('count faulty records, 7 days (no mission)',
+               best_of(lambda: record_index.count(device_status='faulty', since=last_week)), 1)
+        record_index.close()
+
+
+if __name__ == '__main__':
+    main()
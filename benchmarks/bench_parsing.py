@@ -0,0 +1,47 @@
+"""
+Benchmark parsing of text records by the reporter.
+
+Compares the previous split-and-scan extraction, three extract_value
+scans over the decoded lines, with the single-pass bytes parser.
+
+Run from the repository root:
+    python -m benchmarks.bench_parsing
+"""
+
+from apolo_11.src.generator import Generator
+from apolo_11.src.record_parser import parse_lines, parse_record
+from apolo_11.src.reporter import Reporter
+
+from .common import best_of, report
+
+RECORDS: int = 100_000
+
+
+def main() -> None:
+    generator = Generator(seed=0)
+    contents = [content for _, content in generator.iter_batch_files(generator.generate_batch(RECORDS))]
+    reporter = Reporter(verify_hash=False)
+
+    def extract_value_scans():
+        for content in contents:
+            lines = content.decode().split('\n')
+            reporter.extract_value(lines, "Mission")
+            reporter.extract_value(lines, "Device Type")
+            reporter.extract_value(lines, "Device Status")
+
+    def single_pass():
+        for content in contents:
+            parse_record(content)
+
+    def line_path():
+        for content in contents:
+            parse_lines(content)
+
+    report('extract_value x3 (previous)', best_of(extract_value_scans), RECORDS)
+    report('parse_record (single pass)', best_of(single_pass), RECORDS)
+    report('parse_lines (fallback layout)', best_of(line_path), RECORDS)
+    report('Reporter.process_record', best_of(lambda: [reporter.process_record(c) for c in contents], 1), RECORDS)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,21 @@
+"""Helpers shared by the Apollo 11 benchmarks."""
+
+import time
+from typing import Callable
+
+
+def best_of(func: Callable[[], object], repeat: int = 5) -> float:
+    """
+    Run func repeat times and return the best wall time in seconds
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(label: str, seconds: float, count: int) -> None:
+    """Print the total time and the cost per item of a benchmark"""
+    print(f"{label:<40} {seconds * 1000:10.2f} ms {seconds / count * 1e6:10.3f} us/item")
@@ -1,10 +1,20 @@
 import argparse
+import asyncio
 import time
 from contextlib import nullcontext
+from functools import partial
 
 from apolo_11.src import generator, config, reporter
-from apolo_11.src.logging_config import setup_logging
+from apolo_11.src.logging_config import setup_logging, shutdown_logging
+from apolo_11.src.compression import CODECS
+from apolo_11.src.daemon import ReporterDaemon
 from apolo_11.src.dashboard import Dashboard
+from apolo_11.src.fleet import load_fleet
+from apolo_11.src.pacing import Pacer, load_profile
+from apolo_11.src.pipeline import AsyncPipeline
+from apolo_11.src.publish import DURABILITY_POLICIES
+from apolo_11.src.sharding import ShardedGenerator
+from apolo_11.src.watcher import WATCHERS, create_watcher
 
 # Initialize centralized logging
 logger = setup_logging()
@@ -16,32 +26,74 @@ config_data: dict = config_instance.read_yaml_config()
 def _extract_mission_stats(reporter_instance):
     """Extract mission statistics from reporter instance."""
     missions = {}
-    
-    # Extract data from reporter's devices_reports
+
+    # Extract data from reporter's status counts
     for (mission_name, device_type), statuses in reporter_instance.devices_reports.items():
-        if mission_name not in missions:
-            missions[mission_name] = {
-                'device_counts': {},
-                'status_counts': {}
-            }
-        
-        # Count devices by type
-        if device_type in missions[mission_name]['device_counts']:
-            missions[mission_name]['device_counts'][device_type] += len(statuses)
-        else:
-            missions[mission_name]['device_counts'][device_type] = len(statuses)
-        
-        # Count statuses
-        for status in statuses:
-            if status in missions[mission_name]['status_counts']:
-                missions[mission_name]['status_counts'][status] += 1
-            else:
-                missions[mission_name]['status_counts'][status] = 1
-    
+        mission = missions.setdefault(mission_name, {'device_counts': {}, 'status_counts': {}})
+        device_counts = mission['device_counts']
+        device_counts[device_type] = device_counts.get(device_type, 0) + sum(statuses.values())
+        for status, count in statuses.items():
+            mission['status_counts'][status] = mission['status_counts'].get(status, 0) + count
+
     return missions
 
 
-def main():
+def _generate_cycle(generator_instance, args, pacer):
+    """Run one generation cycle, paced by the load profile when one is active.
+
+    Returns:
+        Optional[CycleSummary]: summary of the cycle, None if no files were generated
+    """
+    if pacer is None:
+        return generator_instance.generate_files(
+            num_files_min=args.num_files_min,
+            num_files_max=args.num_files_max,
+        )
+
+    num_files = pacer.files_for_cycle()
+    cycle_summary = generator_instance.generate_files(num_files, num_files) if num_files else None
+    pacer.record(cycle_summary.files_count if cycle_summary else 0)
+    return cycle_summary
+
+
+def _build_pacer(args):
+    """Create the pacer of the selected load profile, None when generation is not paced."""
+    if not args.profile:
+        return None
+    pacing_config = config_data['pacing']
+    return Pacer(load_profile(args.profile, pacing_config['profiles']),
+                 args.generator_interval, pacing_config.get('burst'))
+
+
+def _build_fleet(args):
+    """Build the device fleet requested on the command line, if any."""
+    if args.fleet_size <= 0:
+        return None
+    return load_fleet(config_data.get('fleet', {}), config_data['missions']['names'],
+                      config_data['devices']['types'], config_data['devices']['status'], args.fleet_size)
+
+
+def _next_delay(args, pacer) -> float:
+    """Seconds to wait before the next generation cycle."""
+    return pacer.delay() if pacer else args.generator_interval
+
+
+def _update_dashboard(dashboard_instance, generator_instance, reporter_instance, files_generated) -> None:
+    """Refresh the dashboard with the current generator and reporter statistics."""
+    generator_stats = {
+        'files_count': files_generated,
+        'cycle': generator_instance.generate_files_call_count
+    }
+    reporter_stats = {
+        'missions': _extract_mission_stats(reporter_instance),
+        'last_report_time': reporter_instance.last_report_time,
+        'windows': reporter_instance.window_summary()
+    }
+    dashboard_instance.update_stats(generator_stats, reporter_stats)
+    dashboard_instance.update_display()
+
+
+def _parse_args():
     parser = argparse.ArgumentParser(
         description='Generate files and generate reports for the Apolo 11 mission'
     )
@@ -59,17 +111,151 @@ def main():
                         help='Time interval in seconds for the reporter')
     parser.add_argument('--dashboard', action='store_true',
                         help='Enable dashboard TUI for real-time monitoring')
+    parser.add_argument('--writer_workers', type=int,
+                        default=config_data.get('generator', {}).get('writer_workers', 1),
+                        help='Number of concurrent writers for the files of a cycle')
+    parser.add_argument('--writer_backend', choices=['thread', 'process'],
+                        default=config_data.get('generator', {}).get('writer_backend', 'thread'),
+                        help='Writer pool backend')
+    parser.add_argument('--output_mode', choices=list(generator.OUTPUT_MODES),
+                        default=config_data.get('generator', {}).get('output_mode', 'files'),
+                        help='Write one file per record or one segment file per cycle')
+    parser.add_argument('--compression', choices=list(CODECS),
+                        default=config_data.get('generator', {}).get('compression', 'none'),
+                        help='Compress generated files, segments and record files')
+    parser.add_argument('--durability', choices=list(DURABILITY_POLICIES),
+                        default=config_data.get('generator', {}).get('durability', 'none'),
+                        help='fsync policy applied before a cycle is published')
+    parser.add_argument('--profile', choices=list(config_data.get('pacing', {}).get('profiles', {})),
+                        help='Pace generation with a load profile from config.yaml')
+    parser.add_argument('--shards', type=int,
+                        default=config_data.get('generator', {}).get('shards', 1),
+                        help='Number of generator worker processes per cycle')
+    parser.add_argument('--engine', choices=['sync', 'asyncio', 'daemon'], default='sync',
+                        help='Run generation and reporting in sequence, as overlapping asyncio tasks, '
+                             'or with a reporter daemon ingesting cycles as they are published')
+    daemon_config = config_data.get('reporter', {}).get('daemon', {})
+    parser.add_argument('--debounce', type=float, default=daemon_config.get('debounce', 2.0),
+                        help='Seconds between stats reports of the reporter daemon')
+    parser.add_argument('--watcher', choices=list(WATCHERS), default=daemon_config.get('watcher', 'auto'),
+                        help='How the reporter daemon watches the devices directory')
+    parser.add_argument('--reporter_workers', type=int,
+                        default=config_data.get('reporter', {}).get('workers', 1),
+                        help='Number of processes the reporter splits the files across')
+    parser.add_argument('--checkpoint',
+                        default=config_data.get('reporter', {}).get('checkpoint') or '',
+                        help='Reporter snapshot to warm-start from and save after every run (empty disables)')
+    parser.add_argument('--index',
+                        default=config_data.get('reporter', {}).get('index', {}).get('path') or '',
+                        help='SQLite file every processed record is indexed in (empty disables)')
+    fleet_config = config_data.get('fleet', {})
+    parser.add_argument('--fleet_size', type=int,
+                        default=fleet_config.get('size', 0) if fleet_config.get('enabled') else 0,
+                        help='Draw records from a stateful fleet of this many devices (0 disables)')
+
+    return parser.parse_args()
+
+
+def _run_sync(args, generator_instance, reporter_instance, dashboard_instance, pacer) -> None:
+    """Alternate generation and reporting phases in the main thread."""
+    number_of_generator_iterations = round(int(args.reporter_interval / args.generator_interval))
+    files_generated = 0
+
+    while True:
+        # Generator phase
+        for iteration in range(number_of_generator_iterations):
+            cycle_summary = _generate_cycle(generator_instance, args, pacer)
+            if cycle_summary:
+                files_generated += cycle_summary.files_count
+
+            # Update dashboard stats after each generation
+            if dashboard_instance:
+                _update_dashboard(dashboard_instance, generator_instance, reporter_instance, files_generated)
 
-    args = parser.parse_args()
+            time.sleep(_next_delay(args, pacer))
+
+        # Reporter phase, off the pacing clock so it neither mints files nor misses generation deadlines
+        if pacer:
+            pacer.pause()
+        reporter_instance.process_files(config_data['routes'][1]['devices'],
+                                        config_data['routes'][2]['backups'])
+
+        # Update dashboard stats after reporting
+        if dashboard_instance:
+            _update_dashboard(dashboard_instance, generator_instance, reporter_instance, files_generated)
+
+        time.sleep(args.reporter_interval)
+        if pacer:
+            pacer.resume()
+
+
+def _run_asyncio(args, generator_instance, reporter_instance, dashboard_instance, pacer) -> None:
+    """Run generation, reporting and the dashboard as cooperating asyncio tasks."""
+    pipeline = None
+
+    def update_dashboard():
+        _update_dashboard(dashboard_instance, generator_instance, reporter_instance, pipeline.files_generated)
+
+    pipeline = AsyncPipeline(partial(_generate_cycle, generator_instance, args, pacer),
+                             partial(_next_delay, args, pacer),
+                             reporter_instance, config_data['routes'][2]['backups'], args.reporter_interval,
+                             update_dashboard if dashboard_instance else None)
+    asyncio.run(pipeline.run())
+    logger.info("Pipeline detenido: %d archivos generados, %d ciclos reportados.",
+                pipeline.files_generated, pipeline.cycles_reported)
+
+
+def _run_daemon(args, generator_instance, reporter_instance, dashboard_instance, pacer) -> None:
+    """Generate in the main thread while a reporter daemon ingests every published cycle."""
+    devices_directory = config_data['routes'][1]['devices']
+    poll_interval = config_data.get('reporter', {}).get('daemon', {}).get('poll_interval', 0.5)
+    daemon = ReporterDaemon(reporter_instance, devices_directory, config_data['routes'][2]['backups'], args.debounce,
+                            create_watcher(devices_directory, args.watcher, poll_interval))
+    thread = daemon.start()
+    files_generated = 0
+
+    try:
+        while True:
+            cycle_summary = _generate_cycle(generator_instance, args, pacer)
+            if cycle_summary:
+                files_generated += cycle_summary.files_count
+
+            if dashboard_instance:
+                # The daemon lock keeps the counts still while the dashboard reads them
+                with daemon.lock:
+                    _update_dashboard(dashboard_instance, generator_instance, reporter_instance, files_generated)
+
+            time.sleep(_next_delay(args, pacer))
+    finally:
+        daemon.stop()
+        thread.join()
+
+
+RUNNERS = {'sync': _run_sync, 'asyncio': _run_asyncio, 'daemon': _run_daemon}
+
+
+def main():
+    args = _parse_args()
 
     if args.reporter_interval <= args.generator_interval:
         logger.error("El intervalo de reportes debe ser mayor que el intervalo de generadores.")
         return
 
-    generator_instance = generator.Generator()
+    generator_options = dict(writer_workers=args.writer_workers,
+                             writer_backend=args.writer_backend,
+                             output_mode=args.output_mode,
+                             compression=args.compression,
+                             durability=args.durability,
+                             fleet=_build_fleet(args))
+    if args.shards > 1:
+        generator_instance = ShardedGenerator(args.shards, **generator_options)
+    else:
+        generator_instance = generator.Generator(**generator_options)
     generator_instance.generate_device_folder()
+    generator_instance.discard_interrupted_cycles()
 
-    reporter_instance = reporter.Reporter()
+    reporter_instance = reporter.Reporter(workers=args.reporter_workers, checkpoint_path=args.checkpoint or None,
+                                          index_path=args.index or None)
 
     # Initialize dashboard if requested
     dashboard_instance = None
@@ -78,57 +264,21 @@ def main():
         dashboard_instance = Dashboard()
         live_display = dashboard_instance.start_live_display()
 
-    number_of_generator_iterations = round(int(args.reporter_interval / args.generator_interval))
+    pacer = _build_pacer(args)
+    run = RUNNERS[args.engine]
 
     try:
         with live_display if live_display else nullcontext():
-            while True:
-                # Generator phase
-                for iteration in range(number_of_generator_iterations):
-                    generator_instance.generate_files(
-                        num_files_min=args.num_files_min,
-                        num_files_max=args.num_files_max,
-                    )
-                    
-                    # Update dashboard stats after each generation
-                    if dashboard_instance:
-                        generator_stats = {
-                            'files_count': (iteration + 1) * args.num_files_max,  # Approximate
-                            'cycle': generator_instance.generate_files_call_count
-                        }
-                        reporter_stats = {
-                            'missions': _extract_mission_stats(reporter_instance),
-                            'last_report_time': getattr(reporter_instance, 'last_report_time', None)
-                        }
-                        dashboard_instance.update_stats(generator_stats, reporter_stats)
-                        dashboard_instance.update_display()
-                    
-                    time.sleep(args.generator_interval)
-
-                # Reporter phase
-                reporter_instance.process_files(config_data['routes'][1]['devices'],
-                                                config_data['routes'][2]['backups'])
-                
-                # Update dashboard stats after reporting
-                if dashboard_instance:
-                    from datetime import datetime
-                    generator_stats = {
-                        'files_count': number_of_generator_iterations * args.num_files_max,  # Approximate
-                        'cycle': generator_instance.generate_files_call_count
-                    }
-                    reporter_stats = {
-                        'missions': _extract_mission_stats(reporter_instance),
-                        'last_report_time': datetime.now()
-                    }
-                    dashboard_instance.update_stats(generator_stats, reporter_stats)
-                    dashboard_instance.update_display()
-                
-                time.sleep(args.reporter_interval)
+            run(args, generator_instance, reporter_instance, dashboard_instance, pacer)
 
     except KeyboardInterrupt:
         logger.info("Proceso interrumpido por el usuario.")
+    finally:
         if dashboard_instance:
             dashboard_instance.stop_display()
+        generator_instance.close()
+        reporter_instance.close()
+        shutdown_logging()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,151 @@
+import os
+import shutil
+from unittest.mock import patch
+
+import pytest
+
+from apolo_11.src import backfill
+from apolo_11.src.backfill import Backfill, list_cycles, main
+from apolo_11.src.checkpoint import load_checkpoint
+from apolo_11.src.cycle_store import CycleSequence
+from apolo_11.src.generator import Generator
+from apolo_11.src.publish import cycle_number, create_staging_directory
+from apolo_11.src.reporter import Reporter
+
+
+@pytest.fixture
+def backups(tmp_path):
+    """Seven backed up cycles of 10 records each"""
+    generator_instance = Generator(seed=5, cycle_store=CycleSequence(str(tmp_path / 'cycles.db')))
+    devices = tmp_path / 'devices'
+    devices.mkdir()
+    (tmp_path / 'backups').mkdir()
+
+    def staging(stamp, number):
+        return create_staging_directory(str(devices), f'cycle-{number}-{stamp}')
+
+    with patch.object(generator_instance, 'create_output_directory', side_effect=staging):
+        for _ in range(7):
+            summary = generator_instance.generate_files(10, 10)
+            name = os.path.basename(summary.directory)
+            os.rename(summary.directory, tmp_path / 'backups' / name[:-len('-noreport')])
+    generator_instance.close()
+    return tmp_path / 'backups'
+
+
+def reported_counts(backups):
+    reporter_instance = Reporter()
+    reporter_instance.ingest_cycles([path for _, path in list_cycles(str(backups))])
+    return dict(reporter_instance.devices_reports.items())
+
+
+def test_list_cycles_in_cycle_order(backups):
+    os.makedirs(backups / '.cycle-99-copying')
+    os.makedirs(backups / 'other')
+
+    cycles = list_cycles(str(backups))
+
+    assert [number for number, _ in cycles] == list(range(1, 8))
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_backfill_rebuilds_the_aggregate(tmp_path, backups, workers):
+    run = Backfill(str(backups), str(tmp_path / 'backfill.npz'), workers=workers, cycles_per_task=3)
+
+    progress = run.run()
+    run.publish(str(tmp_path / 'reporter.npz'))
+
+    assert (progress.records_processed, cycle_number(progress.last_cycle), run.cycles_merged) == (70, 7, 7)
+    assert dict(progress.devices_reports.items()) == reported_counts(backups)
+    assert load_checkpoint(str(tmp_path / 'reporter.npz')).records_processed == 70
+    assert not os.path.exists(tmp_path / 'backfill.npz')
+
+
+def test_interrupted_backfill_resumes_after_last_merged_cycle(tmp_path, backups):
+    calls = []
+
+    def interrupt_third_batch(cycle_directories, verify_hash, index_path):
+        calls.append(cycle_directories)
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        return process_cycle_batch(cycle_directories, verify_hash, index_path)
+
+    process_cycle_batch = backfill.process_cycle_batch
+    interrupted = Backfill(str(backups), str(tmp_path / 'backfill.npz'), cycles_per_task=2)
+    with patch.object(backfill, 'process_cycle_batch', side_effect=interrupt_third_batch):
+        with pytest.raises(KeyboardInterrupt):
+            interrupted.run()
+
+    assert cycle_number(load_checkpoint(str(tmp_path / 'backfill.npz')).last_cycle) == 4
+
+    resumed = Backfill(str(backups), str(tmp_path / 'backfill.npz'), cycles_per_task=2)
+    resumed.resume()
+    with patch.object(backfill, 'process_cycle_batch', wraps=process_cycle_batch) as batches:
+        progress = resumed.run()
+
+    assert [len(call.args[0]) for call in batches.call_args_list] == [2, 1]
+    assert (progress.records_processed, resumed.cycles_merged) == (70, 3)
+    assert dict(progress.devices_reports.items()) == reported_counts(backups)
+
+
+def test_batch_boundary_between_cycles_sharing_a_number(tmp_path, backups):
+    fourth = [path for number, path in list_cycles(str(backups)) if number == 4][0]
+    shutil.copytree(fourth, backups / 'cycle-4-zzz')
+    calls = []
+
+    def interrupt_third_batch(cycle_directories, verify_hash, index_path):
+        calls.append(cycle_directories)
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        return process_cycle_batch(cycle_directories, verify_hash, index_path)
+
+    process_cycle_batch = backfill.process_cycle_batch
+    interrupted = Backfill(str(backups), str(tmp_path / 'backfill.npz'), cycles_per_task=2)
+    with patch.object(backfill, 'process_cycle_batch', side_effect=interrupt_third_batch):
+        with pytest.raises(KeyboardInterrupt):
+            interrupted.run()
+
+    assert load_checkpoint(str(tmp_path / 'backfill.npz')).last_cycle == os.path.basename(fourth)
+
+    resumed = Backfill(str(backups), str(tmp_path / 'backfill.npz'), cycles_per_task=2)
+    resumed.resume()
+    progress = resumed.run()
+
+    assert (progress.records_processed, resumed.cycles_merged) == (80, 4)
+    assert progress.last_cycle == os.path.basename(list_cycles(str(backups))[-1][1])
+
+
+def test_publish_refuses_while_reported_cycles_are_not_backed_up(tmp_path, backups):
+    reporter_instance = Reporter(checkpoint_path=str(tmp_path / 'reporter.npz'))
+    reporter_instance.reported = {'cycle-12-20240101000000'}
+    reporter_instance.save_checkpoint()
+
+    run = Backfill(str(backups), str(tmp_path / 'backfill.npz'))
+    run.run()
+    with pytest.raises(RuntimeError, match='cycle-12-20240101000000'):
+        run.publish(str(tmp_path / 'reporter.npz'))
+
+    assert load_checkpoint(str(tmp_path / 'reporter.npz')).reported == ['cycle-12-20240101000000']
+    assert os.path.exists(tmp_path / 'backfill.npz')
+
+
+def test_publish_refuses_while_a_backup_is_in_progress(tmp_path, backups):
+    os.makedirs(tmp_path / 'devices' / '.cycle-12-20240101000000-noreport')
+    os.makedirs(tmp_path / 'devices' / '.cycle-13-20240101000000')
+
+    run = Backfill(str(backups), str(tmp_path / 'backfill.npz'))
+    run.run()
+    with pytest.raises(RuntimeError, match='1 reported cycles'):
+        run.publish(str(tmp_path / 'reporter.npz'), str(tmp_path / 'devices'))
+
+    assert not os.path.exists(tmp_path / 'reporter.npz')
+
+
+def test_backfill_cli(tmp_path, backups):
+    with patch.object(backfill, 'setup_logging'), patch.object(backfill, 'shutdown_logging'):
+        main(['--backups', str(backups), '--workers', '1', '--progress', str(tmp_path / 'backfill.npz'),
+              '--checkpoint', str(tmp_path / 'reporter.npz'), '--index', str(tmp_path / 'records.db'),
+              '--devices', str(tmp_path / 'devices')])
+
+    assert load_checkpoint(str(tmp_path / 'reporter.npz')).records_processed == 70
+    assert os.path.exists(tmp_path / 'records.db')
@@ -0,0 +1,177 @@
+import errno
+import os
+import shutil
+from unittest.mock import patch
+
+import pytest
+
+from apolo_11.src import backup
+from apolo_11.src.backup import BackupMover, copy_file, copy_tree, verify_copy
+from apolo_11.src.reporter import Reporter
+
+
+def make_cycle(directory, files=3):
+    os.makedirs(directory)
+    for index in range(files):
+        with open(os.path.join(directory, f'APLORBONE-{index:04d}.log'), 'wb') as file:
+            file.write(b'x' * (index + 1) * 1000)
+
+
+def read_tree(directory):
+    return {name: open(os.path.join(directory, name), 'rb').read() for name in sorted(os.listdir(directory))}
+
+
+def cross_device_rename(source, destination):
+    """os.rename that fails like a rename across filesystems into the backups directory"""
+    if os.path.basename(os.path.dirname(destination)) == 'backups' != os.path.basename(os.path.dirname(source)):
+        raise OSError(errno.EXDEV, os.strerror(errno.EXDEV))
+    return os.replace(source, destination)
+
+
+def test_copy_file_without_kernel_copy(tmp_path):
+    source = tmp_path / 'source.log'
+    source.write_bytes(b'record\n' * 10000)
+
+    with patch.object(backup, '_copy_kernel', return_value=None):
+        copied = copy_file(str(source), str(tmp_path / 'copy.log'), buffer_size=4096)
+
+    assert copied == source.stat().st_size
+    assert (tmp_path / 'copy.log').read_bytes() == source.read_bytes()
+
+
+def test_kernel_copy_falls_back_to_sendfile(tmp_path):
+    source = tmp_path / 'source.log'
+    source.write_bytes(b'record\n' * 1000)
+
+    with patch.object(os, 'copy_file_range', side_effect=OSError(errno.EXDEV, 'cross-device'), create=True):
+        copied = copy_file(str(source), str(tmp_path / 'copy.log'))
+
+    assert copied == source.stat().st_size
+    assert (tmp_path / 'copy.log').read_bytes() == source.read_bytes()
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_copy_tree_copies_every_file(tmp_path, workers):
+    make_cycle(str(tmp_path / 'cycle'))
+
+    files, copied = copy_tree(str(tmp_path / 'cycle'), str(tmp_path / 'copy'), workers=workers, verify='checksum')
+
+    assert (files, copied) == (3, 6000)
+    assert read_tree(tmp_path / 'copy') == read_tree(tmp_path / 'cycle')
+
+
+def test_verify_copy_detects_mismatch(tmp_path):
+    (tmp_path / 'source').write_bytes(b'abc')
+    (tmp_path / 'copy').write_bytes(b'abd')
+
+    verify_copy(str(tmp_path / 'source'), str(tmp_path / 'copy'), 'size')
+    with pytest.raises(OSError):
+        verify_copy(str(tmp_path / 'source'), str(tmp_path / 'copy'), 'checksum')
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        BackupMover(workers=0)
+    with pytest.raises(ValueError):
+        BackupMover(verify='crc')
+
+
+def test_move_renames_on_same_filesystem(tmp_path):
+    make_cycle(str(tmp_path / 'cycle-1-noreport'))
+    os.makedirs(tmp_path / 'backups')
+    mover = BackupMover()
+
+    assert mover.move(str(tmp_path / 'cycle-1-noreport'), str(tmp_path / 'backups' / 'cycle-1')) is None
+
+    assert os.listdir(tmp_path / 'backups' / 'cycle-1') and not os.path.exists(tmp_path / 'cycle-1-noreport')
+    assert (mover.moves_renamed, mover.moves_copied) == (1, 0)
+
+
+def test_move_copies_across_filesystems_in_background(tmp_path):
+    make_cycle(str(tmp_path / 'devices' / 'cycle-1-noreport'))
+    os.makedirs(tmp_path / 'backups')
+    expected = read_tree(tmp_path / 'devices' / 'cycle-1-noreport')
+    mover = BackupMover(verify='checksum')
+
+    with patch.object(backup.os, 'rename', side_effect=cross_device_rename):
+        future = mover.move(str(tmp_path / 'devices' / 'cycle-1-noreport'), str(tmp_path / 'backups' / 'cycle-1'))
+        future.result()
+        mover.close()
+
+    assert read_tree(tmp_path / 'backups' / 'cycle-1') == expected
+    assert os.listdir(tmp_path / 'devices') == []
+    assert os.listdir(tmp_path / 'backups') == ['cycle-1']
+    assert (mover.moves_renamed, mover.moves_copied) == (0, 1)
+
+
+def test_failed_copy_keeps_hidden_source(tmp_path):
+    make_cycle(str(tmp_path / 'devices' / 'cycle-1-noreport'))
+    os.makedirs(tmp_path / 'backups')
+    mover = BackupMover(background=False)
+
+    with patch.object(backup.os, 'rename', side_effect=cross_device_rename), \
+            patch.object(backup, 'verify_copy', side_effect=OSError(errno.EIO, 'mismatch')):
+        with pytest.raises(OSError):
+            mover.move(str(tmp_path / 'devices' / 'cycle-1-noreport'), str(tmp_path / 'backups' / 'cycle-1'))
+
+    assert os.listdir(tmp_path / 'devices') == ['.cycle-1-noreport']
+    assert os.listdir(tmp_path / 'backups') == []
+
+
+def test_copy_finishes_a_backup_already_renamed_into_place(tmp_path):
+    make_cycle(str(tmp_path / 'devices' / '.cycle-1-noreport'))
+    shutil.copytree(tmp_path / 'devices' / '.cycle-1-noreport', tmp_path / 'backups' / 'cycle-1')
+    expected = read_tree(tmp_path / 'backups' / 'cycle-1')
+    mover = BackupMover(verify='checksum', background=False)
+
+    assert mover.copy(str(tmp_path / 'devices' / '.cycle-1-noreport'), str(tmp_path / 'backups' / 'cycle-1')) is None
+
+    assert os.listdir(tmp_path / 'devices') == []
+    assert read_tree(tmp_path / 'backups' / 'cycle-1') == expected
+
+
+def test_copy_rejects_a_backup_that_does_not_match_its_source(tmp_path):
+    make_cycle(str(tmp_path / 'devices' / '.cycle-1-noreport'))
+    make_cycle(str(tmp_path / 'backups' / 'cycle-1'), files=2)
+    mover = BackupMover(background=False)
+
+    with pytest.raises(OSError):
+        mover.copy(str(tmp_path / 'devices' / '.cycle-1-noreport'), str(tmp_path / 'backups' / 'cycle-1'))
+
+    assert os.listdir(tmp_path / 'devices') == ['.cycle-1-noreport']
+
+
+def test_failed_source_removal_completes_the_copy(tmp_path):
+    make_cycle(str(tmp_path / 'devices' / 'cycle-1-noreport'))
+    os.makedirs(tmp_path / 'backups')
+    mover = BackupMover(background=False)
+
+    with patch.object(backup.os, 'rename', side_effect=cross_device_rename), \
+            patch.object(backup.shutil, 'rmtree', side_effect=OSError(errno.EBUSY, 'busy')):
+        assert mover.move(str(tmp_path / 'devices' / 'cycle-1-noreport'), str(tmp_path / 'backups' / 'cycle-1')) \
+            is None
+
+    assert mover.moves_copied == 1
+    assert os.listdir(tmp_path / 'devices') == ['.cycle-1-noreport']
+    assert os.listdir(tmp_path / 'backups') == ['cycle-1']
+
+    mover.copy(str(tmp_path / 'devices' / '.cycle-1-noreport'), str(tmp_path / 'backups' / 'cycle-1'))
+
+    assert os.listdir(tmp_path / 'devices') == []
+
+
+def test_reporter_resumes_interrupted_copy(tmp_path):
+    make_cycle(str(tmp_path / 'devices' / '.cycle-1-noreport'))
+    make_cycle(str(tmp_path / 'devices' / 'cycle-2-noreport'))
+    os.makedirs(tmp_path / 'backups')
+    reporter_instance = Reporter()
+    reporter_instance.process_directory(str(tmp_path / 'devices'))
+
+    with patch.object(backup.os, 'rename', side_effect=cross_device_rename):
+        reporter_instance.move_folders_to_backup(str(tmp_path / 'devices'), str(tmp_path / 'backups'))
+        reporter_instance.close()
+
+    assert os.listdir(tmp_path / 'devices') == []
+    assert sorted(os.listdir(tmp_path / 'backups')) == ['cycle-1', 'cycle-2']
+    assert reporter_instance.backup_mover.moves_copied == 2
+    assert reporter_instance.reported == set()
@@ -0,0 +1,43 @@
+import os
+
+from apolo_11.src.checkpoint import Checkpoint, load_checkpoint, save_checkpoint
+from apolo_11.src.status_counts import StatusCounts
+
+
+def new_counts():
+    counts = StatusCounts(['OrbitOne'], ['Satellite'], ['good'])
+    counts.add('OrbitOne', 'Satellite', 'good', 3)
+    counts.add("Moon'sBallon", 'unknown', 'unknown')
+    return counts
+
+
+def test_checkpoint_round_trip(tmp_path):
+    path = str(tmp_path / 'checkpoint' / 'reporter.npz')
+    save_checkpoint(path, Checkpoint(new_counts(), last_cycle='cycle-7-20240101000000', records_processed=4,
+                                     hashes_checked=3, hash_mismatches=1, reported=['cycle-17-20240101000000']))
+
+    checkpoint = load_checkpoint(path)
+
+    assert os.listdir(tmp_path / 'checkpoint') == ['reporter.npz']
+    assert (checkpoint.last_cycle, checkpoint.records_processed, checkpoint.hashes_checked,
+            checkpoint.hash_mismatches) == ('cycle-7-20240101000000', 4, 3, 1)
+    assert checkpoint.reported == ['cycle-17-20240101000000']
+    assert dict(checkpoint.devices_reports) == dict(new_counts())
+    assert checkpoint.devices_reports.same_vocabularies(new_counts())
+
+
+def test_save_replaces_previous_checkpoint(tmp_path):
+    path = str(tmp_path / 'reporter.npz')
+    save_checkpoint(path, Checkpoint(new_counts(), records_processed=1))
+    save_checkpoint(path, Checkpoint(new_counts(), records_processed=2))
+
+    assert load_checkpoint(path).records_processed == 2
+    assert os.listdir(tmp_path) == ['reporter.npz']
+
+
+def test_missing_or_corrupt_checkpoint(tmp_path):
+    path = tmp_path / 'reporter.npz'
+
+    assert load_checkpoint(str(path)) is None
+    path.write_bytes(b'not a checkpoint')
+    assert load_checkpoint(str(path)) is None
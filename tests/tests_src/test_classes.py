@@ -45,7 +45,9 @@ def test_configurable_class_invalid_key():
         invalid_key_instance = Configurable("invalid_key")
 
 
-@given(st.text().filter(lambda x: x not in ["missions", "devices", "general", "date_format", "routes"]))
+@given(st.text().filter(lambda x: x not in ["missions", "devices", "general", "date_format", "routes",
+                                            "logging", "generator", "pacing",
+                                            "reporter", "fleet"]))
 def test_property_invalid_config_keys_raise_keyerror(invalid_key):
     """
     Property 3: Claves de configuración inválidas lanzan KeyError
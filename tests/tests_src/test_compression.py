@@ -0,0 +1,59 @@
+import pytest
+
+from apolo_11.src.compression import (NONE, available_codecs, decompress, detect_codec, get_codec, read_bytes,
+                                      split_suffix)
+
+DATA = b"Date: 010123120000\nMission: OrbitOne\nDevice Type: Satellite\nDevice Status: good\nHash: 1" * 20
+
+
+@pytest.mark.parametrize('name', available_codecs())
+def test_codec_round_trip(name):
+    codec = get_codec(name)
+
+    compressed = codec.compress(DATA, None)
+
+    assert detect_codec(compressed) is codec
+    assert decompress(compressed) == DATA
+    if codec is not NONE:
+        assert len(compressed) < len(DATA)
+
+
+def test_gzip_output_is_reproducible():
+    gzip_codec = get_codec('gzip')
+
+    assert gzip_codec.compress(DATA, 1) == gzip_codec.compress(DATA, 1)
+
+
+def test_uncompressed_data_is_returned_unchanged():
+    assert detect_codec(DATA) is NONE
+    assert decompress(DATA) == DATA
+
+
+def test_get_codec_rejects_unknown_codec():
+    assert get_codec(None) is NONE
+    with pytest.raises(ValueError):
+        get_codec('rar')
+
+
+def test_split_suffix():
+    assert split_suffix('APLORBONE-0001.log.gz') == ('APLORBONE-0001.log', '.gz')
+    assert split_suffix('APLSEG-0001.seg.xz') == ('APLSEG-0001.seg', '.xz')
+    assert split_suffix('APLREC-0001.rec') == ('APLREC-0001.rec', '')
+
+
+def test_read_bytes_decompresses(tmp_path):
+    path = tmp_path / 'APLORBONE-0001.log.xz'
+    path.write_bytes(get_codec('lzma').compress(DATA, None))
+
+    assert read_bytes(str(path)) == DATA
+
+
+def test_read_bytes_with_expected_size(tmp_path):
+    path = tmp_path / 'file.log.gz'
+    path.write_bytes(get_codec('gzip').compress(DATA, None))
+    size = path.stat().st_size
+
+    assert read_bytes(str(path), size) == DATA
+    for wrong_size in (size - 1, size + 1):
+        with pytest.raises(ValueError):
+            read_bytes(str(path), wrong_size)
@@ -0,0 +1,85 @@
+import os
+from multiprocessing import Pool
+
+import pytest
+
+from apolo_11.src.cycle_store import CycleSequence
+
+
+def take_numbers(args):
+    path, count = args
+    sequence = CycleSequence(path, block_size=3)
+    numbers = [sequence.next() for _ in range(count)]
+    sequence.close()
+    return numbers
+
+
+def test_next_starts_at_one_and_increments(tmpdir):
+    sequence = CycleSequence(os.path.join(str(tmpdir), 'cycles.db'), block_size=4)
+
+    assert [sequence.next() for _ in range(6)] == [1, 2, 3, 4, 5, 6]
+    sequence.close()
+
+
+def test_clean_close_gives_back_unused_numbers(tmpdir):
+    path = os.path.join(str(tmpdir), 'cycles.db')
+    sequence = CycleSequence(path, block_size=10)
+    sequence.next()
+    sequence.next()
+    sequence.close()
+
+    assert CycleSequence(path, block_size=10).next() == 3
+
+
+def test_crash_never_reuses_reserved_numbers(tmpdir):
+    path = os.path.join(str(tmpdir), 'cycles.db')
+    crashed = CycleSequence(path, block_size=10)
+    assert crashed.next() == 1
+    # The process dies without close(): the rest of its block is skipped
+
+    assert CycleSequence(path, block_size=10).next() == 11
+
+
+def test_close_keeps_numbers_reserved_by_others(tmpdir):
+    path = os.path.join(str(tmpdir), 'cycles.db')
+    first = CycleSequence(path, block_size=5)
+    second = CycleSequence(path, block_size=5)
+    assert first.next() == 1
+    assert second.next() == 6
+
+    first.close()
+    second.close()
+
+    assert CycleSequence(path, block_size=5).next() == 7
+
+
+def test_reserve_returns_disjoint_ranges(tmpdir):
+    sequence = CycleSequence(os.path.join(str(tmpdir), 'cycles.db'))
+
+    assert sequence.reserve(4) == range(1, 5)
+    assert sequence.reserve(2) == range(5, 7)
+
+
+def test_new_store_is_seeded_from_legacy_counter(tmpdir):
+    legacy_path = os.path.join(str(tmpdir), 'cycle_number.txt')
+    with open(legacy_path, 'w') as file:
+        file.write('42')
+
+    sequence = CycleSequence(os.path.join(str(tmpdir), 'cycles.db'), legacy_path=legacy_path)
+
+    assert sequence.next() == 42
+
+
+def test_concurrent_processes_get_unique_numbers(tmpdir):
+    path = os.path.join(str(tmpdir), 'cycles.db')
+
+    with Pool(4) as pool:
+        results = pool.map(take_numbers, [(path, 25)] * 4)
+
+    numbers = [number for result in results for number in result]
+    assert len(numbers) == len(set(numbers)) == 100
+
+
+def test_invalid_block_size(tmpdir):
+    with pytest.raises(ValueError):
+        CycleSequence(os.path.join(str(tmpdir), 'cycles.db'), block_size=0)
@@ -0,0 +1,172 @@
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from apolo_11.src.daemon import ReporterDaemon
+from apolo_11.src.reporter import Reporter, config
+from apolo_11.src.watcher import PollingWatcher, create_watcher
+
+RECORD = "Date: 010123120000\nMission: OrbitOne\nDevice Type: Satellite\nDevice Status: good\nHash: 1"
+
+
+def publish(devices, number):
+    staging = devices / f'.cycle-{number}-20240101000000'
+    staging.mkdir()
+    (staging / 'APLORBONE-0001.log').write_text(RECORD)
+    os.rename(staging, devices / f'cycle-{number}-20240101000000-noreport')
+
+
+@pytest.fixture
+def directories(tmp_path):
+    devices = tmp_path / 'devices'
+    backups = tmp_path / 'backups'
+    devices.mkdir()
+    backups.mkdir()
+    # Reports of the flushes go to the temporary directory instead of apolo_11/results
+    with patch.dict(config['routes'][0], {'results': str(tmp_path)}), \
+            patch.dict(config['routes'][3], {'reports': str(tmp_path / 'reports')}):
+        yield devices, backups
+
+
+def new_daemon(devices, backups, debounce, reporter_instance=None):
+    return ReporterDaemon(reporter_instance or Reporter(), str(devices), str(backups), debounce,
+                          PollingWatcher(str(devices), poll_interval=0.01))
+
+
+def test_cycles_are_ingested_at_once_and_reported_on_debounce(directories):
+    devices, backups = directories
+    daemon = new_daemon(devices, backups, debounce=60)
+    publish(devices, 1)
+    publish(devices, 2)
+
+    with patch.object(daemon.reporter_instance, 'generate_stats_report') as generate_stats_report:
+        assert daemon.step(0) == 2
+        assert daemon.step(0) == 0
+        assert daemon.reporter_instance.records_processed == 2
+        assert daemon.reporter_instance.reported == {'cycle-1-20240101000000', 'cycle-2-20240101000000'}
+        generate_stats_report.assert_not_called()
+        assert sorted(os.listdir(devices)) == ['cycle-1-20240101000000-noreport', 'cycle-2-20240101000000-noreport']
+
+        daemon.flush()
+
+    generate_stats_report.assert_called_once()
+    assert daemon.reports_written == 1
+    assert os.listdir(devices) == []
+    assert sorted(os.listdir(backups)) == ['cycle-1-20240101000000', 'cycle-2-20240101000000']
+
+
+def test_debounce_expiry_reports_pending_cycles(directories):
+    devices, backups = directories
+    daemon = new_daemon(devices, backups, debounce=0)
+    publish(devices, 3)
+
+    with patch.object(daemon.reporter_instance, 'generate_stats_report'):
+        daemon.step(0)
+
+    assert daemon.reports_written == 1
+    assert os.listdir(backups) == ['cycle-3-20240101000000']
+
+
+def test_running_daemon_reports_within_seconds(directories):
+    devices, backups = directories
+    publish(devices, 1)
+    daemon = ReporterDaemon(Reporter(), str(devices), str(backups), 0.05, create_watcher(str(devices)))
+    daemon.IDLE_TIMEOUT = 0.05
+
+    with patch.object(daemon.reporter_instance, 'generate_stats_report'):
+        thread = daemon.start()
+        try:
+            publish(devices, 2)
+            deadline = time.monotonic() + 5
+            while len(os.listdir(backups)) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            daemon.stop()
+            thread.join(5)
+
+    assert not thread.is_alive()
+    assert daemon.cycles_ingested == 2
+    assert daemon.reporter_instance.records_processed == 2
+    assert sorted(os.listdir(backups)) == ['cycle-1-20240101000000', 'cycle-2-20240101000000']
+
+
+def test_only_cycles_ingested_now_are_moved_on_flush(directories):
+    devices, backups = directories
+    reporter_instance = Reporter()
+    # Counted by a previous run that stopped before moving it
+    reporter_instance.reported = {'cycle-1-20240101000000'}
+    daemon = new_daemon(devices, backups, debounce=60, reporter_instance=reporter_instance)
+    publish(devices, 1)
+    publish(devices, 2)
+
+    with patch.object(reporter_instance, 'generate_stats_report'):
+        assert daemon.ingest(['cycle-1-20240101000000-noreport', 'cycle-2-20240101000000-noreport']) == 1
+        daemon.flush()
+
+    assert reporter_instance.records_processed == 1
+    assert os.listdir(backups) == ['cycle-2-20240101000000']
+
+    daemon.resume_backups()
+    assert sorted(os.listdir(backups)) == ['cycle-1-20240101000000', 'cycle-2-20240101000000']
+    assert reporter_instance.reported == set()
+
+
+def test_failed_report_keeps_pending_cycles_for_the_next_step(directories):
+    devices, backups = directories
+    daemon = new_daemon(devices, backups, debounce=0)
+    publish(devices, 1)
+
+    with patch.object(daemon.reporter_instance, 'generate_stats_report', side_effect=OSError('disk full')):
+        assert daemon.step(0) == 1
+
+    assert daemon.reports_written == 0
+    assert daemon._pending == [str(devices / 'cycle-1-20240101000000-noreport')]
+    assert daemon._deadline is not None
+    assert os.listdir(backups) == []
+
+    with patch.object(daemon.reporter_instance, 'generate_stats_report') as generate_stats_report:
+        assert daemon.step(0) == 0
+
+    generate_stats_report.assert_called_once()
+    assert daemon.reports_written == 1
+    assert (daemon._pending, daemon._deadline) == ([], None)
+    assert daemon.reporter_instance.records_processed == 1
+    assert os.listdir(backups) == ['cycle-1-20240101000000']
+
+
+def test_failed_move_keeps_only_the_cycles_not_moved(directories):
+    devices, backups = directories
+    daemon = new_daemon(devices, backups, debounce=60)
+    publish(devices, 1)
+    publish(devices, 2)
+    move_folder_to_backup = daemon.reporter_instance.move_folder_to_backup
+
+    def fail_second_move(directory, backup_directory):
+        if directory.endswith('cycle-2-20240101000000-noreport'):
+            raise OSError('busy')
+        move_folder_to_backup(directory, backup_directory)
+
+    with patch.object(daemon.reporter_instance, 'generate_stats_report'), \
+            patch.object(daemon.reporter_instance, 'move_folder_to_backup', side_effect=fail_second_move):
+        daemon.step(0)
+        daemon.flush()
+
+    assert daemon._pending == [str(devices / 'cycle-2-20240101000000-noreport')]
+    assert os.listdir(backups) == ['cycle-1-20240101000000']
+
+
+def test_ingest_errors_keep_the_daemon_alive(directories):
+    devices, backups = directories
+    daemon = new_daemon(devices, backups, debounce=60)
+    publish(devices, 1)
+
+    with patch.object(daemon.reporter_instance, 'ingest_cycles', side_effect=RuntimeError('boom')):
+        assert daemon.step(0) == 0
+    assert daemon.cycles_ingested == 0
+
+
+def test_invalid_debounce(directories):
+    with pytest.raises(ValueError):
+        new_daemon(*directories, debounce=-1)
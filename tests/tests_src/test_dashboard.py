@@ -3,6 +3,7 @@
 import pytest
 from datetime import datetime
 from hypothesis import given, strategies as st
+from rich.console import Console
 from rich.layout import Layout
 
 from apolo_11.src.dashboard import Dashboard, DashboardStats, MissionStats
@@ -181,3 +182,21 @@ class TestDashboard:
         assert dashboard_stats.current_cycle == 10
         assert "ORBONE" in dashboard_stats.missions
         assert dashboard_stats.last_report_time is not None
+
+    def test_render_rolling_windows(self):
+        """Test that rolling window summaries are rendered below the system status."""
+        dashboard = Dashboard()
+        dashboard.update_stats({'files_count': 3, 'cycle': 1}, {
+            'missions': {},
+            'windows': {'last_hour': {'cycles': 12, 'records': 400, 'disconnections': 40,
+                                      'operational_percentage': 90.0}}
+        })
+
+        dashboard.console = Console(width=160, height=40)
+        with dashboard.console.capture() as capture:
+            dashboard.console.print(dashboard.render())
+        layout_str = capture.get()
+
+        assert dashboard.stats.windows['last_hour']['records'] == 400
+        assert "Rolling Windows" in layout_str
+        assert "last_hour" in layout_str and "90.00%" in layout_str
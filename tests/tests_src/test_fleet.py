@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from apolo_11.src.fleet import NEVER_SEEN, DeviceFleet, load_fleet, transition_matrix
+
+STATUSES = ['good', 'faulty', 'killed']
+
+
+def test_transition_matrix_normalizes_rows_and_keeps_missing_rows():
+    matrix = transition_matrix(STATUSES, {'good': {'good': 3, 'faulty': 1}, 'faulty': {'killed': 0.5}})
+
+    assert matrix.tolist() == [[0.75, 0.25, 0.0], [0.0, 0.0, 1.0], [0.0, 0.0, 1.0]]
+
+
+@pytest.mark.parametrize('transitions', [
+    {'broken': {'good': 1}},
+    {'good': {'broken': 1}},
+    {'good': {'faulty': -0.1}},
+])
+def test_transition_matrix_rejects_invalid_definitions(transitions):
+    with pytest.raises(ValueError):
+        transition_matrix(STATUSES, transitions)
+
+
+def test_advance_follows_transition_matrix():
+    matrix = transition_matrix(STATUSES, {'good': {'good': 0.5, 'faulty': 0.5}, 'faulty': {'killed': 1}})
+    fleet = DeviceFleet(np.zeros(6, dtype=np.int16), np.zeros(6, dtype=np.int16),
+                        np.array([0, 0, 0, 1, 1, 2], dtype=np.int16), matrix, np.random.default_rng(1))
+
+    fleet.advance()
+
+    assert fleet.cycle == 1
+    assert fleet.status_idx.dtype == np.int16
+    assert set(fleet.status_idx[:3].tolist()) <= {0, 1}
+    assert fleet.status_idx[3:].tolist() == [2, 2, 2]
+
+
+def test_advance_converges_to_stationary_distribution():
+    matrix = transition_matrix(STATUSES, {'good': {'good': 0.9, 'faulty': 0.1}, 'faulty': {'good': 0.9, 'faulty': 0.1}})
+    fleet = DeviceFleet.random(200000, 2, 3, matrix, seed=3)
+
+    for cycle in range(1, 4):
+        fleet.advance(cycle)
+
+    shares = fleet.status_counts() / len(fleet)
+    assert shares[2] == pytest.approx(1 / 3, abs=0.01)
+    assert shares[0] == pytest.approx(0.9 * 2 / 3, abs=0.01)
+
+
+def test_sample_marks_devices_seen():
+    fleet = DeviceFleet.random(50, 4, 5, np.eye(3), seed=0)
+    fleet.advance(7)
+
+    mission_idx, type_idx, status_idx = fleet.sample(20)
+
+    assert len(mission_idx) == len(type_idx) == len(status_idx) == 20
+    assert np.all(fleet.last_seen[fleet.last_seen != NEVER_SEEN] == 7)
+    assert 0 < np.count_nonzero(fleet.last_seen == 7) <= 20
+
+
+def test_load_fleet_from_config():
+    fleet = load_fleet({'size': 10, 'transitions': {'good': {'faulty': 1}}}, ['A', 'B'], ['T'], STATUSES, seed=2)
+
+    assert len(fleet) == 10
+    assert fleet.mission_idx.max() <= 1
+    assert fleet.type_idx.max() == 0
+    assert fleet.transitions[0].tolist() == [0.0, 1.0, 0.0]
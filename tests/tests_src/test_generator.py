@@ -1,8 +1,12 @@
 import os
 import pytest
 from datetime import datetime
-from unittest.mock import patch
-from apolo_11.src.generator import Generator
+from unittest.mock import MagicMock, patch
+import numpy as np
+from apolo_11.src.cycle_store import CycleSequence
+from apolo_11.src.fleet import DeviceFleet
+from apolo_11.src.generator import Generator, UNKNOWN_INDEX
+from apolo_11.src.manifest import MANIFEST_NAME, read_manifest
 
 @pytest.fixture
 def generator_instance():
@@ -40,52 +44,6 @@ def test_generate_contentfile(mock_datetime, generator_instance):
     assert 'Device Status: ' in result.content
     assert 'Hash: ' in result.content
 
-@patch('builtins.open', create=True)
-@patch('os.path.join')
-def test_load_cycle_number(mock_join, mock_open, generator_instance):
-    # Test con archivo existente
-    mock_join.return_value = '/mocked/path/cycle_number.txt'
-    mock_file = mock_open.return_value.__enter__.return_value
-    mock_file.read.return_value.strip.return_value = '42'
-    
-    generator_instance.load_cycle_number()
-    
-    assert generator_instance.generate_files_call_count == 42
-    mock_open.assert_called_with('/mocked/path/cycle_number.txt', 'r')
-
-@patch('builtins.open', create=True)
-@patch('os.path.join')
-def test_load_cycle_number_file_not_found(mock_join, mock_open, generator_instance):
-    # Test con archivo no existente
-    mock_join.return_value = '/mocked/path/cycle_number.txt'
-    mock_open.side_effect = [FileNotFoundError, mock_open.return_value]
-    
-    generator_instance.load_cycle_number()
-    
-    # Cuando no existe el archivo, se inicializa en 0 y luego save_cycle_number() lo incrementa a 1
-    assert generator_instance.generate_files_call_count == 1
-    # Verifica que se llama save_cycle_number cuando no existe el archivo
-    assert mock_open.call_count == 2  # Una para leer (falla) y otra para escribir
-
-@patch('builtins.open', create=True)
-@patch('os.path.join')
-def test_save_cycle_number(mock_join, mock_open, generator_instance):
-    # Test que verifica incremento y guardado correcto
-    mock_join.return_value = '/mocked/path/cycle_number.txt'
-    mock_file = mock_open.return_value.__enter__.return_value
-    
-    # Establecer un valor inicial
-    generator_instance.generate_files_call_count = 5
-    
-    generator_instance.save_cycle_number()
-    
-    # Verificar que se incrementó
-    assert generator_instance.generate_files_call_count == 6
-    
-    # Verificar que se escribió el archivo con el valor correcto
-    mock_open.assert_called_with('/mocked/path/cycle_number.txt', 'w')
-    mock_file.write.assert_called_with('6')
-
 def test_create_output_directory(generator_instance):
     # Test que verifica el formato correcto del directorio creado
     times_stamp = '20230101120000'
@@ -96,9 +54,8 @@ def test_create_output_directory(generator_instance):
     # Verificar que el directorio fue creado
     assert os.path.exists(result)
     
-    # Verificar el formato correcto del directorio
-    expected_format = f'cycle-{call_count}-{times_stamp}-noreport'
-    assert expected_format in result
+    # Verificar el formato correcto del directorio oculto de preparación
+    expected_format = f'.cycle-{call_count}-{times_stamp}'
     
     # Verificar que termina con la estructura esperada
     assert result.endswith(f'results/devices/{expected_format}')
@@ -106,12 +63,33 @@ def test_create_output_directory(generator_instance):
     # Verificar que contiene la ruta relativa correcta
     assert './../results/devices/' in result
 
+    # Publicar el ciclo con su nombre -noreport
+    published = generator_instance.publish_output_directory(result)
+    assert published.endswith(f'results/devices/cycle-{call_count}-{times_stamp}-noreport')
+    assert os.path.isdir(published)
+    assert not os.path.exists(result)
+
     # Limpiar el directorio creado
-    os.rmdir(result)
+    os.rmdir(published)
+
+
+def test_discard_interrupted_cycles(generator_instance, tmp_path):
+    os.makedirs(tmp_path / '.cycle-3-20230101120000')
+    os.makedirs(tmp_path / 'cycle-2-20230101115900-noreport')
+
+    with patch.object(generator_instance, 'devices_directory', return_value=str(tmp_path)):
+        removed = generator_instance.discard_interrupted_cycles()
+
+    assert removed == [str(tmp_path / '.cycle-3-20230101120000')]
+    assert os.listdir(tmp_path) == ['cycle-2-20230101115900-noreport']
+
 
 def test_generate_hash(generator_instance):
     result = generator_instance.generate_hash('test', 42, 'example')
     assert isinstance(result, int)
+    # Stable across processes: blake2b-64 of the joined fields
+    assert result == 0x15765dcce4d431c8
+    assert result == generator_instance.generate_hash('test42example')
 
 
 def test_generate_contentfile_unknown_mission(generator_instance):
@@ -160,15 +138,18 @@ def test_default_content_generate_string():
     assert 'Hash: 12345' in result
 
 
-@patch('apolo_11.src.generator.os.makedirs')
+@patch('apolo_11.src.generator.Generator.publish_output_directory', return_value='/mocked/output/dir-noreport')
+@patch('apolo_11.src.generator.Generator.write_cycle_manifest')
+@patch('apolo_11.src.generator.Generator.written_files', return_value=[])
 @patch('builtins.open', create=True)
-@patch('apolo_11.src.generator.Generator.load_cycle_number')
-@patch('apolo_11.src.generator.Generator.save_cycle_number')
 @patch('apolo_11.src.generator.Generator.create_output_directory')
-@patch('apolo_11.src.generator.Generator.generate_contentfile')
+@patch('apolo_11.src.generator.Generator.count_statuses', return_value={'good': 2})
+@patch('apolo_11.src.generator.Generator.iter_batch_files')
+@patch('apolo_11.src.generator.Generator.generate_batch')
 @patch('apolo_11.src.generator.datetime')
-def test_generate_files(mock_datetime, mock_generate_contentfile, mock_create_output_directory,
-                       mock_save_cycle_number, mock_load_cycle_number, mock_open, mock_makedirs, generator_instance):
+def test_generate_files(mock_datetime, mock_generate_batch, mock_iter_batch_files, mock_count_statuses,
+                        mock_create_output_directory, mock_open, mock_written_files, mock_write_cycle_manifest,
+                        mock_publish_output_directory, generator_instance):
     """Test generate_files method with mocks to avoid real I/O
     
     Requirements: 5.1 - Test con mocks para evitar I/O real, verificar creación de archivos
@@ -176,40 +157,210 @@ def test_generate_files(mock_datetime, mock_generate_contentfile, mock_create_ou
     # Setup mocks
     mock_datetime.now.return_value.strftime.return_value = '20230101120000'
     mock_create_output_directory.return_value = '/mocked/output/dir'
-    
-    # Mock generate_contentfile to return test data
-    from apolo_11.src.generator import GeneratedFile
-    mock_generate_contentfile.side_effect = [
-        GeneratedFile('APLORBONE-0001.log', 'test content 1'),
-        GeneratedFile('APLORBONE-0002.log', 'test content 2')
-    ]
+    mock_generate_batch.return_value.__len__.return_value = 2
+    generator_instance.cycle_store = MagicMock()
+    generator_instance.cycle_store.next.return_value = 42
+
+    # Mock iter_batch_files to return test data
+    mock_iter_batch_files.return_value = iter([
+        ('APLORBONE-0001.log', b'test content 1'),
+        ('APLORBONE-0002.log', b'test content 2')
+    ])
     
     # Mock file operations
     mock_file = mock_open.return_value.__enter__.return_value
     
-    # Mock random.randint to return a fixed number of files
-    with patch('apolo_11.src.generator.random.randint', return_value=2):
-        generator_instance.generate_files(1, 5)
+    # Fix the number of files drawn from the generator stream
+    generator_instance.rng = MagicMock()
+    generator_instance.rng.integers.return_value = 2
+    summary = generator_instance.generate_files(1, 5)
     
-    # Verify load_cycle_number was called
-    mock_load_cycle_number.assert_called_once()
+    # Verify the cycle number was taken from the cycle store
+    generator_instance.cycle_store.next.assert_called_once()
+    assert generator_instance.generate_files_call_count == 42
     
-    # Verify create_output_directory was called with timestamp and call count
-    mock_create_output_directory.assert_called_once_with('20230101120000', generator_instance.generate_files_call_count)
+    # Verify create_output_directory was called with timestamp and cycle number
+    mock_create_output_directory.assert_called_once_with('20230101120000', 42)
     
-    # Verify generate_contentfile was called for each file
-    assert mock_generate_contentfile.call_count == 2
-    mock_generate_contentfile.assert_any_call(1)
-    mock_generate_contentfile.assert_any_call(2)
+    # Verify the whole cycle was generated as one batch
+    mock_generate_batch.assert_called_once_with(2)
+    mock_iter_batch_files.assert_called_once_with(mock_generate_batch.return_value)
     
     # Verify files were written
     assert mock_open.call_count == 2
-    mock_open.assert_any_call('/mocked/output/dir/APLORBONE-0001.log', 'w')
-    mock_open.assert_any_call('/mocked/output/dir/APLORBONE-0002.log', 'w')
+    mock_open.assert_any_call('/mocked/output/dir/APLORBONE-0001.log', 'wb')
+    mock_open.assert_any_call('/mocked/output/dir/APLORBONE-0002.log', 'wb')
     
     # Verify file content was written
-    mock_file.write.assert_any_call('test content 1')
-    mock_file.write.assert_any_call('test content 2')
-    
-    # Verify save_cycle_number was called
-    mock_save_cycle_number.assert_called_once()
+    mock_file.write.assert_any_call(b'test content 1')
+    mock_file.write.assert_any_call(b'test content 2')
+
+    # Verify the cycle summary
+    assert summary.cycle == 42
+    mock_write_cycle_manifest.assert_called_once_with('/mocked/output/dir', 42, [], {'good': 2})
+    mock_publish_output_directory.assert_called_once_with('/mocked/output/dir')
+    assert summary.directory == '/mocked/output/dir-noreport'
+    assert summary.files_count == 2
+    assert summary.status_counts == {'good': 2}
+
+
+def test_generate_batch_shapes_and_unknown_records(generator_instance):
+    """Test generate_batch returns aligned index arrays for every record"""
+    batch = generator_instance.generate_batch(500, start_number=10)
+
+    assert len(batch) == 500
+    assert batch.file_numbers[0] == 10
+    assert batch.file_numbers[-1] == 509
+    assert len(batch.mission_idx) == len(batch.type_idx) == len(batch.status_idx) == 500
+
+    mission_names = generator_instance.mission_instance.name
+    codes = generator_instance.mission_instance.codes
+    for position, mission in enumerate(batch.mission_idx.tolist()):
+        if mission_names[mission] in codes:
+            assert batch.known[position]
+            device_type = generator_instance.device_instance.type[batch.type_idx[position]]
+            device_status = generator_instance.device_instance.status[batch.status_idx[position]]
+            assert batch.hash_values[position] == generator_instance.generate_hash(
+                batch.current_date, mission_names[mission], device_type, device_status)
+        else:
+            assert batch.type_idx[position] == UNKNOWN_INDEX
+            assert batch.status_idx[position] == UNKNOWN_INDEX
+            assert batch.hash_values[position] == 0
+            assert position in batch.unique_ids
+
+    assert len(batch.unique_ids) == int((~batch.known).sum())
+
+
+def test_generate_batch_is_reproducible_with_seed():
+    """Test two generators seeded alike draw the same records"""
+    first = Generator(seed=7).generate_batch(50)
+    second = Generator(seed=7).generate_batch(50)
+
+    assert (first.mission_idx == second.mission_idx).all()
+    assert (first.type_idx == second.type_idx).all()
+    assert (first.status_idx == second.status_idx).all()
+    assert first.unique_ids == second.unique_ids
+
+
+def test_iter_batch_files(generator_instance):
+    """Test iter_batch_files renders one file per record of the batch"""
+    batch = generator_instance.generate_batch(20)
+
+    files = list(generator_instance.iter_batch_files(batch))
+
+    assert len(files) == 20
+    for position, (filename, content) in enumerate(files):
+        mission_name = generator_instance.mission_instance.name[batch.mission_idx[position]]
+        assert filename == generator_instance.generate_filename(mission_name, position + 1)
+        assert isinstance(content, bytes)
+        assert f'Date: {batch.current_date}' in content.decode()
+        if not batch.known[position]:
+            assert f'ID: {batch.unique_ids[position]}' in content.decode()
+
+
+@pytest.mark.parametrize('writer_workers', [1, 4])
+def test_generate_files_writes_cycle_with_writer_pool(tmpdir, writer_workers):
+    """Test generate_files returns once every file of the cycle is written"""
+    generator = Generator(seed=3, writer_workers=writer_workers,
+                          cycle_store=CycleSequence(os.path.join(str(tmpdir), 'cycles.db')))
+    output_directory = str(tmpdir.mkdir('cycle'))
+
+    with patch.object(Generator, 'create_output_directory', return_value=output_directory):
+        summary = generator.generate_files(30, 30)
+    generator.close()
+
+    assert summary.files_count == 30
+    assert summary.directory == output_directory + '-noreport'
+    assert len(os.listdir(summary.directory)) == 31
+    manifest = read_manifest(summary.directory)
+    assert manifest.cycle == summary.cycle
+    assert manifest.records == 30
+    assert manifest.status_counts == summary.status_counts
+    assert sorted(entry.name for entry in manifest.files) == \
+        sorted(name for name in os.listdir(summary.directory) if name != MANIFEST_NAME)
+    assert all(entry.size == os.path.getsize(os.path.join(summary.directory, entry.name)) for entry in manifest.files)
+
+
+def test_generate_files_segment_mode(tmpdir):
+    """Test segment mode packs the whole cycle in one segment file"""
+    from apolo_11.src.segment import read_segment
+    generator = Generator(seed=5, output_mode='segment',
+                          cycle_store=CycleSequence(os.path.join(str(tmpdir), 'cycles.db')))
+    output_directory = str(tmpdir.mkdir('cycle'))
+
+    with patch.object(Generator, 'create_output_directory', return_value=output_directory):
+        summary = generator.generate_files(25, 25)
+
+    assert summary.files_count == 25
+    assert sorted(os.listdir(summary.directory)) == ['APLSEG-0001.seg', MANIFEST_NAME]
+    assert [(entry.name, entry.records) for entry in read_manifest(summary.directory).files] == \
+        [('APLSEG-0001.seg', 25)]
+    records = list(read_segment(os.path.join(summary.directory, 'APLSEG-0001.seg')))
+    assert len(records) == 25
+    assert records[0][0].endswith('-0001.log')
+
+
+def test_invalid_output_mode():
+    with pytest.raises(ValueError):
+        Generator(output_mode='tape')
+
+
+def test_count_statuses(generator_instance):
+    """Test count_statuses counts every record once, unknown missions as unknown"""
+    batch = generator_instance.generate_batch(300)
+
+    counts = generator_instance.count_statuses(batch)
+
+    assert sum(counts.values()) == 300
+    expected_unknown = int((~batch.known).sum()) + int(
+        (batch.status_idx == generator_instance.device_instance.status.index('unknown')).sum())
+    assert counts.get('unknown', 0) == expected_unknown
+
+
+def test_generate_batch_draws_from_fleet():
+    """Test records of a generator with a fleet come from the fleet devices"""
+    statuses = Generator().device_instance.status
+    fleet = DeviceFleet(np.array([0, 1], dtype=np.int16), np.array([2, 3], dtype=np.int16),
+                        np.array([1, 1], dtype=np.int16), np.eye(len(statuses)), np.random.default_rng(0))
+    fleet_generator = Generator(seed=1, fleet=fleet)
+
+    batch = fleet_generator.generate_batch(20)
+
+    pairs = set(zip(batch.mission_idx.tolist(), batch.type_idx.tolist()))
+    assert pairs <= {(0, 2), (1, 3)}
+    assert set(batch.status_idx.tolist()) == {1}
+    assert fleet.type_idx.tolist() == [2, 3]
+
+
+@pytest.mark.parametrize('durability', ['none', 'per-cycle', 'per-file'])
+@pytest.mark.parametrize('output_mode', ['files', 'segment'])
+def test_generate_files_publishes_staged_cycle(tmpdir, durability, output_mode):
+    """Test a cycle is written in a hidden staging directory and renamed when complete"""
+    generator = Generator(seed=8, output_mode=output_mode, durability=durability,
+                          cycle_store=CycleSequence(os.path.join(str(tmpdir), 'cycles.db')))
+    devices_directory = str(tmpdir.mkdir('devices'))
+    staged = []
+
+    def create_staging(times_stamp, cycle):
+        staged.append(os.path.join(devices_directory, f'.cycle-{cycle}-{times_stamp}'))
+        os.makedirs(staged[-1])
+        return staged[-1]
+
+    def write_batch(output_directory, batch):
+        # Nothing is visible under its published name while the cycle is written
+        assert os.listdir(devices_directory) == [os.path.basename(output_directory)]
+        return Generator.write_batch(generator, output_directory, batch)
+
+    with patch.object(generator, 'create_output_directory', side_effect=create_staging), \
+            patch.object(generator, 'write_batch', side_effect=write_batch):
+        summary = generator.generate_files(10, 10)
+    generator.close()
+
+    assert summary.directory == staged[0].replace('/.cycle-', '/cycle-') + '-noreport'
+    assert os.listdir(devices_directory) == [os.path.basename(summary.directory)]
+    assert sum(1 for _ in os.scandir(summary.directory)) == (10 if output_mode == 'files' else 1) + 1
+
+
+def test_invalid_durability():
+    with pytest.raises(ValueError):
+        Generator(durability='always')
@@ -0,0 +1,55 @@
+import subprocess
+import sys
+
+import numpy as np
+
+from apolo_11.src.hashing import hash_batch, stable_hash
+
+
+def test_stable_hash_is_64_bit_and_deterministic():
+    value = stable_hash('010123120000', 'OrbitOne', 'Satellite', 'good')
+
+    assert 0 <= value < 2 ** 64
+    assert value == stable_hash('010123120000OrbitOneSatellitegood')
+    assert value != stable_hash('010123120000', 'OrbitOne', 'Satellite', 'faulty')
+
+
+def test_stable_hash_does_not_depend_on_hash_seed():
+    code = "from apolo_11.src.hashing import stable_hash; print(stable_hash('a', 1))"
+    outputs = {
+        subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                       env={'PYTHONHASHSEED': seed}).stdout
+        for seed in ('1', '2')
+    }
+
+    assert outputs == {f"{stable_hash('a', 1)}\n"}
+
+
+def test_hash_batch_matches_per_record_hash():
+    missions = ['OrbitOne', 'VacMars']
+    types = ['Satellite', 'Rover', 'Equipment']
+    statuses = ['good', 'faulty']
+    rng = np.random.default_rng(1)
+    mission_idx = rng.integers(0, 2, 200)
+    type_idx = rng.integers(0, 3, 200)
+    status_idx = rng.integers(0, 2, 200)
+    type_idx[::7] = -1
+    status_idx[::7] = -1
+
+    hashes = hash_batch('010123120000', missions, types, statuses, mission_idx, type_idx, status_idx)
+
+    assert hashes.dtype == np.uint64
+    for position in range(200):
+        if position % 7 == 0:
+            assert hashes[position] == 0
+        else:
+            assert hashes[position] == stable_hash('010123120000', missions[mission_idx[position]],
+                                                   types[type_idx[position]], statuses[status_idx[position]])
+
+
+def test_hash_batch_without_known_records():
+    unknown = np.full(3, -1)
+
+    hashes = hash_batch('010123120000', ['X'], ['Y'], ['Z'], np.zeros(3, dtype=int), unknown, unknown)
+
+    assert hashes.tolist() == [0, 0, 0]
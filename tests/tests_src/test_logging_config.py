@@ -14,7 +14,8 @@ from unittest.mock import patch
 from hypothesis import given, strategies as st, settings, HealthCheck
 import pytest
 
-from apolo_11.src.logging_config import setup_logging, get_logger
+from apolo_11.src.logging_config import (RateLimitFilter, SamplingFilter, get_logger, init_worker_logging, log_per_file,
+                                         setup_logging, shutdown_logging)
 from apolo_11.src.config import ConfigManager
 
 
@@ -166,4 +167,95 @@ routes:
             assert logger.level == expected_level
             
         finally:
-            os.unlink(temp_config_path)
\ No newline at end of file
+            os.unlink(temp_config_path)
+
+
+ASYNC_CONFIG = """
+logging:
+  level: INFO
+  format: "%(levelname)s - %(name)s - %(message)s"
+  async: true
+  loggers:
+    apolo_11.sampled:
+      sample: 3
+    apolo_11.limited:
+      rate_limit: 5
+"""
+
+
+def _record(level=logging.INFO):
+    return logging.LogRecord('apolo_11.test', level, __file__, 1, 'message', None, None)
+
+
+def test_sampling_filter_keeps_one_of_every_n_below_warning():
+    sampling = SamplingFilter(3)
+
+    kept = [sampling.filter(_record()) for _ in range(7)]
+
+    assert kept == [True, False, False, True, False, False, True]
+    assert sampling.filter(_record(logging.WARNING))
+    with pytest.raises(ValueError):
+        SamplingFilter(0)
+
+
+def test_rate_limit_filter_refills_per_second():
+    now = [0.0]
+    limit = RateLimitFilter(2, clock=lambda: now[0])
+
+    assert [limit.filter(_record()) for _ in range(3)] == [True, True, False]
+    assert limit.filter(_record(logging.ERROR))
+    now[0] = 0.5
+    assert limit.filter(_record())
+    assert not limit.filter(_record())
+    assert limit.dropped == 2
+
+
+def test_async_logging_writes_through_listener_and_filters(tmp_path, capsys):
+    config_path = tmp_path / 'config.yaml'
+    config_path.write_text(ASYNC_CONFIG)
+
+    try:
+        setup_logging(str(config_path))
+        root_handlers = logging.getLogger().handlers
+        assert any(isinstance(handler, logging.handlers.QueueHandler) for handler in root_handlers)
+
+        for number in range(6):
+            logging.getLogger('apolo_11.sampled').info("muestra %d", number)
+        for number in range(10):
+            logging.getLogger('apolo_11.limited').info("limitado %d", number)
+        logging.getLogger('apolo_11.limited').error("error final")
+        shutdown_logging()
+
+        output = capsys.readouterr().err
+        assert "INFO - apolo_11.sampled - muestra 0" in output
+        assert "muestra 3" in output
+        assert "muestra 1" not in output
+        assert output.count("limitado") == 5
+        assert "ERROR - apolo_11.limited - error final" in output
+    finally:
+        shutdown_logging()
+        for name in ('apolo_11.sampled', 'apolo_11.limited'):
+            logging.getLogger(name).filters.clear()
+        setup_logging()
+
+
+def test_log_per_file():
+    assert not log_per_file({})
+    assert not log_per_file({'logging': {'detail': 'cycle'}})
+    assert log_per_file({'logging': {'detail': 'file'}})
+
+
+def test_init_worker_logging_bypasses_queue(tmp_path, capsys):
+    config_path = tmp_path / 'config.yaml'
+    config_path.write_text(ASYNC_CONFIG)
+
+    try:
+        setup_logging(str(config_path))
+        init_worker_logging()
+
+        assert not any(isinstance(handler, logging.handlers.QueueHandler) for handler in logging.getLogger().handlers)
+        logging.getLogger('apolo_11.worker').warning("desde un proceso hijo")
+        assert "WARNING - apolo_11.worker - desde un proceso hijo" in capsys.readouterr().err
+    finally:
+        shutdown_logging()
+        setup_logging()
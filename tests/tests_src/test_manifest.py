@@ -0,0 +1,30 @@
+from apolo_11.src.manifest import MANIFEST_NAME, Manifest, ManifestEntry, build_manifest, read_manifest, write_manifest
+
+
+def test_manifest_round_trip(tmp_path):
+    (tmp_path / 'APLORBONE-0001.log').write_bytes(b'12345')
+    (tmp_path / 'APLSEG-0002.seg').write_bytes(b'123')
+    manifest = build_manifest(str(tmp_path), 7, [('APLORBONE-0001.log', 1), ('APLSEG-0002.seg', 4)],
+                              {'good': 3, 'unknown': 2})
+
+    path = write_manifest(str(tmp_path), manifest, fsync=True)
+
+    assert path == str(tmp_path / MANIFEST_NAME)
+    assert manifest.files == [ManifestEntry('APLORBONE-0001.log', 5, 1), ManifestEntry('APLSEG-0002.seg', 3, 4)]
+    assert manifest.records == 5
+    assert read_manifest(str(tmp_path)) == manifest
+
+
+def test_manifest_is_compact():
+    manifest = Manifest(1, [ManifestEntry('APLORBONE-0001.log', 120, 1)], {'good': 1})
+
+    assert manifest.to_json() == (b'{"version":1,"cycle":1,"files":[["APLORBONE-0001.log",120,1]],'
+                                  b'"status_counts":{"good":1}}')
+
+
+def test_missing_or_invalid_manifest(tmp_path):
+    assert read_manifest(str(tmp_path)) is None
+
+    for content in (b'not json', b'{"version": 99}', b'{"version": 1, "cycle": 1}'):
+        (tmp_path / MANIFEST_NAME).write_bytes(content)
+        assert read_manifest(str(tmp_path)) is None
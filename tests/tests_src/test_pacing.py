@@ -0,0 +1,119 @@
+import pytest
+
+from apolo_11.src.pacing import (ConstantProfile, DiurnalProfile, Pacer, RampProfile, SpikeProfile,
+                                 TokenBucket, load_profile)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_profiles_rate_at():
+    assert ConstantProfile(5).rate_at(1000) == 5
+
+    ramp = RampProfile(start_rate=0, end_rate=100, duration=10)
+    assert ramp.rate_at(0) == 0
+    assert ramp.rate_at(5) == 50
+    assert ramp.rate_at(60) == 100
+
+    spike = SpikeProfile(rate=5, spike_rate=50, spike_start=10, spike_duration=5)
+    assert spike.rate_at(9) == 5
+    assert spike.rate_at(12) == 50
+    assert spike.rate_at(15) == 5
+
+    diurnal = DiurnalProfile(rate=10, amplitude=20, period=40)
+    assert diurnal.rate_at(0) == pytest.approx(10)
+    assert diurnal.rate_at(10) == pytest.approx(30)
+    assert diurnal.rate_at(30) == 0
+
+
+def test_load_profile_from_config():
+    profiles = {
+        'steady': {'type': 'constant', 'rate': 7},
+        'up': {'type': 'ramp', 'start_rate': 1, 'end_rate': 9, 'duration': 60},
+        'odd': {'type': 'sawtooth', 'rate': 1},
+    }
+
+    assert load_profile('steady', profiles) == ConstantProfile(7)
+    assert load_profile('up', profiles) == RampProfile(1, 9, 60)
+    with pytest.raises(ValueError):
+        load_profile('odd', profiles)
+    with pytest.raises(KeyError):
+        load_profile('missing', profiles)
+
+
+def test_token_bucket_integrates_rate_and_caps_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(RampProfile(start_rate=0, end_rate=10, duration=10), burst=100, clock=clock)
+
+    clock.now += 10
+    assert bucket.take() == 50
+    assert bucket.minted == pytest.approx(50)
+
+    capped = TokenBucket(ConstantProfile(10), burst=2, clock=clock)
+    clock.now += 60
+    assert capped.take() == 20
+    assert capped.minted == pytest.approx(600)
+
+
+def test_pacer_sustains_target_rate():
+    clock = FakeClock()
+    pacer = Pacer(ConstantProfile(25), interval=2, clock=clock)
+
+    for _ in range(50):
+        clock.sleep(pacer.delay())
+        pacer.record(pacer.files_for_cycle())
+
+    stats = pacer.stats()
+    assert stats.target_rate == pytest.approx(25)
+    assert stats.achieved_rate == pytest.approx(25, rel=0.02)
+    assert pacer.missed_cycles == 0
+
+
+def test_pacer_corrects_drift_and_reports_saturation():
+    clock = FakeClock()
+    pacer = Pacer(ConstantProfile(10), interval=1, clock=clock)
+
+    # A cycle that takes part of the interval only sleeps for the remainder
+    clock.now += 0.3
+    clock.sleep(pacer.delay())
+    assert clock.sleeps == [pytest.approx(0.7)]
+
+    # A cycle that overruns two deadlines does not sleep and counts them as missed
+    clock.now += 2.5
+    assert pacer.delay() == 0
+    assert pacer.missed_cycles == 2
+
+    # The generator only managed a fraction of the target
+    pacer.record(5)
+    stats = pacer.stats()
+    assert stats.achieved_rate < stats.target_rate
+    assert stats.current_target_rate == 10
+
+
+def test_paused_pacer_keeps_target_rate_across_reporter_phases():
+    clock = FakeClock()
+    pacer = Pacer(ConstantProfile(25), interval=2, clock=clock)
+
+    for _ in range(10):
+        for _ in range(3):
+            pacer.record(pacer.files_for_cycle())
+            clock.sleep(pacer.delay())
+        # A synchronous reporter phase much longer than the token bucket holds
+        pacer.pause()
+        clock.now += 30
+        pacer.resume()
+
+    stats = pacer.stats()
+    assert pacer.missed_cycles == 0
+    assert stats.elapsed == pytest.approx(60)
+    assert stats.achieved_rate == pytest.approx(25, rel=0.05)
@@ -0,0 +1,93 @@
+import asyncio
+import os
+import threading
+import time
+
+from apolo_11.src.generator import CycleSummary
+from apolo_11.src.pipeline import AsyncPipeline
+
+
+class FakeReporter:
+    def __init__(self):
+        self.reported = []
+        self.threads = set()
+
+    def process_cycles(self, cycle_directories, backup_directory):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(0.03)
+        self.reported.extend(cycle_directories)
+
+
+def make_generate_cycle(tmp_path, generated, threads):
+    def generate_cycle():
+        threads.add(threading.current_thread().name)
+        time.sleep(0.01)
+        directory = str(tmp_path / f'cycle-{len(generated) + 1}-noreport')
+        os.makedirs(directory)
+        generated.append(directory)
+        return CycleSummary(len(generated), directory, 3)
+    return generate_cycle
+
+
+def test_pipeline_reports_every_cycle_on_stop(tmp_path):
+    generated, threads = [], set()
+    reporter_instance = FakeReporter()
+    dashboard_updates = []
+    pipeline = AsyncPipeline(make_generate_cycle(tmp_path, generated, threads), lambda: 0.01,
+                             reporter_instance, str(tmp_path), reporter_interval=0.05,
+                             update_dashboard=lambda: dashboard_updates.append(pipeline.files_generated))
+
+    async def run():
+        asyncio.get_running_loop().call_later(0.3, pipeline.stop)
+        await pipeline.run()
+
+    asyncio.run(run())
+
+    assert generated
+    assert reporter_instance.reported == generated
+    assert pipeline.files_generated == 3 * len(generated)
+    assert pipeline.cycles_reported == len(generated)
+    assert dashboard_updates[-1] == pipeline.files_generated
+    # Generation and reporting run on their own executor threads
+    assert threads.isdisjoint(reporter_instance.threads)
+
+
+def test_pipeline_overlaps_reporting_with_generation(tmp_path):
+    events = []
+
+    def generate_cycle():
+        events.append(('generate', time.monotonic()))
+        time.sleep(0.02)
+        return CycleSummary(1, str(tmp_path), 1)
+
+    class SlowReporter:
+        def process_cycles(self, cycle_directories, backup_directory):
+            start = time.monotonic()
+            time.sleep(0.1)
+            events.append(('report', start, time.monotonic()))
+
+    pipeline = AsyncPipeline(generate_cycle, lambda: 0, SlowReporter(), str(tmp_path), reporter_interval=0.05)
+
+    async def run():
+        asyncio.get_running_loop().call_later(0.4, pipeline.stop)
+        await pipeline.run()
+
+    asyncio.run(run())
+
+    reports = [event for event in events if event[0] == 'report']
+    generations = [event[1] for event in events if event[0] == 'generate']
+    assert any(start < generated < end for _, start, end in reports for generated in generations)
+
+
+def test_pipeline_stops_when_a_task_fails(tmp_path):
+    def failing_cycle():
+        raise OSError("disk full")
+
+    pipeline = AsyncPipeline(failing_cycle, lambda: 0, FakeReporter(), str(tmp_path), reporter_interval=10)
+
+    try:
+        asyncio.run(pipeline.run())
+    except OSError as error:
+        assert str(error) == "disk full"
+    else:
+        raise AssertionError("the generator error must propagate")
@@ -0,0 +1,63 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from apolo_11.src.publish import (check_durability, create_staging_directory, cycle_number, is_staging,
+                                  publish_directory, sweep_staging_directories)
+
+
+def test_create_staging_directory_is_hidden(tmp_path):
+    staging = create_staging_directory(str(tmp_path), 'cycle-1-20240101000000')
+
+    assert os.path.basename(staging) == '.cycle-1-20240101000000'
+    assert is_staging(os.path.basename(staging))
+    assert os.path.isdir(staging)
+
+
+@pytest.mark.parametrize('durability, fsyncs', [('none', 0), ('per-cycle', 4), ('per-file', 2)])
+def test_publish_directory_renames_and_syncs(tmp_path, durability, fsyncs):
+    staging = create_staging_directory(str(tmp_path), 'cycle-3-20240101000000')
+    for name in ('a.log', 'b.log'):
+        with open(os.path.join(staging, name), 'w') as file:
+            file.write(name)
+
+    with patch('apolo_11.src.publish.fsync_path', wraps=lambda path: None) as fsync_path:
+        published = publish_directory(staging, durability)
+
+    assert published == str(tmp_path / 'cycle-3-20240101000000-noreport')
+    assert sorted(os.listdir(published)) == ['a.log', 'b.log']
+    assert not os.path.exists(staging)
+    assert fsync_path.call_count == fsyncs
+
+
+def test_publish_directory_really_syncs(tmp_path):
+    staging = create_staging_directory(str(tmp_path), 'cycle-4-20240101000000')
+    (tmp_path / '.cycle-4-20240101000000' / 'a.log').write_text('a')
+
+    assert os.path.isdir(publish_directory(staging, 'per-cycle'))
+
+
+def test_check_durability():
+    assert check_durability('per-file') == 'per-file'
+    with pytest.raises(ValueError):
+        check_durability('sometimes')
+
+
+def test_cycle_number():
+    assert cycle_number('cycle-12-20240101000000-noreport') == 12
+    assert cycle_number('cycle-3-20240101000000') == 3
+    assert cycle_number('.cycle-4-20240101000000') is None
+    assert cycle_number('reports') is None
+
+
+def test_sweep_removes_only_unpublished_staging_directories(tmp_path):
+    interrupted = create_staging_directory(str(tmp_path), 'cycle-5-20240101000000')
+    open(os.path.join(interrupted, 'APLORBONE-0001.log'), 'w').close()
+    for name in ('.cycle-6-20240101000000-noreport', 'cycle-7-20240101000000-noreport', '.other'):
+        os.makedirs(tmp_path / name)
+
+    assert sweep_staging_directories(str(tmp_path)) == [interrupted]
+    assert sorted(os.listdir(tmp_path)) == ['.cycle-6-20240101000000-noreport', '.other',
+                                            'cycle-7-20240101000000-noreport']
+    assert sweep_staging_directories(str(tmp_path / 'missing')) == []
@@ -0,0 +1,114 @@
+import os
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from apolo_11.src.cycle_store import CycleSequence
+from apolo_11.src.generator import Generator
+from apolo_11.src.record_index import RecordIndex, file_key, main
+from apolo_11.src.reporter import Reporter
+
+DATE_FORMAT = '%d%m%y%H%M%S'
+
+
+def generate_cycle(tmp_path, name, output_mode='files', seed=3, files=30):
+    """Generate a published cycle under tmp_path/devices"""
+    generator_instance = Generator(seed=seed, output_mode=output_mode,
+                                   cycle_store=CycleSequence(str(tmp_path / f'{name}.db')))
+    staging = tmp_path / 'devices' / f'.{name}'
+    staging.mkdir(parents=True)
+    with patch.object(generator_instance, 'create_output_directory', return_value=str(staging)):
+        summary = generator_instance.generate_files(files, files)
+    generator_instance.close()
+    return summary
+
+
+def index_directory(directory, index_path, workers=1):
+    reporter_instance = Reporter(workers=workers, index_path=str(index_path))
+    reporter_instance.process_directory(str(directory))
+    reporter_instance.close()
+    return reporter_instance
+
+
+def test_file_key_survives_backup_move():
+    key = 'cycle-4-240101000000/APLORBONE-0001.log'
+    assert file_key('/devices/cycle-4-240101000000-noreport/APLORBONE-0001.log') == key
+    assert file_key('/devices/.cycle-4-240101000000-noreport/APLORBONE-0001.log') == key
+    assert file_key('/backups/cycle-4-240101000000/APLORBONE-0001.log') == key
+    assert file_key('/backups/cycle-4-250101000000/APLORBONE-0001.log') != key
+    assert file_key('/loose/APLORBONE-0001.log') == '/loose/APLORBONE-0001.log'
+
+
+@pytest.mark.parametrize('output_mode,workers', [('files', 1), ('binary', 1), ('files', 2)])
+def test_index_matches_reporter_counts(tmp_path, output_mode, workers):
+    generate_cycle(tmp_path, 'cycle-1-240101000000', output_mode)
+
+    reporter_instance = index_directory(tmp_path / 'devices', tmp_path / 'records.db', workers)
+
+    record_index = RecordIndex(str(tmp_path / 'records.db'), DATE_FORMAT)
+    assert record_index.count() == reporter_instance.records_processed == 30
+    statuses = {}
+    for (_, _), counts in reporter_instance.devices_reports.items():
+        for status, count in counts.items():
+            statuses[status] = statuses.get(status, 0) + count
+    assert record_index.count_by('device_status') == statuses
+    record_index.close()
+
+
+def test_backed_up_cycle_is_not_indexed_twice(tmp_path):
+    summary = generate_cycle(tmp_path, 'cycle-1-240101000000')
+    index_directory(tmp_path / 'devices', tmp_path / 'records.db')
+    os.makedirs(tmp_path / 'backups')
+    os.rename(summary.directory, tmp_path / 'backups' / 'cycle-1-240101000000')
+
+    reporter_instance = index_directory(tmp_path / 'backups', tmp_path / 'records.db')
+
+    assert reporter_instance.records_processed == 30
+    record_index = RecordIndex(str(tmp_path / 'records.db'), DATE_FORMAT)
+    assert record_index.count() == 30
+    record_index.close()
+
+
+def test_count_filters(tmp_path):
+    record_index = RecordIndex(str(tmp_path / 'records.db'), DATE_FORMAT, batch_size=2)
+    assert record_index.open_file('/devices/cycle-1-x-noreport/a.log')
+    record_index.add(b'010124000000', 'VacMars', 'Rover', 'faulty')
+    record_index.add(b'080124000000', 'VacMars', 'Rover', 'faulty')
+    record_index.add(b'080124000000', 'VacMars', 'Rover', 'good')
+    record_index.add(b'unknown', 'OrbitOne', 'unknown', 'unknown')
+    assert record_index.open_file('/devices/cycle-2-x-noreport/a.log')
+    assert record_index.records_indexed == 4
+    assert not record_index.open_file('/backups/cycle-1-x/a.log')
+
+    assert record_index.count(mission='VacMars', device_type='Rover', device_status='faulty') == 2
+    assert record_index.count(mission='VacMars', device_status='faulty', since=datetime(2024, 1, 5)) == 1
+    assert record_index.count(until=datetime(2024, 1, 5).timestamp()) == 1
+    assert record_index.count(mission='GalaxyTwo') == 0
+    assert record_index.count_by('mission') == {'VacMars': 3, 'OrbitOne': 1}
+    assert record_index.count_by('device_type', device_status='Unseen') == {}
+    with pytest.raises(ValueError):
+        record_index.count_by('date')
+    record_index.close()
+
+
+def test_query_cli(tmp_path, capsys):
+    record_index = RecordIndex(str(tmp_path / 'records.db'), DATE_FORMAT)
+    record_index.open_file('/devices/cycle-1-x-noreport/a.log')
+    record_index.add(b'010124000000', 'VacMars', 'Rover', 'faulty')
+    record_index.add(b'010124000000', 'VacMars', 'Satellite', 'faulty')
+    record_index.close()
+
+    main(['--index', str(tmp_path / 'records.db'), 'query', '--mission', 'VacMars', '--status', 'faulty'])
+    main(['--index', str(tmp_path / 'records.db'), 'query', '--by', 'device_type', '--since', '2024-01-01'])
+
+    assert capsys.readouterr().out.splitlines() == ['2', 'Rover\t1', 'Satellite\t1']
+
+
+def test_index_cli(tmp_path, capsys):
+    generate_cycle(tmp_path, 'cycle-1-240101000000', 'segment')
+
+    main(['--index', str(tmp_path / 'records.db'), 'index', str(tmp_path / 'devices')])
+    main(['--index', str(tmp_path / 'records.db'), 'query'])
+
+    assert capsys.readouterr().out.splitlines() == ['30 records processed', '30']
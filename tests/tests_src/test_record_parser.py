@@ -0,0 +1,49 @@
+import pytest
+
+from apolo_11.src.record_parser import RECORD_PATTERN, UNKNOWN, ParsedRecord, parse_lines, parse_record
+
+DEFAULT_RECORD = b"Date: 010123120000\nMission: OrbitOne\nDevice Type: Satellite\nDevice Status: good\nHash: 123"
+UNKNOWN_RECORD = (b"Date: 010123120000\nMission: Moon'sBallon\nDevice Type: unknown\nDevice Status: unknown\n"
+                  b"Hash: unknown\nID: 1b4e28ba-2fa1-41d2-883f-0016d3cca427")
+
+
+def test_parse_default_record():
+    assert RECORD_PATTERN.match(DEFAULT_RECORD)
+    assert parse_record(DEFAULT_RECORD) == ParsedRecord(b'010123120000', b'OrbitOne', b'Satellite', b'good',
+                                                        b'123', None)
+
+
+def test_parse_unknown_record_with_id():
+    record = parse_record(UNKNOWN_RECORD)
+
+    assert record.mission == b"Moon'sBallon"
+    assert (record.device_type, record.device_status, record.hash) == (UNKNOWN, UNKNOWN, UNKNOWN)
+    assert record.unique_id == b'1b4e28ba-2fa1-41d2-883f-0016d3cca427'
+
+
+@pytest.mark.parametrize('data', [
+    DEFAULT_RECORD,
+    UNKNOWN_RECORD,
+    DEFAULT_RECORD.replace(b'\n', b'\r\n'),
+    DEFAULT_RECORD.replace(b': ', b':   '),
+    b"Hash: 123\nDevice Status: good\nDevice Type: Satellite\nMission: OrbitOne\nDate: 010123120000",
+    DEFAULT_RECORD + b"\n",
+])
+def test_fast_path_and_line_path_agree(data):
+    assert parse_record(data) == parse_lines(data)
+
+
+def test_keys_match_exactly_and_first_occurrence_wins():
+    record = parse_record(b"Mission Control: Houston\nMission: OrbitOne\nMission: ColonyMoon\nDate: 01:02")
+
+    assert record.mission == b'OrbitOne'
+    assert record.date == b'01:02'
+
+
+def test_missing_and_empty_fields():
+    record = parse_record(b"Mission:\nThis is not a field")
+
+    assert record.mission == b''
+    assert (record.date, record.device_type, record.device_status, record.hash) == (UNKNOWN,) * 4
+    assert record.unique_id is None
+    assert parse_record(b'') == ParsedRecord(UNKNOWN, UNKNOWN, UNKNOWN, UNKNOWN, UNKNOWN, None)
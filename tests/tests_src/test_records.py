@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from apolo_11.src.records import (HEADER_LENGTH, RECORD_MAGIC, RecordSchema, decode_records, encode_records,
+                                  index_dtype, read_records)
+
+MISSIONS = ['OrbitOne', 'ColonyMoon', "Moon'sBallon"]
+TYPES = ['Satellite', 'Rover']
+STATUSES = ['good', 'faulty', 'unknown']
+DATE_FORMAT = '%d%m%y%H%M%S'
+UNIQUE_ID = '12345678-1234-4234-8234-123456789abc'
+
+
+def _encode(schema):
+    return encode_records(schema, '010123120000', np.array([1, 2, 3]), np.array([0, 1, 2], dtype=np.int16),
+                          np.array([1, 0, -1], dtype=np.int16), np.array([0, 1, -1], dtype=np.int16),
+                          np.array([11, 22, 0], dtype=np.uint64), {2: UNIQUE_ID})
+
+
+def test_index_dtype_is_smallest_signed_type():
+    assert index_dtype(5) == np.dtype('i1')
+    assert index_dtype(127) == np.dtype('i1')
+    assert index_dtype(128) == np.dtype('<i2')
+    assert index_dtype(70000) == np.dtype('<i4')
+
+
+def test_record_round_trip(tmp_path):
+    schema = RecordSchema(MISSIONS, TYPES, STATUSES, DATE_FORMAT)
+    data = _encode(schema)
+    path = tmp_path / 'APLREC-0001.rec'
+    path.write_bytes(data)
+
+    decoded_schema, rows = read_records(str(path))
+
+    assert decoded_schema.mission_names == MISSIONS
+    assert decoded_schema.dtype == schema.dtype
+    assert rows['file_number'].tolist() == [1, 2, 3]
+    assert rows['mission'].tolist() == [0, 1, 2]
+    assert rows['type'].tolist() == [1, 0, -1]
+    assert rows['status'].tolist() == [0, 1, -1]
+    assert rows['hash'].tolist() == [11, 22, 0]
+    assert bytes(rows['uuid'][2]).hex() == UNIQUE_ID.replace('-', '')
+    assert {decoded_schema.format_date(timestamp) for timestamp in rows['timestamp'].tolist()} == {'010123120000'}
+
+
+def test_rows_are_fixed_width_and_compact():
+    schema = RecordSchema(MISSIONS, TYPES, STATUSES, DATE_FORMAT, uuid_bytes=0)
+    header_size = len(RECORD_MAGIC) + HEADER_LENGTH.size + len(schema.to_header())
+
+    assert schema.dtype.itemsize == 23
+    assert 'uuid' not in schema.dtype.names
+    assert len(_encode(schema)) == header_size + 3 * 23
+
+
+@pytest.mark.parametrize('data', [b'not a record file', b'APLREC1\n'])
+def test_decode_rejects_invalid_data(data):
+    with pytest.raises(ValueError):
+        decode_records(data)
+
+
+def test_decode_rejects_truncated_rows():
+    with pytest.raises(ValueError):
+        decode_records(_encode(RecordSchema(MISSIONS, TYPES, STATUSES, DATE_FORMAT))[:-1])
+
+
+def test_invalid_uuid_bytes():
+    with pytest.raises(ValueError):
+        RecordSchema(MISSIONS, TYPES, STATUSES, DATE_FORMAT, uuid_bytes=17)
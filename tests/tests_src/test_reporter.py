@@ -1,7 +1,20 @@
+import json
 import os
+import pytest
 from tempfile import TemporaryDirectory
 from unittest.mock import patch
-from apolo_11.src.reporter import Reporter
+from apolo_11.src.reporter import Reporter, config
+from apolo_11.src.stats_output import read_time_series
+
+
+@pytest.fixture(autouse=True, scope='module')
+def results_directory(tmp_path_factory):
+    """Reports written by processing runs go to a temporary directory instead of apolo_11/results"""
+    results = tmp_path_factory.mktemp('results')
+    with patch.dict(config['routes'][0], {'results': str(results)}), \
+            patch.dict(config['routes'][3], {'reports': str(results / 'reports')}):
+        yield results
+
 
 def test_process_files():
     with TemporaryDirectory() as tmp_dir:
@@ -62,8 +75,9 @@ def test_move_folders_to_backup():
         os.makedirs(os.path.join(source_dir, 'cycle-1-noreport'))
         os.makedirs(os.path.join(source_dir, 'cycle-2'))
 
-        # Crear una instancia de Reporter y realizar el movimiento
+        # Crear una instancia de Reporter, reportar las carpetas y realizar el movimiento
         reporter_instance = Reporter()
+        reporter_instance.process_directory(source_dir)
         reporter_instance.move_folders_to_backup(source_dir, backup_dir)
 
         # Verificar que las carpetas esperadas se hayan movido al respaldo
@@ -102,7 +116,7 @@ Hash: 12345"""
         assert key in reporter_instance.devices_reports
         
         # Check that the device status was correctly extracted
-        assert reporter_instance.devices_reports[key] == ['excellent']
+        assert reporter_instance.devices_reports[key] == {'excellent': 1}
 
 
 def test_process_file_with_missing_fields():
@@ -124,7 +138,7 @@ Hash: 12345"""
         # Verify that missing fields are handled with "unknown"
         key = ('OrbitOne', 'unknown')
         assert key in reporter_instance.devices_reports
-        assert reporter_instance.devices_reports[key] == ['unknown']
+        assert reporter_instance.devices_reports[key] == {'unknown': 1}
 
 
 @patch('apolo_11.src.reporter.datetime')
@@ -141,8 +155,9 @@ def test_generate_stats_report(mock_datetime):
         reporter_instance = Reporter()
         
         # Add test data to devices_reports
-        reporter_instance.devices_reports[('OrbitOne', 'Satellite')] = ['excellent', 'good', 'unknown']
-        reporter_instance.devices_reports[('ColonyMoon', 'Spaceship')] = ['good', 'good']
+        for status in ('excellent', 'good', 'unknown'):
+            reporter_instance.devices_reports.add('OrbitOne', 'Satellite', status)
+        reporter_instance.devices_reports.add('ColonyMoon', 'Spaceship', 'good', 2)
         
         # Mock the config routes for reports directory
         with patch('apolo_11.src.reporter.config', {
@@ -188,6 +203,30 @@ def test_generate_stats_report(mock_datetime):
         assert 'Porcentaje:' in content
 
 
+@patch('apolo_11.src.reporter.datetime')
+def test_generate_stats_report_writes_json_csv_and_time_series(mock_datetime, tmp_path):
+    mock_datetime.now.return_value.strftime.return_value = '010123120000'
+    reporter_instance = Reporter()
+    reporter_instance.devices_reports.add('OrbitOne', 'Satellite', 'good', 3)
+    reporter_instance.devices_reports.add('OrbitOne', 'Satellite', 'unknown')
+    reporter_instance.records_processed = 4
+
+    with patch('apolo_11.src.reporter.config', {'routes': [None, None, None, {'reports': str(tmp_path)}],
+                                                'date_format': '%d%m%y%H%M%S'}):
+        reporter_instance.generate_stats_report()
+        reporter_instance.devices_reports.add('OrbitOne', 'Satellite', 'unknown')
+        reporter_instance.generate_stats_report()
+
+    assert sorted(os.listdir(tmp_path)) == ['APLSTATS-REPORT-010123120000.csv', 'APLSTATS-REPORT-010123120000.json',
+                                            'APLSTATS-REPORT-010123120000.log', 'APLSTATS-SERIES.csv']
+    stats = json.loads((tmp_path / 'APLSTATS-REPORT-010123120000.json').read_text(encoding='utf-8'))
+    assert stats['devices'][0]['statuses'] == {'good': 3, 'unknown': 2}
+    assert 'OrbitOne,Satellite,unknown,2' in (tmp_path / 'APLSTATS-REPORT-010123120000.csv').read_text()
+    assert [row[1:] for row in read_time_series(str(tmp_path / 'APLSTATS-SERIES.csv'))] == [
+        ('OrbitOne', 'Satellite', 'good', 3), ('OrbitOne', 'Satellite', 'unknown', 1),
+        ('OrbitOne', 'Satellite', 'unknown', 1)]
+
+
 def test_process_file_malformed_log():
     """Test process_file method with malformed log file
     
@@ -211,7 +250,7 @@ Device Type Satellite"""
         # Verify that malformed data is handled with "unknown"
         key = ('unknown', 'unknown')
         assert key in reporter_instance.devices_reports
-        assert reporter_instance.devices_reports[key] == ['unknown']
+        assert reporter_instance.devices_reports[key] == {'unknown': 1}
 
 
 def test_process_file_empty_log():
@@ -232,7 +271,7 @@ def test_process_file_empty_log():
         # Verify that empty file is handled with "unknown" values
         key = ('unknown', 'unknown')
         assert key in reporter_instance.devices_reports
-        assert reporter_instance.devices_reports[key] == ['unknown']
+        assert reporter_instance.devices_reports[key] == {'unknown': 1}
 
 
 def test_process_files_empty_directory():
@@ -351,6 +390,7 @@ def test_move_folders_respects_parameters(source_suffix, backup_suffix):
         os.makedirs(os.path.join(source_dir, test_folder_name))
 
         reporter_instance = Reporter()
+        reporter_instance.process_directory(source_dir)
         reporter_instance.move_folders_to_backup(source_dir, backup_dir)
 
         # Verify the folder was moved to the specified backup directory (not config default)
@@ -391,6 +431,7 @@ def test_noreport_suffix_transformation(folder_base_name):
         os.makedirs(os.path.join(source_dir, folder_with_suffix))
 
         reporter_instance = Reporter()
+        reporter_instance.process_directory(source_dir)
         reporter_instance.move_folders_to_backup(source_dir, backup_dir)
 
         # Verify the folder was renamed correctly (without -noreport suffix)
@@ -402,3 +443,402 @@ def test_noreport_suffix_transformation(folder_base_name):
         original_path = os.path.join(source_dir, folder_with_suffix)
         assert not os.path.exists(original_path), \
             f"Original folder '{folder_with_suffix}' should not exist after move"
+
+
+def test_process_segment_matches_per_file_processing():
+    """Segment records are counted exactly like the equivalent .log files"""
+    from apolo_11.src.segment import write_segment
+    records = [
+        ('APLORBONE-0001.log', "Date: 010123120000\nMission: OrbitOne\nDevice Type: Satellite\n"
+                               "Device Status: good\nHash: 1"),
+        ('APLCLNM-0002.log', "Date: 010123120000\nMission: ColonyMoon\nDevice Type: Rover\n"
+                             "Device Status: faulty\nHash: 2"),
+        ('APLUNKN-0003.log', "Date: 010123120000\nMission: Moon'sBallon\nDevice Type: unknown\n"
+                             "Device Status: unknown\nHash: unknown\nID: 42"),
+    ]
+    with TemporaryDirectory() as tmp_dir:
+        files_dir = os.path.join(tmp_dir, 'files')
+        segment_dir = os.path.join(tmp_dir, 'segment')
+        os.makedirs(files_dir)
+        os.makedirs(segment_dir)
+        for name, content in records:
+            with open(os.path.join(files_dir, name), 'w') as f:
+                f.write(content)
+        write_segment(os.path.join(segment_dir, 'APLSEG-0001.seg'), records)
+
+        per_file = Reporter()
+        per_file.process_files(files_dir, tmp_dir)
+        segmented = Reporter()
+        segmented.process_files(segment_dir, tmp_dir)
+
+        assert dict(segmented.devices_reports) == dict(per_file.devices_reports)
+        assert segmented.devices_reports[("Moon'sBallon", 'unknown')] == {'unknown': 1}
+
+
+def test_process_file_verifies_hash():
+    """With verify_hash, the Hash field of each record is recomputed and checked"""
+    from apolo_11.src.hashing import stable_hash
+    good_hash = stable_hash('010123120000', 'OrbitOne', 'Satellite', 'good')
+    with TemporaryDirectory() as tmp_dir:
+        paths = []
+        for name, hash_value in [('ok.log', good_hash), ('bad.log', good_hash + 1), ('unknown.log', 'unknown')]:
+            path = os.path.join(tmp_dir, name)
+            with open(path, 'w') as f:
+                f.write(f"Date: 010123120000\nMission: OrbitOne\nDevice Type: Satellite\n"
+                        f"Device Status: good\nHash: {hash_value}")
+            paths.append(path)
+
+        reporter_instance = Reporter(verify_hash=True)
+        for path in paths:
+            reporter_instance.process_file(path)
+
+        assert reporter_instance.hashes_checked == 2
+        assert reporter_instance.hash_mismatches == 1
+
+
+def test_generated_files_pass_hash_verification(tmp_path):
+    """Files written by the generator verify cleanly in any process"""
+    from apolo_11.src.cycle_store import CycleSequence
+    from apolo_11.src.generator import Generator
+    generator_instance = Generator(seed=11, cycle_store=CycleSequence(str(tmp_path / 'cycles.db')))
+    output_dir = tmp_path / 'cycle'
+    output_dir.mkdir()
+    with patch.object(Generator, 'create_output_directory', return_value=str(output_dir)):
+        summary = generator_instance.generate_files(40, 40)
+
+    reporter_instance = Reporter(verify_hash=True)
+    for name in os.listdir(summary.directory):
+        reporter_instance.process_file(os.path.join(summary.directory, name))
+
+    assert reporter_instance.hashes_checked > 0
+    assert reporter_instance.hash_mismatches == 0
+
+
+def test_process_cycles_reports_and_backs_up_given_cycles():
+    """process_cycles only touches the cycle directories it is given"""
+    with TemporaryDirectory() as tmp_dir:
+        devices_dir = os.path.join(tmp_dir, 'devices')
+        backup_dir = os.path.join(tmp_dir, 'backup')
+        finished = os.path.join(devices_dir, 'cycle-1-20230101120000-noreport')
+        in_progress = os.path.join(devices_dir, 'cycle-2-20230101120020-noreport')
+        for directory in (finished, in_progress, backup_dir):
+            os.makedirs(directory)
+        generate_test_files(finished)
+        generate_test_files(in_progress)
+
+        reporter_instance = Reporter()
+        reporter_instance.process_cycles([finished], backup_dir)
+
+        assert reporter_instance.devices_reports.total() == 2
+        assert os.listdir(backup_dir) == ['cycle-1-20230101120000']
+        assert os.path.exists(in_progress)
+        assert reporter_instance.last_report_time is not None
+
+
+def test_process_record_file_matches_text_processing(tmp_path):
+    """Binary records are counted and verified exactly like the equivalent text files"""
+    from apolo_11.src.cycle_store import CycleSequence
+    from apolo_11.src.generator import Generator
+    directories = {}
+    for output_mode in ('files', 'binary'):
+        generator_instance = Generator(seed=21, output_mode=output_mode,
+                                       cycle_store=CycleSequence(str(tmp_path / f'{output_mode}.db')))
+        directories[output_mode] = tmp_path / output_mode
+        directories[output_mode].mkdir()
+        batch = generator_instance.generate_batch(200)
+        generator_instance.write_batch(str(directories[output_mode]), batch)
+
+    assert os.listdir(directories['binary']) == ['APLREC-0001.rec']
+
+    text = Reporter(verify_hash=True)
+    text.process_directory(str(directories['files']))
+    binary = Reporter(verify_hash=True)
+    binary.process_directory(str(directories['binary']))
+
+    assert dict(binary.devices_reports) == dict(text.devices_reports)
+    assert binary.records_processed == 200
+    assert binary.hashes_checked == text.hashes_checked
+    assert binary.hash_mismatches == 0
+
+
+def test_verify_record_hashes_detects_mismatches():
+    """Tampered binary hashes are counted as mismatches"""
+    import numpy as np
+    from apolo_11.src.hashing import stable_hash
+    from apolo_11.src.records import RecordSchema, decode_records, encode_records
+    schema = RecordSchema(['OrbitOne'], ['Satellite'], ['good'], '%d%m%y%H%M%S')
+    good_hash = stable_hash('010123120000', 'OrbitOne', 'Satellite', 'good')
+    data = encode_records(schema, '010123120000', np.array([1, 2]), np.zeros(2, dtype=np.int16),
+                          np.zeros(2, dtype=np.int16), np.zeros(2, dtype=np.int16),
+                          np.array([good_hash, good_hash + 1], dtype=np.uint64), {})
+
+    reporter_instance = Reporter(verify_hash=True)
+    reporter_instance.process_records(*decode_records(data))
+
+    assert reporter_instance.hashes_checked == 2
+    assert reporter_instance.hash_mismatches == 1
+    assert reporter_instance.devices_reports[('OrbitOne', 'Satellite')] == {'good': 2}
+
+
+@pytest.mark.parametrize('output_mode', ['files', 'segment', 'binary'])
+def test_compressed_output_is_processed_transparently(tmp_path, output_mode):
+    """Compressed cycle output is detected and counted like uncompressed output"""
+    from apolo_11.src.cycle_store import CycleSequence
+    from apolo_11.src.generator import Generator
+    reports = {}
+    for compression in ('none', 'gzip'):
+        generator_instance = Generator(seed=4, output_mode=output_mode, compression=compression,
+                                       cycle_store=CycleSequence(str(tmp_path / f'{compression}.db')))
+        directory = tmp_path / compression
+        directory.mkdir()
+        generator_instance.write_batch(str(directory), generator_instance.generate_batch(30))
+        reporter_instance = Reporter(verify_hash=True)
+        reporter_instance.process_directory(str(directory))
+        reports[compression] = reporter_instance
+
+    assert all(name.endswith('.gz') for name in os.listdir(tmp_path / 'gzip'))
+    assert reports['gzip'].records_processed == 30
+    assert reports['gzip'].hash_mismatches == 0
+    assert dict(reports['gzip'].devices_reports) == dict(reports['none'].devices_reports)
+
+
+def test_staging_directories_are_skipped(tmp_path):
+    """Cycles still being written in hidden staging directories are neither reported nor moved"""
+    devices = tmp_path / 'devices'
+    backups = tmp_path / 'backups'
+    for directory in ('.cycle-2-20240101000000', 'cycle-1-20240101000000-noreport'):
+        (devices / directory).mkdir(parents=True)
+        (devices / directory / 'APLORBONE-0001.log').write_text(
+            "Date: 010123120000\nMission: OrbitOne\nDevice Type: Satellite\nDevice Status: good\nHash: 1")
+    backups.mkdir()
+
+    reporter_instance = Reporter()
+    reporter_instance.process_directory(str(devices))
+    reporter_instance.move_folders_to_backup(str(devices), str(backups))
+
+    assert reporter_instance.records_processed == 1
+    assert os.listdir(devices) == ['.cycle-2-20240101000000']
+    assert os.listdir(backups) == ['cycle-1-20240101000000']
+
+
+@pytest.mark.parametrize('output_mode', ['files', 'segment', 'binary'])
+def test_parallel_processing_matches_serial(tmp_path, output_mode):
+    """Files split across worker processes give exactly the serial counts"""
+    from apolo_11.src.cycle_store import CycleSequence
+    from apolo_11.src.generator import Generator
+    generator_instance = Generator(seed=13, output_mode=output_mode,
+                                   cycle_store=CycleSequence(str(tmp_path / 'cycles.db')))
+    cycle_directories = []
+    for number in range(1, 4):
+        directory = tmp_path / 'devices' / f'cycle-{number}-noreport'
+        directory.mkdir(parents=True)
+        generator_instance.write_batch(str(directory), generator_instance.generate_batch(40))
+        cycle_directories.append(str(directory))
+
+    serial = Reporter(verify_hash=True, workers=1)
+    serial.process_directory(str(tmp_path / 'devices'))
+    parallel = Reporter(verify_hash=True, workers=3)
+    try:
+        parallel.process_directory(str(tmp_path / 'devices'))
+        by_cycles = Reporter(verify_hash=True, workers=2)
+        with patch.object(by_cycles, 'generate_stats_report'), patch.object(by_cycles, 'move_folder_to_backup'):
+            by_cycles.process_cycles(cycle_directories, str(tmp_path / 'backups'))
+    finally:
+        parallel.close()
+        by_cycles.close()
+
+    assert dict(parallel.devices_reports) == dict(serial.devices_reports)
+    assert (parallel.records_processed, parallel.hashes_checked, parallel.hash_mismatches) == \
+        (serial.records_processed, serial.hashes_checked, serial.hash_mismatches)
+    assert by_cycles.records_processed == 120
+    assert dict(by_cycles.devices_reports) == dict(serial.devices_reports)
+
+
+def test_invalid_reporter_workers():
+    with pytest.raises(ValueError):
+        Reporter(workers=0)
+
+
+def test_checkpoint_skips_reported_cycles_and_warm_starts(tmp_path):
+    """Cycles counted and not yet backed up are skipped and a new reporter resumes from the saved counts"""
+    devices = tmp_path / 'devices'
+    record = "Date: 010123120000\nMission: OrbitOne\nDevice Type: Satellite\nDevice Status: good\nHash: 1"
+    for number in (1, 2):
+        (devices / f'cycle-{number}-20240101000000-noreport').mkdir(parents=True)
+        (devices / f'cycle-{number}-20240101000000-noreport' / 'APLORBONE-0001.log').write_text(record)
+    checkpoint_path = str(tmp_path / 'reporter.npz')
+
+    first = Reporter(checkpoint_path=checkpoint_path)
+    first.process_directory(str(devices))
+    first.save_checkpoint()
+    (devices / 'cycle-3-20240101000000-noreport').mkdir()
+    (devices / 'cycle-3-20240101000000-noreport' / 'APLORBONE-0001.log').write_text(record)
+
+    resumed = Reporter(checkpoint_path=checkpoint_path)
+    assert resumed.records_processed == 2
+    assert resumed.reported == {'cycle-1-20240101000000', 'cycle-2-20240101000000'}
+    with patch.object(resumed, 'process_path', wraps=resumed.process_path) as process_path:
+        resumed.process_directory(str(devices))
+
+    assert [os.path.basename(os.path.dirname(call.args[0])) for call in process_path.call_args_list] == \
+        ['cycle-3-20240101000000-noreport']
+    assert 'cycle-3-20240101000000' in resumed.reported
+    assert resumed.devices_reports[('OrbitOne', 'Satellite')] == {'good': 3}
+
+
+def test_process_cycles_saves_checkpoint_and_skips_reported(tmp_path):
+    """process_cycles counts each cycle once and saves the checkpoint before the backup move"""
+    cycle = tmp_path / 'devices' / 'cycle-5-20240101000000-noreport'
+    cycle.mkdir(parents=True)
+    generate_test_files(str(cycle))
+    checkpoint_path = str(tmp_path / 'reporter.npz')
+
+    reporter_instance = Reporter(checkpoint_path=checkpoint_path)
+    with patch.object(reporter_instance, 'generate_stats_report'), \
+            patch.object(reporter_instance, 'move_folder_to_backup'):
+        reporter_instance.process_cycles([str(cycle)], str(tmp_path))
+        reporter_instance.process_cycles([str(cycle)], str(tmp_path))
+
+    assert reporter_instance.records_processed == 2
+    assert Reporter(checkpoint_path=checkpoint_path).reported == {'cycle-5-20240101000000'}
+
+
+def generate_cycle(tmp_path, name, output_mode='files', seed=8, files=20):
+    """Generate a published cycle with its manifest under tmp_path/devices"""
+    from apolo_11.src.cycle_store import CycleSequence
+    from apolo_11.src.generator import Generator
+    generator_instance = Generator(seed=seed, output_mode=output_mode,
+                                   cycle_store=CycleSequence(str(tmp_path / f'{name}.db')))
+    staging = tmp_path / 'devices' / f'.{name}'
+    staging.mkdir(parents=True)
+    with patch.object(generator_instance, 'create_output_directory', return_value=str(staging)):
+        summary = generator_instance.generate_files(files, files)
+    generator_instance.close()
+    return summary
+
+
+@pytest.mark.parametrize('output_mode', ['files', 'segment', 'binary'])
+def test_manifest_lists_cycle_files_without_walking(tmp_path, output_mode):
+    """Cycles with a manifest are listed from it and counted exactly like a walk"""
+    summary = generate_cycle(tmp_path, 'cycle-1-20240101000000', output_mode)
+
+    walked = Reporter(verify_hash=True)
+    walked.process_paths(walked.discover_files(summary.directory))
+    from_manifest = Reporter(verify_hash=True)
+    with patch('apolo_11.src.reporter.os.walk', wraps=os.walk) as walk:
+        from_manifest.process_directory(str(tmp_path / 'devices'))
+
+    assert [call.args[0] for call in walk.call_args_list] == [str(tmp_path / 'devices')]
+    assert dict(from_manifest.devices_reports) == dict(walked.devices_reports)
+    assert from_manifest.records_processed == 20
+    assert from_manifest.hash_mismatches == 0
+    assert (from_manifest.incomplete_files, from_manifest.expected_files) == (0, {})
+
+
+def test_manifest_detects_incomplete_files(tmp_path):
+    """Files missing, truncated or short of records are reported as incomplete"""
+    summary = generate_cycle(tmp_path, 'cycle-2-20240101000000', 'files', files=5)
+    names = sorted(name for name in os.listdir(summary.directory) if name.endswith('.log'))
+    os.remove(os.path.join(summary.directory, names[0]))
+    with open(os.path.join(summary.directory, names[1]), 'ab') as file:
+        file.write(b'\n')
+
+    reporter_instance = Reporter()
+    reporter_instance.process_cycles([summary.directory], str(tmp_path / 'backups'))
+
+    assert reporter_instance.incomplete_files == 2
+    assert reporter_instance.records_processed == 3
+
+
+def test_parallel_processing_merges_manifest_checks(tmp_path):
+    """Worker processes check the manifest entries of their chunk"""
+    summary = generate_cycle(tmp_path, 'cycle-3-20240101000000', 'files', files=12)
+    name = sorted(name for name in os.listdir(summary.directory) if name.endswith('.log'))[0]
+    with open(os.path.join(summary.directory, name), 'ab') as file:
+        file.write(b'\n')
+
+    reporter_instance = Reporter(workers=2)
+    try:
+        reporter_instance.process_paths(reporter_instance.cycle_files(summary.directory))
+    finally:
+        reporter_instance.close()
+
+    assert (reporter_instance.records_processed, reporter_instance.incomplete_files) == (11, 1)
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_rolling_windows_count_each_cycle_once(tmp_path, workers):
+    """Cycles split across worker chunks enter the rolling windows as one cycle each"""
+    from apolo_11.src.cycle_store import CycleSequence
+    from apolo_11.src.generator import Generator
+    generator_instance = Generator(seed=21, cycle_store=CycleSequence(str(tmp_path / 'cycles.db')))
+    for number in range(1, 4):
+        directory = tmp_path / 'devices' / f'cycle-{number}-noreport'
+        directory.mkdir(parents=True)
+        generator_instance.write_batch(str(directory), generator_instance.generate_batch(30))
+
+    reporter_instance = Reporter(workers=workers)
+    try:
+        reporter_instance.process_directory(str(tmp_path / 'devices'))
+    finally:
+        reporter_instance.close()
+
+    summary = reporter_instance.window_summary()
+    assert summary['last_10_cycles']['cycles'] == 3
+    assert summary['last_10_cycles']['records'] == summary['last_hour']['records'] == 90
+    assert (reporter_instance.windows.windows['last_day'].totals == reporter_instance.devices_reports.counts).all()
+
+
+@patch('apolo_11.src.reporter.datetime')
+def test_generate_stats_report_includes_rolling_windows(mock_datetime, tmp_path):
+    mock_datetime.now.return_value.strftime.return_value = '010123120000'
+    reporter_instance = Reporter()
+    reporter_instance.devices_reports.add('OrbitOne', 'Satellite', 'good', 3)
+    reporter_instance.devices_reports.add('OrbitOne', 'Satellite', 'unknown')
+    reporter_instance.track_cycle('cycle-1')
+    reporter_instance.devices_reports.add('OrbitOne', 'Satellite', 'unknown')
+    reporter_instance.update_windows()
+
+    with patch('apolo_11.src.reporter.config', {'routes': [None, None, None, {'reports': str(tmp_path)}],
+                                                'date_format': '%d%m%y%H%M%S'}):
+        reporter_instance.generate_stats_report()
+
+    content = (tmp_path / 'APLSTATS-REPORT-010123120000.log').read_text(encoding='utf-8')
+    assert 'Ventanas móviles:' in content
+    assert 'Ventana: last_hour, Ciclos: 1, Registros: 1, Desconexiones (unknown): 1, Porcentaje: 0.00%' in content
+    stats = json.loads((tmp_path / 'APLSTATS-REPORT-010123120000.json').read_text(encoding='utf-8'))
+    assert stats['windows']['last_10_cycles']['records'] == 1
+
+
+def test_cycles_published_out_of_order_are_counted_and_backed_up_once(tmp_path):
+    """A cycle numbered below one already reported is still counted, and only counted cycles are moved"""
+    devices = tmp_path / 'devices'
+    backups = tmp_path / 'backups'
+    backups.mkdir()
+    record = "Date: 010123120000\nMission: OrbitOne\nDevice Type: Satellite\nDevice Status: good\nHash: 1"
+
+    def publish(number):
+        (devices / f'cycle-{number}-20240101000000-noreport').mkdir(parents=True)
+        (devices / f'cycle-{number}-20240101000000-noreport' / 'APLORBONE-0001.log').write_text(record)
+
+    checkpoint_path = str(tmp_path / 'reporter.npz')
+    reporter_instance = Reporter(checkpoint_path=checkpoint_path)
+    publish(17)
+    reporter_instance.process_directory(str(devices))
+    reporter_instance.save_checkpoint()
+    # Published by another generator process after cycle 17 was counted, before the backup move
+    publish(2)
+    reporter_instance.move_folders_to_backup(str(devices), str(backups))
+
+    assert os.listdir(devices) == ['cycle-2-20240101000000-noreport']
+    assert os.listdir(backups) == ['cycle-17-20240101000000']
+    assert reporter_instance.reported == set()
+
+    resumed = Reporter(checkpoint_path=checkpoint_path)
+    assert resumed.reported == {'cycle-17-20240101000000'}
+    resumed.process_directory(str(devices))
+    resumed.move_folders_to_backup(str(devices), str(backups))
+
+    assert resumed.records_processed == 2
+    assert sorted(os.listdir(backups)) == ['cycle-17-20240101000000', 'cycle-2-20240101000000']
+    assert resumed.reported == set()
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from apolo_11.src.rolling import RollingWindows, cycle_deltas_by_directory
+from apolo_11.src.status_counts import StatusCounts
+
+WINDOWS = [{'name': 'last_3_cycles', 'cycles': 3}, {'name': 'last_minute', 'seconds': 60}]
+
+
+def make_counts():
+    return StatusCounts(['OrbitOne'], ['Satellite'], ['good', 'unknown'])
+
+
+def cycle(good, unknown):
+    return np.array([[[good, unknown]]], dtype=np.int64)
+
+
+def test_count_window_keeps_last_cycles():
+    windows = RollingWindows((1, 1, 2), WINDOWS)
+    for number in range(1, 6):
+        windows.add(cycle(number, 1), 1000.0 + number)
+
+    assert windows.held('last_3_cycles') == 3
+    assert windows.windows['last_3_cycles'].totals.tolist() == [[[3 + 4 + 5, 3]]]
+    assert windows.held('last_minute') == 5
+
+
+def test_time_window_expires_old_cycles():
+    windows = RollingWindows((1, 1, 2), WINDOWS)
+    windows.add(cycle(1, 0), 1000.0)
+    windows.add(cycle(2, 0), 1030.0)
+    windows.add(cycle(4, 0), 1070.0)
+
+    assert windows.windows['last_minute'].totals.tolist() == [[[6, 0]]]
+    windows.expire(1095.0)
+    assert windows.windows['last_minute'].totals.tolist() == [[[4, 0]]]
+    windows.expire(1200.0)
+    assert (windows.held('last_minute'), windows.windows['last_minute'].totals.sum()) == (0, 0)
+    assert windows.held('last_3_cycles') == 3
+
+
+def test_capacity_bounds_every_window():
+    windows = RollingWindows((1, 1, 2), WINDOWS, capacity=2)
+    for number in range(1, 5):
+        windows.add(cycle(number, 0), 1000.0)
+
+    assert windows.held('last_3_cycles') == windows.held('last_minute') == 2
+    assert windows.windows['last_minute'].totals.tolist() == [[[7, 0]]]
+
+
+def test_windows_match_recomputation_from_history():
+    rng = np.random.default_rng(3)
+    windows = RollingWindows((2, 3, 4), [{'name': 'cycles', 'cycles': 7}, {'name': 'time', 'seconds': 50}],
+                             capacity=16)
+    history = []
+    now = 0.0
+    for _ in range(200):
+        now += float(rng.integers(1, 10))
+        counts = rng.integers(0, 100, size=(2, 3, 4))
+        history.append((now, counts))
+        windows.add(counts, now)
+
+        assert np.array_equal(windows.windows['cycles'].totals, sum(counts for _, counts in history[-7:]))
+        recent = [counts for timestamp, counts in history[-16:] if timestamp > now - 50]
+        assert np.array_equal(windows.windows['time'].totals, sum(recent))
+
+
+def test_summary_and_counts():
+    like = make_counts()
+    windows = RollingWindows(like.counts.shape, WINDOWS)
+    counts = make_counts()
+    counts.counts[0, 0] = [3, 1]
+    windows.add(counts.counts, 1000.0)
+
+    assert windows.summary(like)['last_3_cycles'] == {
+        'cycles': 1, 'records': 4, 'disconnections': 1, 'operational_percentage': 75.0}
+    assert windows.counts('last_minute', like)[('OrbitOne', 'Satellite')] == {'good': 3, 'unknown': 1}
+
+
+def test_invalid_windows():
+    with pytest.raises(ValueError):
+        RollingWindows((1, 1, 2), [{'name': 'forever'}])
+    with pytest.raises(ValueError):
+        RollingWindows((1, 1, 2), WINDOWS, capacity=0)
+
+
+def test_cycle_deltas_by_directory_merges_split_cycles():
+    deltas = [('cycle-1', cycle(1, 0)), ('cycle-1', cycle(2, 1)), ('cycle-2', cycle(5, 0)), ('cycle-1', cycle(1, 0))]
+
+    assert [counts.tolist() for counts in cycle_deltas_by_directory(deltas)] == \
+        [[[[3, 1]]], [[[5, 0]]], [[[1, 0]]]]
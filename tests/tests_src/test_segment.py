@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from apolo_11.src.segment import SegmentWriter, encode_segment, iter_segment_data, read_segment, write_segment
+
+
+def test_segment_round_trip(tmpdir):
+    segment_path = os.path.join(str(tmpdir), 'APLSEG-0001.seg')
+    records = [
+        ('APLORBONE-0001.log', 'Mission: OrbitOne\nDevice Status: good'),
+        ('APLUNKN-0002.log', b'Mission: Moon\'sBallon\nID: 1234'),
+        ('APLCLNM-0003.log', ''),
+    ]
+
+    assert write_segment(segment_path, records) == 3
+
+    result = list(read_segment(segment_path))
+
+    assert [name for name, _ in result] == [name for name, _ in records]
+    assert result[0][1] == b'Mission: OrbitOne\nDevice Status: good'
+    assert result[1][1] == b'Mission: Moon\'sBallon\nID: 1234'
+    assert result[2][1] == b''
+
+
+def test_empty_segment(tmpdir):
+    segment_path = os.path.join(str(tmpdir), 'empty.seg')
+    with SegmentWriter(segment_path) as writer:
+        assert writer.count == 0
+
+    assert list(read_segment(segment_path)) == []
+
+
+def test_close_is_idempotent(tmpdir):
+    segment_path = os.path.join(str(tmpdir), 'twice.seg')
+    writer = SegmentWriter(segment_path)
+    writer.append('a.log', 'a')
+    writer.close()
+    writer.close()
+
+    assert list(read_segment(segment_path)) == [('a.log', b'a')]
+
+
+@pytest.mark.parametrize('data', [b'', b'not a segment at all', b'APLSEG1\n' + b'\x00' * 20])
+def test_invalid_segment_data(data):
+    with pytest.raises(ValueError):
+        list(iter_segment_data(data))
+
+
+def test_encode_segment_matches_written_segment(tmpdir):
+    segment_path = os.path.join(str(tmpdir), 'APLSEG-0001.seg')
+    records = [('APLORBONE-0001.log', b'Mission: OrbitOne'), ('APLCLNM-0002.log', b'Mission: ColonyMoon')]
+    write_segment(segment_path, records)
+
+    with open(segment_path, 'rb') as segment:
+        assert encode_segment(records) == segment.read()
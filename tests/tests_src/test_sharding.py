@@ -0,0 +1,102 @@
+import os
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from apolo_11.src.cycle_store import CycleSequence
+from apolo_11.src.fleet import DeviceFleet
+from apolo_11.src.manifest import MANIFEST_NAME, read_manifest
+from apolo_11.src.segment import read_segment
+from apolo_11.src.sharding import ShardResult, ShardedGenerator, merge_shard_results, split_range
+
+
+def test_split_range_is_contiguous_and_disjoint():
+    ranges = split_range(10, 3)
+
+    assert ranges == [(1, 4), (5, 3), (8, 3)]
+    assert split_range(2, 4) == [(1, 1), (2, 1)]
+    assert split_range(0, 2) == []
+    assert split_range(5, 1, start_number=11) == [(11, 5)]
+
+
+def test_merge_shard_results():
+    summary = merge_shard_results(7, '/cycle', [
+        ShardResult(0, 3, {'good': 2, 'unknown': 1}),
+        ShardResult(1, 2, {'good': 1, 'faulty': 1}),
+    ])
+
+    assert summary.cycle == 7
+    assert summary.files_count == 5
+    assert summary.status_counts == {'good': 3, 'unknown': 1, 'faulty': 1}
+
+
+@pytest.mark.parametrize('output_mode', ['files', 'segment'])
+def test_sharded_cycle_has_unique_file_numbers(tmp_path, output_mode):
+    sharded = ShardedGenerator(3, seed=1, output_mode=output_mode,
+                               cycle_store=CycleSequence(str(tmp_path / 'cycles.db')))
+    sharded.create_output_directory = lambda times_stamp, cycle: str(tmp_path / f'cycle-{cycle}')
+    for cycle in (1, 2):
+        os.makedirs(tmp_path / f'cycle-{cycle}')
+
+    try:
+        first = sharded.generate_files(50, 50)
+        second = sharded.generate_files(20, 20)
+    finally:
+        sharded.close()
+
+    assert (first.cycle, second.cycle) == (1, 2)
+    assert first.files_count == 50
+    assert sum(first.status_counts.values()) == 50
+
+    if output_mode == 'segment':
+        segments = sorted(name for name in os.listdir(first.directory) if name != MANIFEST_NAME)
+        assert segments == ['APLSEG-0001.seg', 'APLSEG-0018.seg', 'APLSEG-0035.seg']
+        names = [name for segment in segments
+                 for name, _ in read_segment(os.path.join(first.directory, segment))]
+    else:
+        names = [name for name in os.listdir(first.directory) if name != MANIFEST_NAME]
+    manifest = read_manifest(first.directory)
+    assert (manifest.cycle, manifest.records, manifest.status_counts) == (1, 50, first.status_counts)
+    assert sorted(entry.name for entry in manifest.files) == sorted(set(os.listdir(first.directory)) - {MANIFEST_NAME})
+
+    numbers = Counter(int(name.rsplit('-', 1)[1][:-4]) for name in names)
+    assert sorted(numbers) == list(range(1, 51))
+    assert set(numbers.values()) == {1}
+
+
+def test_shard_seeds_are_reproducible_and_distinct(tmp_path):
+    store = CycleSequence(str(tmp_path / 'cycles.db'))
+    first = ShardedGenerator(2, seed=5, cycle_store=store)
+    second = ShardedGenerator(2, seed=5, cycle_store=store)
+
+    assert first.shard_seed(1, 0).generate_state(2).tolist() == second.shard_seed(1, 0).generate_state(2).tolist()
+    assert first.shard_seed(1, 0).generate_state(2).tolist() != first.shard_seed(1, 1).generate_state(2).tolist()
+
+
+def test_invalid_shards():
+    with pytest.raises(ValueError):
+        ShardedGenerator(0)
+
+
+def test_sharded_cycle_draws_from_parent_fleet(tmp_path):
+    statuses = 6
+    fleet = DeviceFleet(np.zeros(4, dtype=np.int16), np.full(4, 2, dtype=np.int16),
+                        np.full(4, 3, dtype=np.int16), np.eye(statuses), np.random.default_rng(0))
+    sharded = ShardedGenerator(2, seed=1, fleet=fleet, cycle_store=CycleSequence(str(tmp_path / 'cycles.db')))
+    cycle_directory = tmp_path / 'cycle'
+    cycle_directory.mkdir()
+    sharded.create_output_directory = lambda times_stamp, cycle: str(cycle_directory)
+
+    try:
+        summary = sharded.generate_files(10, 10)
+    finally:
+        sharded.close()
+
+    status = sharded.device_instance.status[3]
+    assert summary.status_counts == {status: 10}
+    assert fleet.cycle == summary.cycle
+    names = [name for name in os.listdir(summary.directory) if name != MANIFEST_NAME]
+    assert len(names) == 10
+    assert all(f"Device Type: {sharded.device_instance.type[2]}" in open(os.path.join(summary.directory, name)).read()
+               for name in names)
@@ -0,0 +1,70 @@
+import csv
+import json
+import os
+
+from apolo_11.src.stats_output import (append_time_series, count_cells, operational_percentage, read_time_series,
+                                       stats_csv, stats_json)
+from apolo_11.src.status_counts import StatusCounts
+
+
+def new_counts():
+    counts = StatusCounts(['OrbitOne', 'ColonyMoon'], ['Satellite'], ['good'])
+    counts.add('OrbitOne', 'Satellite', 'good', 3)
+    counts.add('OrbitOne', 'Satellite', 'unknown')
+    counts.add('ColonyMoon', 'Satellite', 'good', 2)
+    return counts
+
+
+def test_operational_percentage():
+    assert operational_percentage({'good': 3, 'unknown': 1}) == 75.0
+    assert operational_percentage({}) == 0.0
+
+
+def test_stats_json():
+    stats = json.loads(stats_json(list(new_counts().items()), 6, 1700000000.0))
+
+    assert (stats['records_processed'], stats['inoperable_devices']) == (6, 1)
+    assert stats['devices'][0] == {'mission': 'OrbitOne', 'device_type': 'Satellite',
+                                   'statuses': {'good': 3, 'unknown': 1}, 'disconnections': 1,
+                                   'operational_percentage': 75.0}
+
+
+def test_stats_csv():
+    rows = list(csv.reader(stats_csv(list(new_counts().items())).splitlines()))
+
+    assert rows == [['mission', 'device_type', 'status', 'count'],
+                    ['OrbitOne', 'Satellite', 'good', '3'],
+                    ['OrbitOne', 'Satellite', 'unknown', '1'],
+                    ['ColonyMoon', 'Satellite', 'good', '2']]
+
+
+def test_time_series_appends_the_cells_changed_by_each_run(tmp_path):
+    path = str(tmp_path / 'series.csv')
+    counts = new_counts()
+    first = count_cells(list(counts.items()))
+    assert append_time_series(path, 100.0, first, {}) == 3
+    counts.add('OrbitOne', 'Satellite', 'good')
+    counts.add('ColonyMoon', 'Satellite', 'unknown', 4)
+    counts.add('VacMars', 'Rover', 'good')
+    second = count_cells(list(counts.items()))
+    assert append_time_series(path, 200.0, second, first) == 3
+    assert append_time_series(path, 300.0, second, second) == 0
+
+    assert read_time_series(path) == [
+        (100.0, 'OrbitOne', 'Satellite', 'good', 3),
+        (100.0, 'OrbitOne', 'Satellite', 'unknown', 1),
+        (100.0, 'ColonyMoon', 'Satellite', 'good', 2),
+        (200.0, 'OrbitOne', 'Satellite', 'good', 1),
+        (200.0, 'ColonyMoon', 'Satellite', 'unknown', 4),
+        (200.0, 'VacMars', 'Rover', 'good', 1),
+    ]
+
+
+def test_time_series_rotates_on_other_columns(tmp_path):
+    path = tmp_path / 'series.csv'
+    path.write_text('timestamp,records,OrbitOne/Satellite/good,overflow\n100.0,3,3,0\n')
+
+    append_time_series(str(path), 200.0, {('OrbitOne', 'Rover', 'good'): 2}, {})
+
+    assert sorted(os.listdir(tmp_path)) == ['series-200.csv', 'series.csv']
+    assert read_time_series(str(path)) == [(200.0, 'OrbitOne', 'Rover', 'good', 2)]
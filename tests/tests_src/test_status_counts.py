@@ -0,0 +1,76 @@
+import pickle
+
+import numpy as np
+
+from apolo_11.src.status_counts import StatusCounts
+
+
+def new_counts():
+    return StatusCounts(['OrbitOne', 'ColonyMoon'], ['Satellite', 'Rover'], ['good', 'faulty'])
+
+
+def test_vocabularies_include_unknown():
+    counts = new_counts()
+
+    assert counts.device_types == ['Satellite', 'Rover', 'unknown']
+    assert counts.device_statuses == ['good', 'faulty', 'unknown']
+    assert counts.counts.shape == (2, 3, 3)
+    assert len(counts) == 0
+
+
+def test_counts_read_like_a_mapping():
+    counts = new_counts()
+    counts.add('OrbitOne', 'Satellite', 'good')
+    counts.add('OrbitOne', 'Satellite', 'good', 2)
+    counts.add('OrbitOne', 'Satellite', 'unknown')
+    counts.add('ColonyMoon', 'unknown', 'unknown')
+
+    assert dict(counts) == {
+        ('OrbitOne', 'Satellite'): {'good': 3, 'unknown': 1},
+        ('ColonyMoon', 'unknown'): {'unknown': 1},
+    }
+    assert ('OrbitOne', 'Rover') not in counts
+    assert counts.total() == 5
+
+
+def test_unexpected_names_go_to_overflow():
+    counts = new_counts()
+    counts.add("Moon'sBallon", 'unknown', 'unknown')
+    counts.add('OrbitOne', 'Satellite', 'lost', 2)
+    counts.add('OrbitOne', 'Satellite', 'good')
+
+    assert counts.overflow == {("Moon'sBallon", 'unknown', 'unknown'): 1, ('OrbitOne', 'Satellite', 'lost'): 2}
+    assert counts[('OrbitOne', 'Satellite')] == {'good': 1, 'lost': 2}
+    assert list(counts) == [('OrbitOne', 'Satellite'), ("Moon'sBallon", 'unknown')]
+    assert counts.total() == 4
+
+
+def test_memory_does_not_grow_with_records():
+    counts = new_counts()
+    size = counts.counts.nbytes
+    for _ in range(1000):
+        counts.add('ColonyMoon', 'Rover', 'faulty')
+
+    assert counts.counts.nbytes == size
+    assert counts[('ColonyMoon', 'Rover')] == {'faulty': 1000}
+
+
+def test_merge_same_and_different_vocabularies():
+    counts = new_counts()
+    counts.add('OrbitOne', 'Satellite', 'good')
+    same = new_counts()
+    same.add('OrbitOne', 'Satellite', 'good', 2)
+    same.add('Other', 'Satellite', 'good')
+    other = StatusCounts(['ColonyMoon'], ['Rover'], ['faulty', 'killed'])
+    other.add('ColonyMoon', 'Rover', 'killed')
+    other.add('ColonyMoon', 'Rover', 'faulty')
+
+    counts.merge(same)
+    counts.merge(pickle.loads(pickle.dumps(other)))
+
+    assert dict(counts) == {
+        ('OrbitOne', 'Satellite'): {'good': 3},
+        ('ColonyMoon', 'Rover'): {'faulty': 1, 'killed': 1},
+        ('Other', 'Satellite'): {'good': 1},
+    }
+    assert np.sum(counts.counts) == 4
@@ -0,0 +1,71 @@
+from datetime import datetime
+
+import numpy as np
+
+from apolo_11.src.generator import CustomContent, DefaultContent
+from apolo_11.src.templates import ClockCache, ContentTemplates
+
+MISSIONS = ['OrbitOne', 'VacMars', "Moon'sBallon"]
+TYPES = ['Satellite', 'Rover']
+STATUSES = ['good', 'faulty', 'unknown']
+
+
+class FakeClock:
+    def __init__(self, *times):
+        self.times = list(times)
+
+    def __call__(self):
+        return self.times.pop(0)
+
+
+def test_clock_cache_formats_once_per_second():
+    clock = FakeClock(datetime(2023, 1, 1, 12, 0, 0, 100),
+                      datetime(2023, 1, 1, 12, 0, 0, 900000),
+                      datetime(2023, 1, 1, 12, 0, 1, 5))
+    cache = ClockCache('%d%m%y%H%M%S', clock)
+
+    assert cache.now() == '010123120000'
+    cache.date_format = 'changed'  # not applied until the second changes
+    assert cache.now() == '010123120000'
+    assert cache.now() == 'changed'
+
+
+def test_render_matches_content_dataclasses():
+    templates = ContentTemplates(MISSIONS, TYPES, STATUSES)
+
+    known = templates.render('010123120000', 1, 1, 1, 12345)
+    unknown = templates.render_unknown('010123120000', 2, 'abcd')
+
+    assert known.decode() == DefaultContent('010123120000', 'VacMars', 'Rover', 'faulty',
+                                            12345).generate_content_string()
+    assert unknown.decode() == CustomContent('010123120000', "Moon'sBallon", 'unknown', 'unknown',
+                                             'unknown', 'abcd').generate_content_string()
+
+
+def test_render_reuses_bytes_within_a_date():
+    templates = ContentTemplates(MISSIONS, TYPES, STATUSES)
+
+    first = templates.render('010123120000', 0, 0, 0, 1)
+    assert templates.render('010123120000', 0, 0, 0, 1) is first
+    assert templates.render('010123120001', 0, 0, 0, 2).startswith(b'Date: 010123120001')
+
+
+def test_render_batch():
+    templates = ContentTemplates(MISSIONS, TYPES, STATUSES)
+    mission_idx = np.array([0, 2, 1])
+    type_idx = np.array([1, -1, 0])
+    status_idx = np.array([0, -1, 2])
+    hashes = np.array([7, 0, 9], dtype=np.uint64)
+
+    contents = templates.render_batch('010123120000', mission_idx, type_idx, status_idx, hashes, {1: 'id-1'})
+
+    assert contents[0] == templates.render('010123120000', 0, 1, 0, 7)
+    assert contents[1].endswith(b'\nID: id-1')
+    assert b'Device Status: unknown\nHash: 9' in contents[2]
+
+
+def test_matches():
+    templates = ContentTemplates(MISSIONS, TYPES, STATUSES)
+
+    assert templates.matches(list(MISSIONS), list(TYPES), list(STATUSES))
+    assert not templates.matches(['OrbitOne'], TYPES, STATUSES)
@@ -0,0 +1,74 @@
+import os
+import sys
+import threading
+
+import pytest
+
+from apolo_11.src.watcher import InotifyWatcher, PollingWatcher, create_watcher, list_published
+
+inotify = pytest.mark.skipif(not sys.platform.startswith('linux'), reason='inotify is only available on Linux')
+
+
+def publish(directory, name):
+    """Stage a cycle and publish it with a rename, like the generator"""
+    staging = directory / f'.{name}'
+    staging.mkdir()
+    (staging / 'APLORBONE-0001.log').write_text('Mission: OrbitOne')
+    os.rename(staging, directory / f'{name}-noreport')
+
+
+def test_list_published_ignores_staging_files_and_reports(tmp_path):
+    publish(tmp_path, 'cycle-1-20240101000000')
+    (tmp_path / '.cycle-2-20240101000000').mkdir()
+    (tmp_path / 'cycle-3-20240101000000').mkdir()
+    (tmp_path / 'file-noreport').write_text('')
+
+    assert list_published(str(tmp_path)) == ['cycle-1-20240101000000-noreport']
+
+
+def test_polling_watcher_reports_each_cycle_once(tmp_path):
+    publish(tmp_path, 'cycle-1-20240101000000')
+    watcher = PollingWatcher(str(tmp_path), poll_interval=0.01)
+
+    assert watcher.wait(0) == ['cycle-1-20240101000000-noreport']
+    assert watcher.wait(0.02) == []
+    publish(tmp_path, 'cycle-2-20240101000000')
+    assert watcher.wait(1) == ['cycle-2-20240101000000-noreport']
+
+
+def test_polling_watcher_wakes_up_on_publication(tmp_path):
+    watcher = PollingWatcher(str(tmp_path), poll_interval=0.01)
+    timer = threading.Timer(0.05, publish, (tmp_path, 'cycle-4-20240101000000'))
+    timer.start()
+
+    assert watcher.wait(5) == ['cycle-4-20240101000000-noreport']
+    timer.join()
+
+
+@inotify
+def test_inotify_watcher_reports_published_cycles(tmp_path):
+    watcher = InotifyWatcher(str(tmp_path))
+    try:
+        assert watcher.wait(0) == []
+        publish(tmp_path, 'cycle-1-20240101000000')
+        (tmp_path / 'cycle-9-noreport.log').write_text('')
+
+        assert watcher.wait(1) == ['cycle-1-20240101000000-noreport']
+    finally:
+        watcher.close()
+
+
+def test_create_watcher(tmp_path):
+    assert isinstance(create_watcher(str(tmp_path), 'poll'), PollingWatcher)
+    watcher = create_watcher(str(tmp_path))
+    watcher.close()
+    assert isinstance(watcher, InotifyWatcher if sys.platform.startswith('linux') else PollingWatcher)
+    with pytest.raises(ValueError):
+        create_watcher(str(tmp_path), 'fanotify')
+
+
+def test_auto_watcher_falls_back_to_polling(tmp_path):
+    with pytest.raises(OSError):
+        create_watcher(str(tmp_path / 'missing'), 'inotify')
+
+    assert isinstance(create_watcher(str(tmp_path / 'missing'), 'auto'), PollingWatcher)
@@ -0,0 +1,72 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from apolo_11.src.writer import FileWriterPool, write_file
+
+
+def make_files(directory, count):
+    return [(os.path.join(directory, f'APLTEST-{number:04d}.log'), f'content {number}')
+            for number in range(1, count + 1)]
+
+
+def test_write_file_text_and_bytes(tmpdir):
+    text_path = os.path.join(str(tmpdir), 'text.log')
+    bytes_path = os.path.join(str(tmpdir), 'bytes.log')
+
+    write_file(text_path, 'Mission: OrbitOne')
+    write_file(bytes_path, b'Mission: VacMars')
+
+    with open(text_path) as file:
+        assert file.read() == 'Mission: OrbitOne'
+    with open(bytes_path, 'rb') as file:
+        assert file.read() == b'Mission: VacMars'
+
+
+@pytest.mark.parametrize('workers,backend', [(1, 'thread'), (4, 'thread'), (2, 'process')])
+def test_write_all_writes_every_file(tmpdir, workers, backend):
+    files = make_files(str(tmpdir), 37)
+
+    with FileWriterPool(workers, backend) as pool:
+        written = pool.write_all(files)
+
+    assert written == 37
+    for file_path, content in files:
+        with open(file_path) as file:
+            assert file.read() == content
+
+
+def test_write_all_propagates_errors(tmpdir):
+    files = make_files(os.path.join(str(tmpdir), 'missing'), 5)
+
+    with FileWriterPool(3) as pool:
+        with pytest.raises(OSError):
+            pool.write_all(files)
+
+
+def test_invalid_pool_configuration():
+    with pytest.raises(ValueError):
+        FileWriterPool(2, 'fiber')
+    with pytest.raises(ValueError):
+        FileWriterPool(0)
+
+
+def test_split_keeps_every_file_in_order():
+    pool = FileWriterPool(3)
+    files = [(str(number), '') for number in range(50)]
+
+    chunks = pool._split(files)
+
+    assert len(chunks) <= 12
+    assert [item for chunk in chunks for item in chunk] == files
+
+
+def test_write_all_with_fsync(tmp_path):
+    files = [(str(tmp_path / f'file-{number}.log'), b'content') for number in range(3)]
+
+    with patch('apolo_11.src.writer.os.fsync') as fsync:
+        assert FileWriterPool(fsync=True).write_all(files) == 3
+
+    assert fsync.call_count == 3
+    assert all((tmp_path / f'file-{number}.log').read_bytes() == b'content' for number in range(3))